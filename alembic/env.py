@@ -34,9 +34,12 @@ from app.models import (  # noqa: E402, F401
     PageView,
     CardMetaVote, CardMetaVoteReaction,
 )
+from app.models.market import ScrapeWatermark  # noqa: E402, F401
 from app.models.api_key import APIKey  # noqa: E402, F401
 from app.models.watchlist import Watchlist, EmailPreferences  # noqa: E402, F401
 from app.models.webhook_event import WebhookEvent  # noqa: E402, F401
+from app.models.scrape_job import ScrapeJob  # noqa: E402, F401
+from app.models.extraction_cache import ExtractionCacheEntry  # noqa: E402, F401
 from app.models.blokpax import BlokpaxListing  # noqa: E402, F401
 
 # Set target metadata for autogenerate
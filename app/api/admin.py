@@ -41,7 +41,9 @@ async def run_backfill_job(job_id: str, limit: int, force_all: bool, is_backfill
     from app.models.market import MarketSnapshot
     from scripts.scrape_card import scrape_card
     from app.scraper.browser import BrowserManager
+    from app.scraper.simple_http import close_http_client
     from app.discord_bot.logger import log_scrape_start, log_scrape_complete, log_scrape_error
+    from app.core.job_queue import BACKFILL, enqueue_cards, queue_enabled
 
     _running_jobs[job_id] = {
         "status": "running",
@@ -83,6 +85,16 @@ async def run_backfill_job(job_id: str, limit: int, force_all: bool, is_backfill
 
         _running_jobs[job_id]["total"] = len(cards_to_scrape)
 
+        if queue_enabled():
+            # Queue workers (python -m app.worker) scrape them; cards already queued are skipped
+            with Session(engine) as session:
+                added = enqueue_cards(
+                    session, BACKFILL, [card.id for card in cards_to_scrape], payload={"is_backfill": is_backfill}
+                )
+            _running_jobs[job_id]["status"] = "queued"
+            _running_jobs[job_id]["message"] = f"Enqueued {added} of {len(cards_to_scrape)} cards"
+            return
+
         # Log scrape start to Discord
         scrape_type = "backfill" if is_backfill else "incremental"
         log_scrape_start(len(cards_to_scrape), scrape_type)
@@ -110,6 +122,7 @@ async def run_backfill_job(job_id: str, limit: int, force_all: bool, is_backfill
                 await asyncio.sleep(2)
         finally:
             await BrowserManager.close()
+            await close_http_client()
 
         _running_jobs[job_id]["status"] = "completed"
         _running_jobs[job_id]["finished"] = datetime.utcnow()
@@ -447,7 +460,17 @@ async def get_admin_stats(
 async def get_scheduler_status(
     current_user: User = Depends(deps.get_current_superuser),
 ):
-    """Get scheduler job status."""
+    """
+    Get scheduler job status.
+
+    Everything under "process" describes only the process serving this request:
+    when the scheduler runs in app.worker (SCHEDULER_IN_API=0) or on another
+    replica, its market update is not visible there. scrape_queue is read from
+    the database and is the same from every process.
+    """
+    import os
+    import socket
+    from app.core import scheduler as scheduler_module
     from app.core.scheduler import scheduler
 
     jobs = []
@@ -461,9 +484,30 @@ async def get_scheduler_status(
             }
         )
 
+    from app.scraper.browser import remote_browser_pool
+    from app.scraper.fetcher import tiered_fetcher
+    from sqlmodel import Session
+    from app.db import engine
+    from app.core.job_queue import queue_enabled, queue_stats
+
+    scrape_queue = None
+    if queue_enabled():
+        with Session(engine) as session:
+            scrape_queue = queue_stats(session)
+
     return {
         "running": scheduler.running,
         "jobs": jobs,
+        "process": {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "market_update": (
+                scheduler_module.market_executor.progress.as_dict() if scheduler_module.market_executor else None
+            ),
+        },
+        "fetch_tiers": tiered_fetcher.get_stats(),
+        "browser_service": remote_browser_pool.get_stats() if remote_browser_pool.enabled else None,
+        "scrape_queue": scrape_queue,
     }
 
 
@@ -0,0 +1,14 @@
+"""
+Numeric tuning knobs from the environment (pool sizes, timeouts, intervals).
+"""
+
+import os
+
+
+def env_number(name: str, default, cast=float):
+    """os.getenv(name) cast to a number; falls back to default (with a warning) when unset or invalid."""
+    try:
+        return cast(os.getenv(name, default))
+    except (TypeError, ValueError):
+        print(f"[Config] Invalid {name}={os.getenv(name)!r}, using {default}")
+        return default
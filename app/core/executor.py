@@ -0,0 +1,190 @@
+"""
+Continuous worker-pool executor for scrape cycles.
+
+The market job used to scrape cards in asyncio.gather batches of 3 with a 5 s
+pause between batches, so one slow card (10 pages, retries) idled the other two
+slots until it finished. ScrapeExecutor instead runs N workers that each pull
+the next card from a shared queue as soon as they are free, so a cycle takes
+about total work / N rather than the sum of every batch's slowest card.
+
+- Each attempt is bounded by `task_timeout`.
+- A failed or timed-out card goes to a separate retry lane with exponential
+  backoff (retry_backoff * 2**n). Retries never block fresh cards in the main lane.
+- Live counters (ExecutorProgress) can be read while the cycle runs
+  (/admin/scheduler/status).
+
+Politeness toward eBay is not the executor's job: tab_pool.domain_pacer spaces
+HTTP and browser requests per domain however many workers are busy.
+
+Config (env):
+- SCRAPER_WORKERS: main-lane workers (default 3)
+- SCRAPER_CARD_TIMEOUT: seconds per card attempt (default 600)
+- SCRAPER_CARD_RETRIES: retries per card after the first attempt (default 1)
+- SCRAPER_RETRY_BACKOFF: base seconds before a retry (default 30)
+"""
+
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+from app.core.env import env_number
+
+T = TypeVar("T")
+
+# Retry-lane sentinel (sorts after every real retry)
+_STOP = object()
+
+
+@dataclass
+class ExecutorProgress:
+    total: int = 0
+    queued: int = 0  # waiting in the main lane
+    retry_queued: int = 0  # waiting (or backing off) in the retry lane
+    succeeded: int = 0
+    failed: int = 0  # gave up after all attempts
+    retries: int = 0
+    timeouts: int = 0
+    in_progress: Dict[str, float] = field(default_factory=dict)  # label -> attempt start (monotonic)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    def as_dict(self) -> dict:
+        now = time.monotonic()
+        return {
+            "total": self.total,
+            "completed": self.completed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "queued": self.queued,
+            "retry_queued": self.retry_queued,
+            "retries": self.retries,
+            "timeouts": self.timeouts,
+            "in_progress": {label: round(now - start) for label, start in self.in_progress.items()},
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class ScrapeExecutor(Generic[T]):
+    """
+    Runs `handler(item)` over items with a fixed number of workers.
+
+    handler returns truthy on success; False or an exception counts as a failed
+    attempt (retried up to max_retries times).
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[T], Awaitable[Any]],
+        workers: int = 3,
+        retry_workers: int = 1,
+        task_timeout: Optional[float] = 600.0,
+        max_retries: int = 1,
+        retry_backoff: float = 30.0,
+        label: Callable[[T], str] = str,
+    ):
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.retry_workers = max(1, retry_workers)
+        self.task_timeout = task_timeout
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.label = label
+        self.progress = ExecutorProgress()
+        self._order = itertools.count()
+
+    @classmethod
+    def from_env(cls, handler: Callable[[T], Awaitable[Any]], **kwargs) -> "ScrapeExecutor[T]":
+        """Env defaults; explicit kwargs win (e.g. max_retries=0 when the job queue owns retries)."""
+        options = dict(
+            workers=env_number("SCRAPER_WORKERS", 3, int),
+            task_timeout=env_number("SCRAPER_CARD_TIMEOUT", 600.0),
+            max_retries=env_number("SCRAPER_CARD_RETRIES", 1, int),
+            retry_backoff=env_number("SCRAPER_RETRY_BACKOFF", 30.0),
+        )
+        options.update(kwargs)
+        return cls(handler, **options)
+
+    async def run(self, items: Iterable[T]) -> ExecutorProgress:
+        """Process every item; returns the final progress counters."""
+        items = list(items)
+        self.progress = progress = ExecutorProgress(total=len(items), queued=len(items), started_at=datetime.utcnow())
+        self._main: "asyncio.Queue[T]" = asyncio.Queue()
+        self._retry: "asyncio.PriorityQueue" = asyncio.PriorityQueue()
+        self._pending = len(items)
+        for item in items:
+            self._main.put_nowait(item)
+        if not items:
+            self._stop_retry_lane()
+
+        workers = [self._main_worker() for _ in range(self.workers)]
+        workers += [self._retry_worker() for _ in range(self.retry_workers)]
+        await asyncio.gather(*workers)
+
+        progress.finished_at = datetime.utcnow()
+        return progress
+
+    async def _main_worker(self) -> None:
+        while True:
+            try:
+                item = self._main.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            self.progress.queued -= 1
+            await self._attempt(item, attempt=1)
+
+    async def _retry_worker(self) -> None:
+        while True:
+            ready_at, _, attempt, item = await self._retry.get()
+            if item is _STOP:
+                return
+            delay = ready_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.progress.retry_queued -= 1
+            self.progress.retries += 1
+            await self._attempt(item, attempt=attempt)
+
+    async def _attempt(self, item: T, attempt: int) -> None:
+        label = self.label(item)
+        self.progress.in_progress[label] = time.monotonic()
+        try:
+            if self.task_timeout:
+                ok = await asyncio.wait_for(self.handler(item), timeout=self.task_timeout)
+            else:
+                ok = await self.handler(item)
+        except asyncio.TimeoutError:
+            self.progress.timeouts += 1
+            print(f"[Executor] {label} timed out after {self.task_timeout:.0f}s (attempt {attempt})")
+            ok = False
+        except Exception as e:
+            print(f"[Executor] {label} failed (attempt {attempt}): {type(e).__name__}: {e}")
+            ok = False
+        finally:
+            self.progress.in_progress.pop(label, None)
+
+        if ok:
+            self.progress.succeeded += 1
+        elif attempt <= self.max_retries:
+            backoff = self.retry_backoff * 2 ** (attempt - 1)
+            self.progress.retry_queued += 1
+            self._retry.put_nowait((time.monotonic() + backoff, next(self._order), attempt + 1, item))
+            return
+        else:
+            self.progress.failed += 1
+
+        self._pending -= 1
+        if self._pending == 0:
+            self._stop_retry_lane()
+
+    def _stop_retry_lane(self) -> None:
+        for _ in range(self.retry_workers):
+            self._retry.put_nowait((float("inf"), next(self._order), 0, _STOP))
+
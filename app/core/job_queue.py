@@ -0,0 +1,271 @@
+"""
+Postgres-backed scrape job queue.
+
+The scheduler, the admin backfill endpoint and scripts/bulk_scrape.py used to
+loop over cards themselves with no coordination, so two of them (or two API
+replicas) could scrape the same cards at once. With SCRAPE_QUEUE=1 they enqueue
+ScrapeJob rows instead, and any number of worker processes (python -m app.worker)
+lease and run them:
+
+- lease(): SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never take
+  the same job and never wait on each other's locked rows.
+- A lease is valid for the visibility timeout; workers renew it with heartbeat()
+  while a job runs. A lease that expires (worker died) is picked up again.
+- fail() re-queues with exponential backoff until max_attempts, then marks the
+  job failed. An expired lease on the last attempt also ends in failed.
+- enqueue() collapses duplicates: one queued/leased job per dedupe_key (backed
+  by a partial unique index, see scripts/create_scrape_job_table.py).
+  enqueue_cards() adds a whole card list with one bulk insert and commit.
+
+Config (env):
+- SCRAPE_QUEUE: 1 to route scrape jobs through the queue (default 0: in-process)
+- SCRAPE_QUEUE_VISIBILITY_TIMEOUT: lease length in seconds (default 900)
+- SCRAPE_QUEUE_MAX_ATTEMPTS: attempts per job (default 3)
+- SCRAPE_QUEUE_RETRY_BACKOFF: base seconds before a failed job is retried (default 300)
+"""
+
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, or_, text
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.models.scrape_job import ScrapeJob
+from app.core.env import env_number
+
+QUEUED = "queued"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# Predicate of the partial unique index ux_scrape_job_active_dedupe
+ACTIVE_DEDUPE_WHERE = "status IN ('queued', 'leased')"
+# Rows per INSERT statement in enqueue_cards (keeps bind parameters under driver limits)
+ENQUEUE_CHUNK = 1000
+
+# Job kinds
+MARKET = "market"  # scheduled market refresh of one card (scrape_single_card)
+BACKFILL = "backfill"  # sold-history scrape of one card (payload: is_backfill)
+
+
+def queue_enabled() -> bool:
+    return os.getenv("SCRAPE_QUEUE", "0").lower() in ("1", "true", "on")
+
+
+def visibility_timeout() -> float:
+    return env_number("SCRAPE_QUEUE_VISIBILITY_TIMEOUT", 900.0)
+
+
+def enqueue(
+    session: Session,
+    kind: str,
+    card_id: Optional[int] = None,
+    payload: Optional[dict] = None,
+    priority: float = 0.0,
+    dedupe_key: Optional[str] = None,
+    max_attempts: Optional[int] = None,
+) -> Optional[ScrapeJob]:
+    """
+    Add a job. Returns None if a queued/leased job with the same dedupe_key exists
+    (defaults to "<kind>:<card_id>" for card jobs).
+    """
+    if dedupe_key is None and card_id is not None:
+        dedupe_key = f"{kind}:{card_id}"
+
+    if dedupe_key is not None:
+        active = session.exec(
+            select(ScrapeJob.id).where(ScrapeJob.dedupe_key == dedupe_key, ScrapeJob.status.in_([QUEUED, LEASED]))
+        ).first()
+        if active is not None:
+            return None
+
+    job = ScrapeJob(
+        kind=kind,
+        card_id=card_id,
+        payload=payload,
+        priority=priority,
+        dedupe_key=dedupe_key,
+        max_attempts=max_attempts or env_number("SCRAPE_QUEUE_MAX_ATTEMPTS", 3, int),
+    )
+    session.add(job)
+    try:
+        session.commit()
+    except IntegrityError:
+        # Another process enqueued the same key between our check and insert
+        session.rollback()
+        return None
+    session.refresh(job)
+    return job
+
+
+def enqueue_cards(
+    session: Session, kind: str, card_ids: Iterable[int], payload: Optional[dict] = None
+) -> int:
+    """
+    Enqueue one job per card, earlier cards at higher priority. Returns how many were added.
+
+    One INSERT ... ON CONFLICT DO NOTHING against the active dedupe index and one
+    commit for the whole list; cards that already have a queued/leased job are skipped.
+    """
+    card_ids = list(card_ids)
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        added = 0
+        for rank, card_id in enumerate(card_ids):
+            if enqueue(session, kind, card_id=card_id, payload=payload, priority=float(len(card_ids) - rank)):
+                added += 1
+        return added
+
+    now = datetime.utcnow()
+    max_attempts = env_number("SCRAPE_QUEUE_MAX_ATTEMPTS", 3, int)
+    rows, seen = [], set()
+    for rank, card_id in enumerate(card_ids):
+        if card_id in seen:
+            continue
+        seen.add(card_id)
+        rows.append(
+            {
+                "kind": kind,
+                "card_id": card_id,
+                "payload": payload,
+                "priority": float(len(card_ids) - rank),
+                "dedupe_key": f"{kind}:{card_id}",
+                "status": QUEUED,
+                "attempts": 0,
+                "max_attempts": max_attempts,
+                "available_at": now,
+                "created_at": now,
+            }
+        )
+
+    added = 0
+    for start in range(0, len(rows), ENQUEUE_CHUNK):
+        statement = (
+            insert(ScrapeJob)
+            .values(rows[start : start + ENQUEUE_CHUNK])
+            .on_conflict_do_nothing(index_elements=["dedupe_key"], index_where=text(ACTIVE_DEDUPE_WHERE))
+        )
+        added += session.exec(statement).rowcount
+    session.commit()
+    return added
+
+
+def lease(
+    session: Session,
+    worker_id: str,
+    kinds: Optional[Iterable[str]] = None,
+    limit: int = 1,
+    timeout: Optional[float] = None,
+    now: Optional[datetime] = None,
+) -> List[ScrapeJob]:
+    """
+    Lease up to `limit` runnable jobs (queued and due, or leased with an expired lease).
+    Each leased job's attempt count is incremented.
+    """
+    now = now or datetime.utcnow()
+    timeout = visibility_timeout() if timeout is None else timeout
+
+    runnable = or_(
+        and_(ScrapeJob.status == QUEUED, ScrapeJob.available_at <= now),
+        and_(ScrapeJob.status == LEASED, ScrapeJob.lease_expires_at < now),
+    )
+    statement = select(ScrapeJob).where(runnable)
+    if kinds is not None:
+        statement = statement.where(ScrapeJob.kind.in_(list(kinds)))
+    statement = (
+        statement.order_by(ScrapeJob.priority.desc(), ScrapeJob.id).limit(limit).with_for_update(skip_locked=True)
+    )
+
+    leased = []
+    for job in session.exec(statement).all():
+        if job.status == LEASED and job.attempts >= job.max_attempts:
+            # Worker died (or hung) on the last attempt
+            job.status = FAILED
+            job.last_error = f"lease expired (worker {job.leased_by})"
+            job.finished_at = now
+        else:
+            job.status = LEASED
+            job.attempts += 1
+            job.leased_by = worker_id
+            job.lease_expires_at = now + timedelta(seconds=timeout)
+            job.heartbeat_at = now
+            leased.append(job)
+        session.add(job)
+    session.commit()
+    for job in leased:
+        session.refresh(job)
+    return leased
+
+
+def _owned(session: Session, job_id: int, worker_id: str) -> Optional[ScrapeJob]:
+    job = session.get(ScrapeJob, job_id)
+    if job is None or job.status != LEASED or job.leased_by != worker_id:
+        return None
+    return job
+
+
+def heartbeat(
+    session: Session, job_ids: Iterable[int], worker_id: str, timeout: Optional[float] = None
+) -> List[int]:
+    """Extend the leases this worker still holds. Returns the ids that were lost."""
+    now = datetime.utcnow()
+    timeout = visibility_timeout() if timeout is None else timeout
+    lost = []
+    for job_id in job_ids:
+        job = _owned(session, job_id, worker_id)
+        if job is None:
+            lost.append(job_id)
+            continue
+        job.heartbeat_at = now
+        job.lease_expires_at = now + timedelta(seconds=timeout)
+        session.add(job)
+    session.commit()
+    return lost
+
+
+def complete(session: Session, job_id: int, worker_id: str) -> bool:
+    """Mark a leased job done. False if the lease was lost to another worker."""
+    job = _owned(session, job_id, worker_id)
+    if job is None:
+        return False
+    job.status = DONE
+    job.finished_at = datetime.utcnow()
+    job.lease_expires_at = None
+    session.add(job)
+    session.commit()
+    return True
+
+
+def fail(session: Session, job_id: int, worker_id: str, error: str = "") -> bool:
+    """Re-queue a leased job with backoff, or mark it failed after max_attempts."""
+    job = _owned(session, job_id, worker_id)
+    if job is None:
+        return False
+    now = datetime.utcnow()
+    job.last_error = error[:500] if error else None
+    job.lease_expires_at = None
+    job.leased_by = None
+    if job.attempts >= job.max_attempts:
+        job.status = FAILED
+        job.finished_at = now
+    else:
+        backoff = env_number("SCRAPE_QUEUE_RETRY_BACKOFF", 300.0) * 2 ** (job.attempts - 1)
+        job.status = QUEUED
+        job.available_at = now + timedelta(seconds=backoff)
+    session.add(job)
+    session.commit()
+    return True
+
+
+def queue_stats(session: Session) -> Dict[str, int]:
+    """Job counts by status."""
+    rows = session.exec(select(ScrapeJob.status, func.count(ScrapeJob.id)).group_by(ScrapeJob.status)).all()
+    stats = {QUEUED: 0, LEASED: 0, DONE: 0, FAILED: 0}
+    stats.update({status: count for status, count in rows})
+    return stats
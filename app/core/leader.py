@@ -0,0 +1,102 @@
+"""
+Single active scheduler across processes.
+
+APScheduler runs inside whatever process calls start_scheduler, so several
+uvicorn workers (or an API plus a worker container) would each run every job.
+AdvisoryLock holds a Postgres session-level advisory lock on a dedicated
+connection: only the process holding it runs the scheduler, the others stay on
+standby and take over if the holder's connection goes away (crash, deploy).
+
+Session-level locks need a session-pooled (or direct) connection; behind a
+transaction-mode pooler the lock would not stick to our session.
+On non-Postgres databases (SQLite in tests/dev) the lock is always granted.
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+# pg_advisory_lock key for the APScheduler leader
+SCHEDULER_LOCK_KEY = 7_291_001
+
+
+class AdvisoryLock:
+    """Non-blocking pg_try_advisory_lock held for as long as its connection lives."""
+
+    def __init__(self, engine: Engine, key: int = SCHEDULER_LOCK_KEY):
+        self.engine = engine
+        self.key = key
+        self._conn: Optional[Connection] = None
+
+    @property
+    def supported(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    @property
+    def held(self) -> bool:
+        return self._conn is not None
+
+    def try_acquire(self) -> bool:
+        """Take the lock if free. Returns whether this process holds it."""
+        if self._conn is not None:
+            return True
+        if not self.supported:
+            self._conn = self.engine.connect()
+            return True
+
+        conn = self.engine.connect()
+        try:
+            got = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.key}).scalar()
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        if not got:
+            conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    def check(self) -> bool:
+        """Whether the lock is still held (the connection may have dropped)."""
+        if self._conn is None:
+            return False
+        if not self.supported:
+            return True
+        try:
+            held = self._conn.execute(
+                text(
+                    "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND granted "
+                    "AND pid = pg_backend_pid() AND objid = :objid AND classid = :classid"
+                ),
+                {"objid": self.key & 0xFFFFFFFF, "classid": self.key >> 32},
+            ).scalar()
+            self._conn.commit()
+        except Exception as e:
+            print(f"[Leader] Lock check failed: {type(e).__name__}: {e}")
+            held = 0
+        if not held:
+            self._drop()
+        return bool(held)
+
+    def release(self) -> None:
+        if self._conn is None:
+            return
+        if self.supported:
+            try:
+                self._conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.key})
+                self._conn.commit()
+            except Exception:
+                pass  # Closing the session releases it anyway
+        self._drop()
+
+    def _drop(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                # Discard rather than return to the pool, so a lock can never outlive us on a pooled connection
+                conn.invalidate()
+                conn.close()
+            except Exception:
+                pass
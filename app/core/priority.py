@@ -0,0 +1,185 @@
+"""
+Priority-scored card selection for the market update job.
+
+The job used to refresh every card whose latest snapshot was older than an hour
+(or 10 random cards), so a Mythic that trades 20 times a day was refreshed as
+often as a common that hasn't sold in months. Cards are now ranked by
+
+    score = hours since last snapshot * demand
+    demand = 1 + w_volume * log1p(sold in window)
+               + w_churn * log1p(active listings first seen in window)
+               + w_interest * log1p(watchlist + portfolio rows)
+
+i.e. "effective staleness": a card with heavy demand goes stale faster. Cards
+with no snapshot come first; cards refreshed within SCRAPER_MIN_REFRESH_MINUTES
+are skipped.
+
+Each cycle spends a fixed page budget on the highest-scoring cards. A card's cost
+is the number of eBay URLs it would fetch (planner.card_fetch_urls, an upper bound
+since incremental pagination stops early) that no card already picked this cycle
+fetches - shared Lot/Pack searches are only paid once, as in ScrapePlanner.
+
+Config (env):
+- SCRAPER_PAGE_BUDGET: planned page fetches per cycle (default 400)
+- SCRAPER_MIN_REFRESH_MINUTES: minimum age before a card is re-scraped (default 30)
+- SCRAPER_PRIORITY_WINDOW_DAYS: window for sold volume / listing churn (default 7)
+- SCRAPER_WEIGHT_VOLUME / SCRAPER_WEIGHT_CHURN / SCRAPER_WEIGHT_INTEREST
+  (defaults 1.0 / 0.5 / 1.0)
+"""
+
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlmodel import Session, select
+
+from app.models.card import Card
+from app.models.market import MarketPrice, MarketSnapshot
+from app.models.portfolio import PortfolioCard
+from app.models.watchlist import Watchlist
+from app.scraper.planner import card_fetch_urls
+from app.core.env import env_number
+
+
+@dataclass
+class PriorityWeights:
+    volume: float = 1.0
+    churn: float = 0.5
+    interest: float = 1.0
+    min_refresh_minutes: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "PriorityWeights":
+        return cls(
+            volume=env_number("SCRAPER_WEIGHT_VOLUME", 1.0),
+            churn=env_number("SCRAPER_WEIGHT_CHURN", 0.5),
+            interest=env_number("SCRAPER_WEIGHT_INTEREST", 1.0),
+            min_refresh_minutes=env_number("SCRAPER_MIN_REFRESH_MINUTES", 30.0),
+        )
+
+
+@dataclass
+class CardSignals:
+    """Inputs to a card's priority."""
+
+    card_id: int
+    last_snapshot: Optional[datetime] = None
+    sold_recent: int = 0  # sales in the window
+    active_churn: int = 0  # active listings first seen in the window
+    interest: int = 0  # watchlist + portfolio rows referencing the card
+
+
+def priority_score(signals: CardSignals, now: datetime, weights: Optional[PriorityWeights] = None) -> float:
+    """Effective staleness in hours (inf for never-scraped cards, 0 if refreshed too recently)."""
+    weights = weights or PriorityWeights()
+    if signals.last_snapshot is None:
+        return math.inf
+
+    age_minutes = max(0.0, (now - signals.last_snapshot).total_seconds() / 60)
+    if age_minutes < weights.min_refresh_minutes:
+        return 0.0
+
+    demand = (
+        1.0
+        + weights.volume * math.log1p(signals.sold_recent)
+        + weights.churn * math.log1p(signals.active_churn)
+        + weights.interest * math.log1p(signals.interest)
+    )
+    return age_minutes / 60 * demand
+
+
+def load_card_signals(session: Session, now: datetime, window_days: float = 7.0) -> Dict[int, CardSignals]:
+    """One grouped query per signal, keyed by card id (cards without any data are absent)."""
+    since = now - timedelta(days=window_days)
+    signals: Dict[int, CardSignals] = {}
+
+    def get(card_id: int) -> CardSignals:
+        if card_id not in signals:
+            signals[card_id] = CardSignals(card_id=card_id)
+        return signals[card_id]
+
+    for card_id, latest in session.exec(
+        select(MarketSnapshot.card_id, func.max(MarketSnapshot.timestamp)).group_by(MarketSnapshot.card_id)
+    ).all():
+        get(card_id).last_snapshot = latest
+
+    for card_id, count in session.exec(
+        select(MarketPrice.card_id, func.count(MarketPrice.id))
+        .where(MarketPrice.listing_type == "sold", MarketPrice.sold_date >= since)
+        .group_by(MarketPrice.card_id)
+    ).all():
+        get(card_id).sold_recent = count
+
+    for card_id, count in session.exec(
+        select(MarketPrice.card_id, func.count(MarketPrice.id))
+        .where(
+            MarketPrice.listing_type == "active",
+            func.coalesce(MarketPrice.listed_at, MarketPrice.scraped_at) >= since,
+        )
+        .group_by(MarketPrice.card_id)
+    ).all():
+        get(card_id).active_churn = count
+
+    for model in (Watchlist, PortfolioCard):
+        for card_id, count in session.exec(
+            select(model.card_id, func.count(model.id)).group_by(model.card_id)
+        ).all():
+            get(card_id).interest += count
+
+    return signals
+
+
+def _card_urls(card: Card) -> List[str]:
+    return card_fetch_urls(
+        card.name,
+        product_type=getattr(card, "product_type", None) or "Single",
+        search_term=f"{card.name} {card.set_name}",
+    )
+
+
+def pick_within_budget(ranked: List[Tuple[float, Card]], page_budget: int) -> List[Card]:
+    """
+    Take cards in score order while their (not yet planned) URLs fit the budget.
+
+    A card too expensive for what is left is skipped so cheaper cards behind it
+    can still use the remainder; the top card is always taken.
+    """
+    picked: List[Card] = []
+    planned: Set[str] = set()
+    spent = 0
+    for score, card in ranked:
+        if score <= 0:
+            break
+        new_urls = [url for url in _card_urls(card) if url not in planned]
+        if picked and spent + len(new_urls) > page_budget:
+            continue
+        picked.append(card)
+        planned.update(new_urls)
+        spent += len(new_urls)
+        if spent >= page_budget:
+            break
+    return picked
+
+
+def select_cards_for_cycle(
+    session: Session,
+    page_budget: Optional[int] = None,
+    now: Optional[datetime] = None,
+    weights: Optional[PriorityWeights] = None,
+) -> List[Card]:
+    """Highest-priority cards whose planned fetches fit this cycle's page budget."""
+    now = now or datetime.utcnow()
+    weights = weights or PriorityWeights.from_env()
+    if page_budget is None:
+        page_budget = env_number("SCRAPER_PAGE_BUDGET", 400, int)
+
+    cards = session.exec(select(Card)).all()
+    signals = load_card_signals(session, now, window_days=env_number("SCRAPER_PRIORITY_WINDOW_DAYS", 7.0))
+
+    ranked = [
+        (priority_score(signals.get(card.id) or CardSignals(card_id=card.id), now, weights), card) for card in cards
+    ]
+    ranked.sort(key=lambda pair: pair[0], reverse=True)
+    return pick_within_budget(ranked, page_budget)
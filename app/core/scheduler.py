@@ -1,11 +1,10 @@
 import asyncio
-import random
+import os
 import time
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.cron import CronTrigger
 from sqlmodel import Session, select
-from sqlalchemy import func
 from app.db import engine
 from app.models.card import Card
 from app.models.market import MarketSnapshot
@@ -13,6 +12,16 @@ from app.models.blokpax import BlokpaxStorefront, BlokpaxSnapshot
 from scripts.scrape_card import scrape_card as scrape_sold_data
 from app.scraper.active import scrape_active_data
 from app.scraper.browser import BrowserManager
+from app.scraper.fetcher import tiered_fetcher
+from app.scraper.page_cache import page_cache
+from app.scraper.simple_http import close_http_client
+from app.scraper.planner import ScrapePlanner
+from app.core.executor import ScrapeExecutor
+from app.core.priority import select_cards_for_cycle
+from app.core.job_queue import MARKET, enqueue_cards, queue_enabled
+from app.core.leader import AdvisoryLock
+from app.core.env import env_number
+from app.services.extraction_coalescer import current_coalescer
 from app.scraper.blokpax import (
     WOTF_STOREFRONTS,
     get_bpx_price,
@@ -28,12 +37,20 @@ from app.scraper.opensea import (
 )
 from app.discord_bot.logger import log_scrape_start, log_scrape_complete, log_scrape_error, log_market_insights
 from datetime import datetime, timedelta
+from typing import List, Optional
 
 scheduler = AsyncIOScheduler()
 
+# Executor of the current (or last) market update cycle - progress for /admin/scheduler/status
+market_executor: Optional[ScrapeExecutor] = None
 
-async def scrape_single_card(card: Card):
-    """Scrape a single card with full data (sold + active)."""
+
+async def scrape_single_card(card: Card, fetch=None):
+    """
+    Scrape a single card with full data (sold + active).
+
+    fetch: optional page fetcher shared across the cycle (ScrapePlanner.fetch).
+    """
     try:
         search_term = f"{card.name} {card.set_name}"
         print(f"[Polling] Updating: {search_term}")
@@ -45,10 +62,11 @@ async def scrape_single_card(card: Card):
             search_term=search_term,
             set_name=card.set_name,
             product_type=card.product_type if hasattr(card, "product_type") else "Single",
+            fetch=fetch,
         )
 
         # Get active data
-        low_ask, inventory, high_bid = await scrape_active_data(card.name, card.id, search_term=search_term)
+        low_ask, inventory, high_bid = await scrape_active_data(card.name, card.id, search_term=search_term, fetch=fetch)
 
         # Update snapshot with active data
         with Session(engine) as session:
@@ -72,47 +90,22 @@ async def scrape_single_card(card: Card):
         return False
 
 
-async def job_update_market_data():
+async def scrape_cards(cards: List[Card], scrape=None, scrape_type: str = "scheduled", **executor_options):
     """
-    Optimized polling job - scrapes cards in batches with concurrency control.
-    Includes robust error handling for browser startup failures.
-    """
-    print(f"[{datetime.utcnow()}] Starting Scheduled Market Update...")
-    start_time = time.time()
+    Scrape cards on the worker pool: browser startup (with retries), per-cycle fetch
+    dedupe, ScrapeExecutor, Discord logging and cleanup. Shared by the in-process
+    market job and the queue worker (app/worker.py).
 
-    with Session(engine) as session:
-        # Get cards that haven't been updated in the last hour (or all if none)
-        cutoff_time = datetime.utcnow() - timedelta(hours=1)
-
-        # Subquery for latest snapshot per card
-        latest_snapshots = (
-            select(MarketSnapshot.card_id, func.max(MarketSnapshot.timestamp).label("latest_timestamp"))
-            .group_by(MarketSnapshot.card_id)
-            .subquery()
-        )
-
-        # Get cards needing updates
-        cards_query = (
-            select(Card)
-            .outerjoin(latest_snapshots, Card.id == latest_snapshots.c.card_id)
-            .where((latest_snapshots.c.latest_timestamp < cutoff_time) | (latest_snapshots.c.latest_timestamp is None))
-        )
-
-        cards_to_update = session.exec(cards_query).all()
-
-        # If no stale cards, update a random sample
-        if not cards_to_update:
-            all_cards = session.exec(select(Card)).all()
-            cards_to_update = random.sample(all_cards, min(10, len(all_cards)))
-
-    if not cards_to_update:
-        print("[Polling] No cards to update.")
-        return
+    scrape: async (card, fetch) -> bool, defaults to scrape_single_card.
+    executor_options: ScrapeExecutor overrides (e.g. max_retries=0).
 
-    print(f"[Polling] Updating {len(cards_to_update)} cards...")
+    Returns the final ExecutorProgress, or None if nothing was scraped.
+    """
+    scrape = scrape or scrape_single_card
+    start_time = time.time()
 
     # Log scrape start to Discord
-    log_scrape_start(len(cards_to_update), scrape_type="scheduled")
+    log_scrape_start(len(cards), scrape_type=scrape_type)
 
     # Initialize browser with retry logic
     max_browser_retries = 3
@@ -124,6 +117,7 @@ async def job_update_market_data():
             await BrowserManager.get_browser()
             browser_started = True
             print("[Polling] Browser started successfully!")
+            await BrowserManager.warm_tabs()
             break
         except Exception as e:
             print(f"[Polling] Browser startup failed (attempt {attempt + 1}): {type(e).__name__}: {e}")
@@ -136,40 +130,44 @@ async def job_update_market_data():
 
     if not browser_started:
         print("[Polling] ERROR: Could not start browser after all retries. Skipping this update cycle.")
-        return
+        return None
 
+    # Dedupe identical searches across the cycle's cards (shared Lot/Pack queries etc.)
+    planner = ScrapePlanner()
     try:
-        # Process cards with controlled concurrency (max 3 concurrent)
-        batch_size = 3
-        successful = 0
-        failed = 0
-
-        for i in range(0, len(cards_to_update), batch_size):
-            batch = cards_to_update[i : i + batch_size]
-
-            # Process batch concurrently
-            tasks = [scrape_single_card(card) for card in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Count successes/failures
-            for result in results:
-                if isinstance(result, Exception):
-                    failed += 1
-                elif result:
-                    successful += 1
-                else:
-                    failed += 1
-
-            # Brief delay between batches
-            if i + batch_size < len(cards_to_update):
-                await asyncio.sleep(5)
+        planner.plan(cards)
+        print(f"[Polling] Fetch plan: {len(planner.shared_urls())} searches shared between cards")
+    except Exception as e:
+        print(f"[Polling] Fetch planning failed, fetching per card: {type(e).__name__}: {e}")
 
-        print(f"[Polling] Results: {successful} successful, {failed} failed out of {len(cards_to_update)} cards")
+    progress = None
+    try:
+        # Workers pull cards continuously (no per-batch barrier); failures retry in a separate lane
+        global market_executor
+        market_executor = ScrapeExecutor.from_env(
+            lambda card: scrape(card, fetch=planner.fetch),
+            label=lambda card: f"{card.id}:{card.name}",
+            **executor_options,
+        )
+        progress = await market_executor.run(cards)
+        successful, failed = progress.succeeded, progress.failed
+
+        print(f"[Polling] Results: {successful} successful, {failed} failed out of {len(cards)} cards")
+        print(f"[Polling] Retries: {progress.retries} ({progress.timeouts} timeouts)")
+        print(f"[Polling] Fetches: {planner.summary()}")
+        print(f"[Polling] Resources: {BrowserManager.resource_blocker.stats.summary()}")
+        if BrowserManager.last_time_to_first_page is not None:
+            print(f"[Polling] Browser time to first page: {BrowserManager.last_time_to_first_page:.1f}s")
+        for tier, tier_stats in tiered_fetcher.get_stats()["tiers"].items():
+            print(f"[Polling] Tier {tier}: {tier_stats}")
+        coalescer = current_coalescer()
+        if coalescer is not None:
+            print(f"[Polling] AI extraction (since start): {coalescer.summary()}")
 
         # Log scrape complete to Discord
         duration = time.time() - start_time
         log_scrape_complete(
-            cards_processed=len(cards_to_update),
+            cards_processed=len(cards),
             new_listings=0,  # Scheduled scrapes don't track new listings separately
             new_sales=0,
             duration_seconds=duration,
@@ -181,7 +179,40 @@ async def job_update_market_data():
         log_scrape_error("Scheduled Job", str(e))
 
     finally:
+        planner.clear()
         await BrowserManager.close()
+        await close_http_client()
+        removed = page_cache.prune()
+        if removed:
+            print(f"[Polling] Pruned {removed} expired cached pages")
+
+    return progress
+
+
+async def job_update_market_data():
+    """
+    Optimized polling job - scrapes the highest-priority cards (select_cards_for_cycle)
+    on a continuous worker pool (ScrapeExecutor) with per-card timeouts and a retry lane.
+    With SCRAPE_QUEUE=1 the cards are enqueued for queue workers instead.
+    Includes robust error handling for browser startup failures.
+    """
+    print(f"[{datetime.utcnow()}] Starting Scheduled Market Update...")
+
+    with Session(engine) as session:
+        # Highest-priority cards (staleness x sold volume, listing churn, user interest) within the page budget
+        cards_to_update = select_cards_for_cycle(session)
+
+        if cards_to_update and queue_enabled():
+            added = enqueue_cards(session, MARKET, [card.id for card in cards_to_update])
+            print(f"[Polling] Enqueued {added} of {len(cards_to_update)} cards (rest already queued)")
+            return
+
+    if not cards_to_update:
+        print("[Polling] No cards to update.")
+        return
+
+    print(f"[Polling] Updating {len(cards_to_update)} cards...")
+    await scrape_cards(cards_to_update)
 
     print(f"[{datetime.utcnow()}] Scheduled Update Complete.")
 
@@ -589,19 +620,27 @@ async def job_backfill_seller_data():
     try:
         from pydoll.browser import Chrome
         from pydoll.browser.options import ChromiumOptions
+        from app.scraper.browser import get_user_data_dir
+        from app.scraper.profile_template import clone_profile
         from app.scraper.seller import extract_seller_from_html
         import re
+        import shutil
 
-        # Setup browser
+        # Setup browser (on a clone of the warm profile template when one exists)
+        launch_started = time.time()
+        profile_dir = f"{get_user_data_dir()}_seller"
+        warm = clone_profile(profile_dir)
         options = ChromiumOptions()
         options.headless = True
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
+        options.add_argument(f"--user-data-dir={profile_dir}")
 
         browser = Chrome(options=options)
         await browser.start()
-        print("[Seller] Browser started")
+        print(f"[Seller] Browser started in {time.time() - launch_started:.1f}s ({'warm' if warm else 'cold'} profile)")
+        first_page_logged = False
 
         with Session(engine) as session:
             # Get listings missing seller data (prioritize recent sold items)
@@ -637,23 +676,30 @@ async def job_backfill_seller_data():
                     continue
 
                 try:
-                    # Fetch page
-                    tab = await browser.new_tab()
                     item_url = f"https://www.ebay.com/itm/{item_id}"
-                    await tab.go_to(item_url, timeout=30)
-                    await asyncio.sleep(2)
+                    html = page_cache.get(item_url)
 
-                    result = await tab.execute_script(
-                        "return document.documentElement.outerHTML;", return_by_value=True
-                    )
+                    if html is None:
+                        # Fetch page
+                        tab = await browser.new_tab()
+                        await tab.go_to(item_url, timeout=30)
+                        await asyncio.sleep(2)
 
-                    html = None
-                    if isinstance(result, dict):
-                        inner = result.get("result", {})
-                        if isinstance(inner, dict):
-                            html = inner.get("result", {}).get("value")
+                        result = await tab.execute_script(
+                            "return document.documentElement.outerHTML;", return_by_value=True
+                        )
 
-                    await tab.close()
+                        if isinstance(result, dict):
+                            inner = result.get("result", {})
+                            if isinstance(inner, dict):
+                                html = inner.get("result", {}).get("value")
+
+                        await tab.close()
+                        if html:
+                            page_cache.put(item_url, html)
+                            if not first_page_logged:
+                                first_page_logged = True
+                                print(f"[Seller] Time to first page: {time.time() - launch_started:.1f}s")
 
                     if not html:
                         failed += 1
@@ -695,6 +741,7 @@ async def job_backfill_seller_data():
                         pass
 
         await browser.stop()
+        shutil.rmtree(profile_dir, ignore_errors=True)
         print(f"[{datetime.utcnow()}] Seller Backfill Complete: {updated} updated, {failed} failed")
 
     except Exception as e:
@@ -850,3 +897,47 @@ def start_scheduler():
     print("  - job_send_weekly_reports (Email): Mon 9:30 UTC, 2h grace")
     print("  - job_check_price_alerts (Email): 30m interval, 15m grace")
     print("  - job_backfill_seller_data (Seller): 3:00 UTC daily, 2h grace")
+
+
+def scheduler_in_api() -> bool:
+    """Whether the API process should run the scheduler (SCHEDULER_IN_API, default on)."""
+    return os.getenv("SCHEDULER_IN_API", "1").lower() not in ("0", "false", "off")
+
+
+async def run_scheduler(stopping: asyncio.Event, lock: Optional[AdvisoryLock] = None):
+    """
+    Run the scheduler only while this process holds the scheduler lock.
+
+    Standby processes retry every SCHEDULER_LOCK_INTERVAL seconds (default 30) and
+    take over when the holder goes away; a holder that loses its lock pauses its
+    jobs. Returns (releasing the lock) once `stopping` is set.
+    """
+    lock = lock or AdvisoryLock(engine)
+    interval = env_number("SCHEDULER_LOCK_INTERVAL", 30.0)
+    standing_by = False
+    try:
+        while not stopping.is_set():
+            try:
+                if lock.held and not lock.check():
+                    print("[Scheduler] Lost the scheduler lock, pausing jobs")
+                    scheduler.pause()
+                if not lock.held and lock.try_acquire():
+                    if scheduler.running:
+                        scheduler.resume()
+                        print("[Scheduler] Reacquired the scheduler lock, jobs resumed")
+                    else:
+                        start_scheduler()
+                elif not lock.held and not standing_by:
+                    print("[Scheduler] Another process holds the scheduler lock, standing by")
+                standing_by = not lock.held
+            except Exception as e:
+                print(f"[Scheduler] Lock error: {type(e).__name__}: {e}")
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if scheduler.running:
+            scheduler.shutdown(wait=False)
+        lock.release()
+
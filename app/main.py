@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -8,7 +9,7 @@ from app.api.billing import BILLING_AVAILABLE
 from app.middleware.metering import APIMeteringMiddleware, METERING_AVAILABLE
 from app.core.saas import get_mode_info
 from contextlib import asynccontextmanager
-from app.core.scheduler import start_scheduler
+from app.core.scheduler import run_scheduler, scheduler_in_api
 from app.core.anti_scraping import AntiScrapingMiddleware
 from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
@@ -22,10 +23,15 @@ async def lifespan(app: FastAPI):
     logger.info("WondersTracker API Starting")
     logger.info(f"SaaS Features: {'ENABLED' if BILLING_AVAILABLE else 'DISABLED (OSS mode)'}")
     logger.info(f"Usage Metering: {'ENABLED' if METERING_AVAILABLE else 'DISABLED'}")
+    logger.info(f"Scheduler: {'in API (leader-elected)' if scheduler_in_api() else 'DISABLED (runs in python -m app.worker)'}")
     logger.info("=" * 50)
-    start_scheduler()
+    stopping = asyncio.Event()
+    scheduler_task = asyncio.create_task(run_scheduler(stopping)) if scheduler_in_api() else None
     yield
-    # Shutdown (scheduler stops automatically usually or we can stop it)
+    # Shutdown: stop the scheduler and release its lock so a standby process takes over
+    if scheduler_task:
+        stopping.set()
+        await scheduler_task
 
 
 app = FastAPI(title=settings.PROJECT_NAME, openapi_url=f"{settings.API_V1_STR}/openapi.json", lifespan=lifespan)
@@ -0,0 +1,29 @@
+"""
+Durable cache of AI listing extractions (see app/services/extraction_cache.py).
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+from sqlalchemy import Column, Index
+from sqlalchemy.types import JSON
+
+
+class ExtractionCacheEntry(SQLModel, table=True):
+    """
+    One AI extraction result per (normalized title hash, extraction version).
+
+    The version is derived from the model and prompts, so changing either
+    starts a fresh keyspace instead of serving results of the old prompt.
+    """
+
+    __tablename__ = "extraction_cache"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    title_hash: str
+    version: str
+    title: str  # Original title, for inspection/evaluation
+    result: Dict[str, Any] = Field(sa_column=Column(JSON, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (Index("ux_extraction_cache_hash_version", "title_hash", "version", unique=True),)
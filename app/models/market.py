@@ -113,3 +113,22 @@ class ListingReport(SQLModel, table=True):
     resolved_at: Optional[datetime] = Field(default=None)
 
     created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class ScrapeWatermark(SQLModel, table=True):
+    """
+    Per-(card, query) high-water mark for incremental sold scrapes.
+
+    eBay sold searches are newest-first, so newest_sold_date tells us how far
+    the last scrape got; pages_fetched shows how deep incremental runs go.
+    """
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    card_id: int = Field(foreign_key="card.id", index=True)
+    query: str
+    newest_sold_date: Optional[datetime] = None
+    pages_fetched: int = Field(default=0)  # Pages read on the last run
+    new_listings: int = Field(default=0)  # New listings found on the last run
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    __table_args__ = (Index("ix_scrapewatermark_card_query", "card_id", "query", unique=True),)
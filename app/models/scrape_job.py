@@ -0,0 +1,56 @@
+"""
+Distributed scrape job queue (see app/core/job_queue.py).
+"""
+
+from typing import Any, Dict, Optional
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+from sqlalchemy import Column, Index, text
+from sqlalchemy.types import JSON
+
+
+class ScrapeJob(SQLModel, table=True):
+    """
+    One unit of scrape work (usually one card), leased by a worker.
+
+    Lifecycle: queued -> leased -> done | failed. A lease that is not renewed by
+    heartbeat before lease_expires_at is taken over by another worker; a failed
+    attempt is re-queued with backoff until max_attempts is reached.
+    """
+
+    __tablename__ = "scrape_job"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+
+    kind: str = Field(index=True)  # 'market', 'backfill'
+    card_id: Optional[int] = Field(default=None, foreign_key="card.id", index=True)
+    payload: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    # At most one queued/leased job per key (e.g. "market:42")
+    dedupe_key: Optional[str] = Field(default=None)
+    priority: float = Field(default=0.0)  # Higher runs first
+
+    status: str = Field(default="queued")  # 'queued', 'leased', 'done', 'failed'
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    available_at: datetime = Field(default_factory=datetime.utcnow)  # Not leased before this (retry backoff)
+
+    # Lease
+    leased_by: Optional[str] = Field(default=None)  # Worker id
+    lease_expires_at: Optional[datetime] = Field(default=None)
+    heartbeat_at: Optional[datetime] = Field(default=None)
+
+    last_error: Optional[str] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = Field(default=None)
+
+    __table_args__ = (
+        # Lease scan: runnable jobs by priority
+        Index("ix_scrape_job_status_available", "status", "available_at"),
+        Index(
+            "ux_scrape_job_active_dedupe",
+            "dedupe_key",
+            unique=True,
+            postgresql_where=text("status IN ('queued', 'leased')"),
+            sqlite_where=text("status IN ('queued', 'leased')"),
+        ),
+    )
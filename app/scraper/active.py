@@ -1,10 +1,11 @@
 from sqlmodel import Session, select
 from app.db import engine
-from app.scraper.browser import get_page_content
+from app.models.market import MarketPrice
+from app.scraper.fetcher import fetch_page
 from app.scraper.utils import build_ebay_url
-from app.scraper.ebay import parse_active_results, parse_total_results
+from app.scraper.ebay import parse_active_results_async, parse_total_results
 from app.discord_bot.logger import log_new_listing
-from typing import Tuple, Optional
+from typing import Awaitable, Callable, Tuple, Optional
 
 
 async def scrape_active_data(
@@ -13,6 +14,7 @@ async def scrape_active_data(
     search_term: Optional[str] = None,
     save_to_db: bool = True,
     product_type: str = "Single",
+    fetch: Optional[Callable[[str], Awaitable[str]]] = None,
 ) -> Tuple[float, int, float]:
     """
     Scrapes active listings to find:
@@ -25,6 +27,7 @@ async def scrape_active_data(
         card_id: Database ID of the card
         search_term: Optional search term override
         save_to_db: If True, saves individual active listings to database
+        fetch: Optional page fetcher (defaults to the tiered HTTP->browser fetcher)
 
     Returns: (lowest_ask, inventory_count, highest_bid)
     """
@@ -34,10 +37,10 @@ async def scrape_active_data(
     # Search Active Listings (sold_only=False)
     url = build_ebay_url(query, sold_only=False)
     try:
-        # Use Pydoll browser (handles eBay's bot detection)
-        html = await get_page_content(url)
+        # HTTP first, Pydoll browser when eBay blocks it
+        html = await (fetch or fetch_page)(url)
         # Validate against pure card_name, not search_term
-        items = parse_active_results(html, card_id, card_name=card_name, product_type=product_type)
+        items = await parse_active_results_async(html, card_id, card_name=card_name, product_type=product_type)
 
         if not items:
             return (0.0, 0, 0.0)
@@ -47,15 +50,11 @@ async def scrape_active_data(
         lowest_ask = min(prices) if prices else 0.0
 
         # Calculate Highest Bid
-        # We need to check which items are auctions and have bids.
-        # In `ebay.py`, we added `bid_count` to the MarketPrice object (monkey-patched).
-        # We want the highest PRICE among items that have > 0 bids.
+        # We want the highest PRICE among auction items that have > 0 bids.
         highest_bid = 0.0
 
         for item in items:
-            # Check if it has bids (we monkey-patched this property in parse_generic_results)
-            bid_count = getattr(item, "bid_count", 0)
-            if bid_count > 0:
+            if item.bid_count > 0:
                 if item.price > highest_bid:
                     highest_bid = item.price
 
@@ -68,7 +67,6 @@ async def scrape_active_data(
             try:
                 with Session(engine) as session:
                     from datetime import datetime, timedelta
-                    from app.models.market import MarketPrice
 
                     # Delete stale active listings (older than 30 days)
                     # Keep listings long enough to track active->sold transitions
@@ -126,27 +124,27 @@ async def scrape_active_data(
                             existing.url = item.url
                             existing.scraped_at = datetime.utcnow()
                             # Don't update listed_at - preserve original "first seen" time
-                            existing.image_url = getattr(item, "image_url", existing.image_url)
-                            existing.seller_name = getattr(item, "seller_name", existing.seller_name)
-                            existing.condition = getattr(item, "condition", existing.condition)
-                            existing.shipping_cost = getattr(item, "shipping_cost", existing.shipping_cost)
+                            existing.image_url = item.image_url
+                            existing.seller_name = item.seller_name
+                            existing.condition = item.condition
+                            existing.shipping_cost = item.shipping_cost
                             session.add(existing)
                             updated_count += 1
                         else:
                             # Add new listing - set listed_at to track when first seen
                             item.listed_at = datetime.utcnow()
                             try:
-                                session.add(item)
+                                session.add(item.to_market_price())
                                 session.flush()  # Force immediate insert to catch constraint violations
                                 new_count += 1
 
                                 # Send webhook notification for NEW listings only
                                 try:
-                                    is_auction = getattr(item, "bid_count", 0) > 0
+                                    is_auction = item.bid_count > 0
                                     log_new_listing(
                                         card_name=card_name,
                                         price=item.price,
-                                        treatment=getattr(item, "treatment", None),
+                                        treatment=item.treatment,
                                         url=item.url,
                                         is_auction=is_auction,
                                         floor_price=lowest_ask if lowest_ask > 0 else None,
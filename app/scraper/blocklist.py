@@ -3,10 +3,14 @@ Blocklist loader for TCG contamination filtering.
 
 Loads blocklist terms from blocklist.yaml and provides a flat list
 of all terms for use in the scraper's _is_valid_match function.
+
+The terms are also compiled into a single alternation regex so a title
+is checked against the whole blocklist in one pass.
 """
 
 import os
-from typing import List, Set
+import re
+from typing import List, Optional, Pattern, Set
 import yaml
 
 # Path to the blocklist YAML file
@@ -16,6 +20,10 @@ BLOCKLIST_PATH = os.path.join(os.path.dirname(__file__), "blocklist.yaml")
 _blocklist_cache: Set[str] = set()
 _blocklist_version: str = ""
 
+# Compiled matcher for the loaded blocklist (rebuilt when the version or terms change)
+_blocklist_pattern: Optional[Pattern[str]] = None
+_blocklist_pattern_key: tuple = ()
+
 
 def _flatten_yaml_values(data: dict) -> Set[str]:
     """Recursively flatten all string values from a nested dict/list structure."""
@@ -45,6 +53,20 @@ def _flatten_yaml_values(data: dict) -> Set[str]:
     return terms
 
 
+def _compile_blocklist(terms: Set[str]) -> Optional[Pattern[str]]:
+    """
+    Compile blocklist terms into one alternation regex.
+
+    Longest terms come first so the reported match is the most specific one.
+    Terms are matched literally (spaces and punctuation included), exactly like
+    the old `term in title_lower` scan.
+    """
+    if not terms:
+        return None
+    ordered = sorted(terms, key=lambda t: (-len(t), t))
+    return re.compile("|".join(re.escape(term) for term in ordered))
+
+
 def load_blocklist(force_reload: bool = False) -> Set[str]:
     """
     Load the blocklist from YAML file.
@@ -55,7 +77,7 @@ def load_blocklist(force_reload: bool = False) -> Set[str]:
     Returns:
         Set of lowercase blocklist terms.
     """
-    global _blocklist_cache, _blocklist_version
+    global _blocklist_cache, _blocklist_version, _blocklist_pattern, _blocklist_pattern_key
 
     if _blocklist_cache and not force_reload:
         return _blocklist_cache
@@ -67,6 +89,12 @@ def load_blocklist(force_reload: bool = False) -> Set[str]:
         _blocklist_version = data.get("version", "unknown")
         _blocklist_cache = _flatten_yaml_values(data)
 
+        # Recompile the matcher only when the blocklist actually changed
+        pattern_key = (_blocklist_version, frozenset(_blocklist_cache))
+        if pattern_key != _blocklist_pattern_key:
+            _blocklist_pattern = _compile_blocklist(_blocklist_cache)
+            _blocklist_pattern_key = pattern_key
+
         return _blocklist_cache
     except FileNotFoundError:
         print(f"WARNING: Blocklist file not found at {BLOCKLIST_PATH}")
@@ -76,6 +104,13 @@ def load_blocklist(force_reload: bool = False) -> Set[str]:
         return set()
 
 
+def get_blocklist_matcher() -> Optional[Pattern[str]]:
+    """Get the compiled matcher for the loaded blocklist (None if the blocklist is empty)."""
+    if not _blocklist_cache:
+        load_blocklist()
+    return _blocklist_pattern
+
+
 def get_blocklist_version() -> str:
     """Get the version of the currently loaded blocklist."""
     global _blocklist_version
@@ -109,14 +144,11 @@ def is_blocked(title: str) -> bool:
     Returns:
         True if the title contains a blocklist term, False otherwise.
     """
-    title_lower = title.lower()
-    blocklist = load_blocklist()
-
-    for term in blocklist:
-        if term in title_lower:
-            return True
+    matcher = get_blocklist_matcher()
+    if matcher is None:
+        return False
 
-    return False
+    return matcher.search(title.lower()) is not None
 
 
 def get_blocking_terms(title: str) -> List[str]:
@@ -130,14 +162,14 @@ def get_blocking_terms(title: str) -> List[str]:
         List of blocklist terms found in the title.
     """
     title_lower = title.lower()
-    blocklist = load_blocklist()
 
-    found = []
-    for term in blocklist:
-        if term in title_lower:
-            found.append(term)
+    # Single-pass check first - most titles are clean, so skip the per-term scan
+    matcher = get_blocklist_matcher()
+    if matcher is None or matcher.search(title_lower) is None:
+        return []
 
-    return found
+    # Overlapping terms (e.g. "mtg " and " mtg") need the full scan to all be reported
+    return [term for term in load_blocklist() if term in title_lower]
 
 
 # Pre-load the blocklist on module import
@@ -1,17 +1,22 @@
 # Use pydoll for undetected browser automation
 from pydoll.browser.chromium.chrome import Chrome
 from pydoll.browser.options import ChromiumOptions
-from typing import Optional
+from typing import Dict, List, Optional
 import asyncio
 import os
-import random
 import shutil
 import tempfile
 import subprocess
+import time
 
+from app.scraper.page_cache import page_cache
+from app.scraper.profile_template import clone_profile, save_template
+from app.scraper.readiness import READY_BLOCKED, wait_until_ready
+from app.scraper.remote_browser import RemoteBrowserPool
+from app.scraper.resource_blocking import ResourceBlocker
+from app.scraper.tab_pool import DomainPacer, TabPool, domain_pacer
+from app.core.env import env_number
 
-# Serialize browser operations - only 1 at a time for stability
-_semaphore = asyncio.Semaphore(1)
 
 # Flag to track if we're in a container environment
 IS_CONTAINER = os.path.exists("/.dockerenv") or os.getenv("RAILWAY_ENVIRONMENT") is not None
@@ -95,97 +100,327 @@ def get_user_data_dir():
     return os.path.join(tempfile.gettempdir(), f"pydoll_profile_{os.getpid()}")
 
 
+def browser_pid(browser) -> Optional[int]:
+    """PID of the Chrome process pydoll launched (None if unknown)."""
+    process = getattr(getattr(browser, "_browser_process_manager", None), "_process", None)
+    return getattr(process, "pid", None)
+
+
+def process_tree_rss(pid: int) -> Optional[int]:
+    """
+    Resident memory (bytes) of a process and all its descendants, read from /proc.
+
+    Chrome spreads a session over many renderer/GPU/utility processes, so the
+    browser process alone says little. Returns None where /proc isn't available.
+    """
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return None
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # "pid (comm) state ppid ..." - comm may contain spaces
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total, stack, seen, found = 0, [pid], set(), False
+    while stack:
+        current = stack.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except (OSError, ValueError):
+            continue
+        found = True
+        stack.extend(children.get(current, []))
+    return total if found else None
+
+
 class BrowserManager:
     _browser: Optional[Chrome] = None
     _lock = asyncio.Lock()
     _restart_count: int = 0
     _max_restarts: int = 3
     _startup_timeout: int = 60  # seconds to wait for browser startup
+    # Bumped whenever the browser is closed - lets concurrent tabs agree on one restart
+    _generation: int = 0
+    # Concurrent warm tabs (replaces the old global semaphore) + explicit per-domain pacing
+    _tab_pool: Optional[TabPool] = None
+    pacer: DomainPacer = domain_pacer
+    # Aborts images/media/fonts and non-allowlisted scripts on every pooled tab
+    resource_blocker: ResourceBlocker = ResourceBlocker.from_env()
+    # Proactive recycling: replace Chrome after this many pages or this much RSS (0 disables)
+    max_pages: int = env_number("SCRAPER_BROWSER_MAX_PAGES", 400, int)
+    max_rss_mb: int = env_number("SCRAPER_BROWSER_MAX_RSS_MB", 1500, int)
+    rss_check_every: int = env_number("SCRAPER_BROWSER_RSS_CHECK_EVERY", 10, int)
+    drain_timeout: float = env_number("SCRAPER_BROWSER_DRAIN_TIMEOUT", 60.0)
+    _profile_dir: Optional[str] = None
+    _pages_served: int = 0
+    _blocked_pages: int = 0
+    # Launch time of the current browser, for time-to-first-page logging
+    _started_at: Optional[float] = None
+    last_time_to_first_page: Optional[float] = None
+    _recycle_count: int = 0
+    _recycle_task: Optional["asyncio.Task"] = None
 
     @classmethod
-    async def get_browser(cls) -> Chrome:
-        async with cls._lock:
-            if not cls._browser:
-                print("[Browser] Starting pydoll browser...")
-                print(f"[Browser] Container environment: {IS_CONTAINER}")
-
-                options = ChromiumOptions()
-                options.headless = True
-
-                # Use system Chrome if available (for production containers)
-                chrome_path = find_chrome_binary()
-                if chrome_path:
-                    print(f"[Browser] Using Chrome: {chrome_path}")
-                    options.binary_location = chrome_path
-                else:
-                    print("[Browser] ERROR: No Chrome binary found. Browser will likely fail.")
-
-                # Essential args for headless Chrome in containers
-                options.add_argument("--no-sandbox")
-                options.add_argument("--disable-dev-shm-usage")
-                options.add_argument("--disable-gpu")
-                options.add_argument("--disable-software-rasterizer")
-
-                # Anti-detection args
-                options.add_argument("--disable-blink-features=AutomationControlled")
-
-                # Memory optimization for containers
-                options.add_argument("--disable-extensions")
-                options.add_argument("--disable-plugins")
-
-                # Additional container-specific settings
-                if IS_CONTAINER:
-                    print("[Browser] Applying container-specific settings...")
-                    options.add_argument("--disable-setuid-sandbox")
-                    options.add_argument("--disable-background-networking")
-                    options.add_argument("--disable-default-apps")
-                    options.add_argument("--disable-sync")
-                    options.add_argument("--disable-translate")
-                    options.add_argument("--metrics-recording-only")
-                    options.add_argument("--mute-audio")
-                    # Note: --no-first-run is added automatically by pydoll
-                    options.add_argument("--safebrowsing-disable-auto-update")
-                    # Reduce process count
-                    options.add_argument("--renderer-process-limit=1")
-                    options.add_argument("--disable-features=TranslateUI")
-
-                # Use unique profile per process
-                profile_dir = get_user_data_dir()
-                print(f"[Browser] Using profile: {profile_dir}")
-                options.add_argument(f"--user-data-dir={profile_dir}")
-
-                # Create browser instance
-                cls._browser = Chrome(options=options)
-
-                # Start with timeout
+    def tab_pool(cls) -> TabPool:
+        """Shared tab pool on the current browser (created on first use)."""
+        if cls._tab_pool is None:
+
+            async def new_tab():
+                browser = await cls.get_browser()
+                tab = await browser.new_tab()
                 try:
-                    print(f"[Browser] Starting browser with {cls._startup_timeout}s timeout...")
-                    await asyncio.wait_for(cls._browser.start(), timeout=cls._startup_timeout)
-                    print("[Browser] Pydoll browser started successfully!")
-                except asyncio.TimeoutError:
-                    print(f"[Browser] ERROR: Browser startup timed out after {cls._startup_timeout}s")
-                    cls._browser = None
-                    raise Exception(f"Browser startup timed out after {cls._startup_timeout}s")
-                except Exception as start_err:
-                    print(f"[Browser] ERROR: Browser start failed: {type(start_err).__name__}: {start_err}")
-                    cls._browser = None
-                    raise
+                    await cls.resource_blocker.attach(tab)
+                except Exception as e:
+                    print(f"[Browser] Resource blocking unavailable on tab: {type(e).__name__}: {e}")
+                return tab
 
+            cls._tab_pool = TabPool(
+                new_tab,
+                size=env_number("SCRAPER_TAB_POOL_SIZE", 3, int),
+                max_uses=env_number("SCRAPER_TAB_MAX_USES", 25, int),
+            )
+        return cls._tab_pool
+
+    @classmethod
+    async def warm_tabs(cls) -> int:
+        """Pre-open the pool's tabs (best effort). Returns tabs opened."""
+        if remote_browser_pool.enabled:
+            return 0
+        try:
+            opened = await cls.tab_pool().warm()
+            print(f"[Browser] Warmed {opened} tabs")
+            return opened
+        except Exception as e:
+            print(f"[Browser] Tab warm-up failed: {type(e).__name__}: {e}")
+            return 0
+
+    @classmethod
+    async def get_browser(cls) -> Optional[Chrome]:
+        """
+        Start (or return) the local browser.
+
+        With BROWSER_SERVICE_URLS set, connects the remote pool instead and returns
+        None - no Chrome is launched in this process.
+        """
+        if remote_browser_pool.enabled:
+            await remote_browser_pool.start()
+            return None
+
+        async with cls._lock:
+            if not cls._browser:
+                started = time.monotonic()
+                cls._profile_dir = get_user_data_dir()
+                cls._browser = await cls._launch(cls._profile_dir)
+                cls._reset_counters(started)
             return cls._browser
 
+    @classmethod
+    def _reset_counters(cls, started: float) -> None:
+        cls._pages_served = 0
+        cls._blocked_pages = 0
+        cls._started_at = started
+
+    @classmethod
+    async def _launch(cls, profile_dir: str) -> Chrome:
+        """Start a new Chrome instance on the given profile directory (cloned from the warm template if any)."""
+        print("[Browser] Starting pydoll browser...")
+        launch_started = time.monotonic()
+        warm = clone_profile(profile_dir)
+        print(f"[Browser] Container environment: {IS_CONTAINER}")
+
+        options = ChromiumOptions()
+        options.headless = True
+
+        # Use system Chrome if available (for production containers)
+        chrome_path = find_chrome_binary()
+        if chrome_path:
+            print(f"[Browser] Using Chrome: {chrome_path}")
+            options.binary_location = chrome_path
+        else:
+            print("[Browser] ERROR: No Chrome binary found. Browser will likely fail.")
+
+        # Essential args for headless Chrome in containers
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--disable-software-rasterizer")
+
+        # Anti-detection args
+        options.add_argument("--disable-blink-features=AutomationControlled")
+
+        # Memory optimization for containers
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-plugins")
+
+        # Additional container-specific settings
+        if IS_CONTAINER:
+            print("[Browser] Applying container-specific settings...")
+            options.add_argument("--disable-setuid-sandbox")
+            options.add_argument("--disable-background-networking")
+            options.add_argument("--disable-default-apps")
+            options.add_argument("--disable-sync")
+            options.add_argument("--disable-translate")
+            options.add_argument("--metrics-recording-only")
+            options.add_argument("--mute-audio")
+            # Note: --no-first-run is added automatically by pydoll
+            options.add_argument("--safebrowsing-disable-auto-update")
+            # Reduce process count
+            options.add_argument("--renderer-process-limit=1")
+            options.add_argument("--disable-features=TranslateUI")
+
+        print(f"[Browser] Using profile: {profile_dir} ({'warm template' if warm else 'cold'})")
+        options.add_argument(f"--user-data-dir={profile_dir}")
+
+        # Create browser instance
+        browser = Chrome(options=options)
+
+        # Start with timeout
+        try:
+            print(f"[Browser] Starting browser with {cls._startup_timeout}s timeout...")
+            await asyncio.wait_for(browser.start(), timeout=cls._startup_timeout)
+            print(f"[Browser] Pydoll browser started successfully in {time.monotonic() - launch_started:.1f}s!")
+            return browser
+        except asyncio.TimeoutError:
+            print(f"[Browser] ERROR: Browser startup timed out after {cls._startup_timeout}s")
+            raise Exception(f"Browser startup timed out after {cls._startup_timeout}s")
+        except Exception as start_err:
+            print(f"[Browser] ERROR: Browser start failed: {type(start_err).__name__}: {start_err}")
+            raise
+
+    @classmethod
+    def memory_usage(cls) -> Optional[int]:
+        """RSS in bytes of the local Chrome process tree (None if not running/unknown)."""
+        pid = browser_pid(cls._browser)
+        return process_tree_rss(pid) if pid else None
+
+    @classmethod
+    def recycle_reason(cls) -> Optional[str]:
+        """Why the current browser should be replaced now, or None."""
+        if cls.max_pages and cls._pages_served >= cls.max_pages:
+            return f"{cls._pages_served} pages served"
+        if cls.max_rss_mb and cls.rss_check_every and cls._pages_served % cls.rss_check_every == 0:
+            rss = cls.memory_usage()
+            if rss and rss >= cls.max_rss_mb * 1024 * 1024:
+                return f"Chrome RSS {rss / 1024 / 1024:.0f} MB"
+        return None
+
+    @classmethod
+    def record_page(cls, blocked: bool = False) -> None:
+        """Count a served page; starts a background recycle when a threshold is crossed."""
+        cls._pages_served += 1
+        cls._blocked_pages += int(blocked)
+        if cls._pages_served == 1 and cls._started_at is not None:
+            cls.last_time_to_first_page = time.monotonic() - cls._started_at
+            print(f"[Browser] Time to first page: {cls.last_time_to_first_page:.1f}s")
+        if cls._browser is None or (cls._recycle_task and not cls._recycle_task.done()):
+            return
+        reason = cls.recycle_reason()
+        if reason:
+            cls._recycle_task = asyncio.create_task(cls.recycle(reason))
+
+    @classmethod
+    async def recycle(cls, reason: str = "requested") -> bool:
+        """
+        Replace Chrome without a cold-start gap or killing in-flight pages.
+
+        The replacement starts (and gets warm tabs) while the old browser keeps
+        serving; new checkouts then go to the replacement, and the old browser is
+        stopped once its lent-out tabs come back (or drain_timeout passes).
+        """
+        old_browser, old_profile = cls._browser, cls._profile_dir
+        if old_browser is None:
+            return False
+        started = time.monotonic()
+        print(f"[Browser] Recycling browser ({reason})...")
+        cls._recycle_count += 1
+        profile_dir = f"{get_user_data_dir()}_{cls._recycle_count}"
+        try:
+            new_browser = await cls._launch(profile_dir)
+        except Exception as e:
+            print(f"[Browser] Recycle aborted, replacement failed to start: {type(e).__name__}: {e}")
+            return False
+
+        pool = cls.tab_pool()
+        async with cls._lock:
+            if cls._browser is not old_browser:
+                # Closed or restarted meanwhile - the replacement isn't needed
+                swapped = False
+            else:
+                snapshot = cls._session_clean()
+                cls._browser, cls._profile_dir = new_browser, profile_dir
+                cls._reset_counters(started)
+                cls._generation += 1
+                old_generation = pool.generation
+                swapped = True
+        if not swapped:
+            await cls._stop(new_browser, profile_dir)
+            return False
+
+        # New checkouts open tabs on the replacement; tabs still out finish on the old one
+        await pool.reset()
+        await cls.warm_tabs()
+        if not await pool.drain(old_generation, cls.drain_timeout):
+            print(f"[Browser] Drain timed out after {cls.drain_timeout:.0f}s; stopping old browser anyway")
+        await cls._stop(old_browser, old_profile, snapshot=snapshot)
+        print(f"[Browser] Recycle complete (recycle #{cls._recycle_count})")
+        return True
+
+    @classmethod
+    def _session_clean(cls) -> bool:
+        """Whether the current profile is worth keeping as the warm template."""
+        return cls._pages_served > 0 and cls._blocked_pages == 0
+
+    @staticmethod
+    async def _stop(browser: Chrome, profile_dir: Optional[str], snapshot: bool = False) -> None:
+        try:
+            await browser.stop()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+        # Snapshot after stop so Chrome has flushed cookies to disk
+        if snapshot and profile_dir and save_template(profile_dir):
+            print("[Browser] Saved profile as warm template")
+        # Recycled profiles are one-off copies; the base per-process profile is kept
+        if profile_dir and profile_dir != get_user_data_dir():
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
     @classmethod
     async def close(cls):
+        if remote_browser_pool.enabled:
+            await remote_browser_pool.close()
+        if cls._tab_pool:
+            await cls._tab_pool.reset()
         async with cls._lock:
+            cls._generation += 1
             if cls._browser:
-                try:
-                    await cls._browser.stop()
-                except Exception as e:
-                    print(f"Error closing browser: {e}")
+                await cls._stop(cls._browser, cls._profile_dir, snapshot=cls._session_clean())
                 cls._browser = None
 
     @classmethod
-    async def restart(cls):
-        """Force restart of the browser instance"""
+    async def restart(cls, generation: Optional[int] = None):
+        """
+        Force restart of the browser instance.
+
+        generation: the _generation the caller saw fail. If the browser has been
+        restarted since (by another tab), this is a no-op.
+        """
+        if generation is not None and generation != cls._generation:
+            return await cls.get_browser()
+
         # Check if we've hit the restart limit BEFORE incrementing
         if cls._restart_count >= cls._max_restarts:
             print(f"Browser restarted {cls._restart_count} times. Applying extended cooldown...")
@@ -199,28 +434,53 @@ class BrowserManager:
         return await cls.get_browser()
 
 
+# browser-service replicas (only used when BROWSER_SERVICE_URLS is set); shares
+# the local browser's pacing and resource blocking
+remote_browser_pool = RemoteBrowserPool.from_env(pacer=BrowserManager.pacer, blocker=BrowserManager.resource_blocker)
+
+
 async def get_page_content(url: str, retries: int = 3) -> str:
     """
     Navigates to a URL and returns the HTML content.
     Uses pydoll for undetected browsing.
+
+    Chrome is replaced proactively after SCRAPER_BROWSER_MAX_PAGES pages or once
+    its process tree exceeds SCRAPER_BROWSER_MAX_RSS_MB (see BrowserManager.recycle).
+
+    Navigations run concurrently on pooled tabs (SCRAPER_TAB_POOL_SIZE); requests
+    to the same domain are spaced by BrowserManager.pacer. After navigating we wait
+    only until results (or a block page) render - see readiness.wait_until_ready.
+
+    Fresh pages from the on-disk page cache are returned without navigating
+    (in replay mode a miss raises PageCacheMiss). With BROWSER_SERVICE_URLS set,
+    pages are rendered on remote browser-service replicas (see remote_browser).
     """
-    last_error = None
+    cached = page_cache.get(url)
+    if cached is not None:
+        return cached
 
-    async with _semaphore:  # Serialize browser operations
-        for attempt in range(retries + 1):
-            tab = None
-            try:
-                browser = await BrowserManager.get_browser()
-                tab = await browser.new_tab()
+    if remote_browser_pool.enabled:
+        content = await remote_browser_pool.get_page_content(url, retries=retries)
+        page_cache.put(url, content)
+        return content
+
+    last_error = None
 
-                # Random delay before navigation (human-like)
-                await asyncio.sleep(random.uniform(1, 3))
+    for attempt in range(retries + 1):
+        generation = BrowserManager._generation
+        try:
+            async with BrowserManager.tab_pool().tab() as tab:
+                # Politeness: min interval + jitter between hits to this domain
+                await BrowserManager.pacer.wait(url)
 
                 # Navigate
                 await tab.go_to(url)
 
-                # Random wait for content to load (human-like)
-                await asyncio.sleep(random.uniform(2, 4))
+                # Wait for result rows / block page instead of a fixed sleep
+                state = await wait_until_ready(tab, url)
+                blocked = state == READY_BLOCKED
+                if blocked:
+                    print(f"[Browser] Block page served for {url}")
 
                 # Get page content
                 content = await tab.page_source
@@ -228,33 +488,29 @@ async def get_page_content(url: str, retries: int = 3) -> str:
                 if not content or len(content) < 100:
                     raise Exception("Empty or invalid page content received")
 
-                return content
-
-            except Exception as e:
-                last_error = e
-                error_msg = str(e).lower()
-                print(f"Error in get_page_content (attempt {attempt + 1}/{retries + 1}):")
-                print(f"  Type: {type(e).__name__}")
-                print(f"  Message: {e}")
-
-                # If it's a browser-level error, restart
-                if any(keyword in error_msg for keyword in ["browser", "closed", "crashed", "connection"]):
-                    print("Detected browser issue. Restarting browser...")
-                    await BrowserManager.restart()
-                    await asyncio.sleep(2)
-                else:
-                    await asyncio.sleep(1)
-
-                if attempt == retries:
-                    print(f"Failed after {retries + 1} attempts: {last_error}")
-                    raise last_error
-
-            finally:
-                if tab:
-                    try:
-                        await tab.close()
-                    except Exception:
-                        pass
+            # Counts toward proactive recycling (which runs in the background)
+            BrowserManager.record_page(blocked=blocked)
+            page_cache.put(url, content)
+            return content
+
+        except Exception as e:
+            last_error = e
+            error_msg = str(e).lower()
+            print(f"Error in get_page_content (attempt {attempt + 1}/{retries + 1}):")
+            print(f"  Type: {type(e).__name__}")
+            print(f"  Message: {e}")
+
+            # If it's a browser-level error, restart (once, even if several tabs saw it)
+            if any(keyword in error_msg for keyword in ["browser", "closed", "crashed", "connection"]):
+                print("Detected browser issue. Restarting browser...")
+                await BrowserManager.restart(generation)
+                await asyncio.sleep(2)
+            else:
+                await asyncio.sleep(1)
+
+            if attempt == retries:
+                print(f"Failed after {retries + 1} attempts: {last_error}")
+                raise last_error
 
     # Should never reach here (loop raises on final attempt), but handle edge case
     if last_error:
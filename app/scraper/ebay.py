@@ -1,5 +1,6 @@
 from bs4 import BeautifulSoup
-from typing import List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dateutil import parser
 import re
@@ -7,8 +8,11 @@ import difflib
 from sqlmodel import Session, select
 from app.models.market import MarketPrice
 from app.services.ai_extractor import get_ai_extractor
+from app.services.extraction_coalescer import coalescing_enabled, get_extraction_coalescer
+from app.scraper.rule_classifier import classify_title, rule_first_enabled, rule_first_threshold
 from app.db import engine
-from app.scraper.blocklist import load_blocklist
+from app.scraper.blocklist import is_blocked
+from app.scraper.title_features import clean_title_text, extract_title_features
 
 STOPWORDS = {
     "the",
@@ -30,6 +34,66 @@ STOPWORDS = {
 }
 
 
+@dataclass(slots=True)
+class ListingRecord:
+    """
+    Lightweight parsed eBay listing.
+
+    Flows through parse -> dedup -> classify -> stats without SQLAlchemy
+    instrumentation; converted to a MarketPrice row only when it is inserted.
+    """
+
+    card_id: int
+    title: str
+    price: float
+    listing_type: str = "sold"
+    sold_date: Optional[datetime] = None
+    treatment: str = "Classic Paper"
+    quantity: int = 1
+    product_subtype: Optional[str] = None
+    bid_count: int = 0
+    external_id: Optional[str] = None
+    url: Optional[str] = None
+    image_url: Optional[str] = None
+    seller_name: Optional[str] = None
+    seller_feedback_score: Optional[int] = None
+    seller_feedback_percent: Optional[float] = None
+    condition: Optional[str] = None
+    shipping_cost: Optional[float] = None
+    grading: Optional[str] = None
+    platform: str = "ebay"
+    scraped_at: datetime = field(default_factory=datetime.utcnow)
+    listed_at: Optional[datetime] = None
+    # True if the listing already exists in marketprice (set by the bulk dedup check)
+    is_indexed: bool = False
+
+    def to_market_price(self) -> MarketPrice:
+        """Build the MarketPrice row for this listing (call only at insert time)."""
+        return MarketPrice(
+            card_id=self.card_id,
+            title=self.title,
+            price=self.price,
+            quantity=self.quantity,
+            product_subtype=self.product_subtype,
+            sold_date=self.sold_date,
+            listing_type=self.listing_type,
+            treatment=self.treatment,
+            bid_count=self.bid_count,
+            external_id=self.external_id,
+            url=self.url,
+            image_url=self.image_url,
+            platform=self.platform,
+            seller_name=self.seller_name,
+            seller_feedback_score=self.seller_feedback_score,
+            seller_feedback_percent=self.seller_feedback_percent,
+            condition=self.condition,
+            shipping_cost=self.shipping_cost,
+            grading=self.grading,
+            scraped_at=self.scraped_at,
+            listed_at=self.listed_at,
+        )
+
+
 def score_sealed_match(title: str, card_name: str, product_type: str) -> int:
     """
     Score how well a listing title matches a sealed product card.
@@ -149,7 +213,7 @@ def score_sealed_match(title: str, card_name: str, product_type: str) -> int:
 
 def _bulk_check_indexed(
     card_id: int,
-    listings_data: List[dict],
+    listings_data: List[ListingRecord],
     check_global: bool = True,
     card_name: str = "",
     product_type: str = "Single",
@@ -161,9 +225,13 @@ def _bulk_check_indexed(
     If a listing exists for a different card but the current card is a better match,
     it updates the existing record's card_id.
 
+    Runs a fixed number of statements per page regardless of page size:
+    external_id lookup, one card fetch for conflicting listings, one bulk
+    reassignment UPDATE, and one VALUES join for composite keys.
+
     Args:
         card_id: Card ID to check against
-        listings_data: List of dicts with keys: external_id, title, price, sold_date
+        listings_data: Parsed listings (uses external_id, title, price, sold_date)
         check_global: If True, also check if external_id exists for ANY card
         card_name: Name of the card we're searching for (for smart matching)
         product_type: Type of product (Single, Box, Pack, Bundle, Lot)
@@ -171,9 +239,6 @@ def _bulk_check_indexed(
     Returns:
         Set of indices of listings that are already indexed (should be skipped)
     """
-    from app.models.card import Card
-    from sqlalchemy import text
-
     if not listings_data:
         return set()
 
@@ -181,7 +246,7 @@ def _bulk_check_indexed(
 
     with Session(engine) as session:
         # Check by external_ids in bulk (most reliable)
-        external_ids = [listing["external_id"] for listing in listings_data if listing.get("external_id")]
+        external_ids = list({listing.external_id for listing in listings_data if listing.external_id})
 
         if external_ids:
             if check_global:
@@ -192,108 +257,134 @@ def _bulk_check_indexed(
                     )
                 ).all()
 
-                # Build maps for existing records
                 existing_for_this_card = {ext_id for ext_id, cid, mid in all_existing if cid == card_id}
                 existing_other_cards = {ext_id: (cid, mid) for ext_id, cid, mid in all_existing if cid != card_id}
 
-                # For sealed products, use smart matching to determine best card assignment
-                is_sealed = product_type in ("Box", "Pack", "Bundle", "Lot")
-
+                # Every listing stored under ANY card is skipped (no duplicates)
                 for i, listing in enumerate(listings_data):
-                    ext_id = listing.get("external_id")
-                    if not ext_id:
-                        continue
-
-                    if ext_id in existing_for_this_card:
-                        # Already indexed for this exact card - skip
+                    ext_id = listing.external_id
+                    if ext_id and (ext_id in existing_for_this_card or ext_id in existing_other_cards):
                         indexed_indices.add(i)
-                    elif ext_id in existing_other_cards:
-                        # Exists for a different card
-                        if is_sealed and card_name:
-                            # Smart matching: compare scores to find best card
-                            other_card_id, market_price_id = existing_other_cards[ext_id]
-                            title = listing.get("title", "")
-
-                            # Get the other card's details
-                            other_card = session.exec(select(Card).where(Card.id == other_card_id)).first()
-
-                            if other_card:
-                                # Score current card vs the existing card
-                                current_score = score_sealed_match(title, card_name, product_type)
-                                other_score = score_sealed_match(title, other_card.name, other_card.product_type)
-
-                                if current_score > other_score:
-                                    # Current card is a better match - update the existing record
-                                    session.execute(
-                                        text("UPDATE marketprice SET card_id = :card_id WHERE id = :id"),
-                                        {"card_id": card_id, "id": market_price_id},
-                                    )
-                                    session.commit()
-                                    # Mark as indexed since we just updated it
-                                    indexed_indices.add(i)
-                                else:
-                                    # Other card is equal or better match - skip
-                                    indexed_indices.add(i)
-                            else:
-                                # Other card not found (shouldn't happen) - skip to avoid errors
-                                indexed_indices.add(i)
-                        else:
-                            # Not sealed or no card_name - just skip to avoid duplicates
-                            indexed_indices.add(i)
+
+                # For sealed products, move listings to this card if it's a better match
+                if product_type in ("Box", "Pack", "Bundle", "Lot") and card_name and existing_other_cards:
+                    _reassign_sealed_listings(session, card_id, card_name, product_type, listings_data, existing_other_cards)
             else:
                 # Original behavior: only check this card_id
-                existing_ids = session.exec(
-                    select(MarketPrice.external_id).where(
-                        MarketPrice.external_id.in_(external_ids), MarketPrice.card_id == card_id
-                    )
-                ).all()
-                existing_ids_set = set(existing_ids)
+                existing_ids_set = set(
+                    session.exec(
+                        select(MarketPrice.external_id).where(
+                            MarketPrice.external_id.in_(external_ids), MarketPrice.card_id == card_id
+                        )
+                    ).all()
+                )
 
                 # Mark indices with existing external_ids for THIS card
                 for i, listing in enumerate(listings_data):
-                    if listing.get("external_id") in existing_ids_set:
+                    if listing.external_id in existing_ids_set:
                         indexed_indices.add(i)
 
         # Check by composite key for listings without external_id or not found
-        # Build OR conditions for composite keys
-        from sqlalchemy import and_, or_
-
-        composite_conditions = []
-        composite_index_map = {}  # Maps condition index to listing index
-
-        for i, listing in enumerate(listings_data):
-            if i not in indexed_indices:  # Not already found by external_id
-                condition = and_(
-                    MarketPrice.card_id == card_id,
-                    MarketPrice.title == listing["title"],
-                    MarketPrice.price == listing["price"],
-                    MarketPrice.sold_date == listing["sold_date"],
-                )
-                composite_conditions.append(condition)
-                composite_index_map[len(composite_conditions) - 1] = i
-
-        if composite_conditions:
-            # Query with OR of all composite conditions
-            existing_composites = session.exec(
-                select(MarketPrice.title, MarketPrice.price, MarketPrice.sold_date)
-                .where(or_(*composite_conditions))
-                .distinct()
-            ).all()
-
-            # Mark indices that match composite keys
-            for existing in existing_composites:
-                for i, listing in enumerate(listings_data):
-                    if (
-                        i not in indexed_indices
-                        and listing["title"] == existing[0]
-                        and listing["price"] == existing[1]
-                        and listing["sold_date"] == existing[2]
-                    ):
-                        indexed_indices.add(i)
+        remaining = [i for i in range(len(listings_data)) if i not in indexed_indices]
+        if remaining:
+            indexed_indices |= _composite_key_matches(session, card_id, listings_data, remaining)
 
     return indexed_indices
 
 
+def _reassign_sealed_listings(
+    session: Session,
+    card_id: int,
+    card_name: str,
+    product_type: str,
+    listings_data: List[ListingRecord],
+    existing_other_cards: Dict[str, Tuple[int, int]],
+) -> int:
+    """
+    Move listings stored under another card to card_id where this card scores higher.
+
+    One query fetches every conflicting card, one UPDATE moves all winning rows.
+    Returns the number of rows reassigned.
+    """
+    from app.models.card import Card
+    from sqlalchemy import update
+
+    other_card_ids = {cid for cid, _ in existing_other_cards.values()}
+    other_cards = {
+        cid: (name, ptype)
+        for cid, name, ptype in session.exec(
+            select(Card.id, Card.name, Card.product_type).where(Card.id.in_(other_card_ids))
+        ).all()
+    }
+
+    current_scores: Dict[str, int] = {}
+    reassign_ids = set()
+    for listing in listings_data:
+        ext_id = listing.external_id
+        if not ext_id or ext_id not in existing_other_cards:
+            continue
+        other_card_id, market_price_id = existing_other_cards[ext_id]
+        other_card = other_cards.get(other_card_id)
+        if other_card is None:
+            # Other card not found (shouldn't happen) - leave the row alone
+            continue
+
+        # Score current card vs the existing card
+        title = listing.title
+        if title not in current_scores:
+            current_scores[title] = score_sealed_match(title, card_name, product_type)
+        if current_scores[title] > score_sealed_match(title, other_card[0], other_card[1]):
+            reassign_ids.add(market_price_id)
+
+    if reassign_ids:
+        session.execute(update(MarketPrice).where(MarketPrice.id.in_(reassign_ids)).values(card_id=card_id))
+        session.commit()
+        print(f"[Dedup] Reassigned {len(reassign_ids)} listings to card {card_id}")
+
+    return len(reassign_ids)
+
+
+def _composite_key_matches(
+    session: Session, card_id: int, listings_data: List[ListingRecord], candidates: List[int]
+) -> set:
+    """
+    Indices of listings whose (title, price, sold_date) already exists for card_id.
+
+    The keys are sent as a VALUES list joined against marketprice, so the database
+    returns matching indices directly (no OR-of-ANDs predicate, no Python re-match).
+    """
+    from sqlalchemy import DateTime, Float, Integer, String, and_, column, values
+
+    # Postgres types an all-NULL VALUES column as text - only include sold_date if any is set
+    has_dates = any(listings_data[i].sold_date is not None for i in candidates)
+    key_columns = [column("idx", Integer), column("title", String), column("price", Float)]
+    if has_dates:
+        key_columns.append(column("sold_date", DateTime))
+        rows = [(i, listings_data[i].title, listings_data[i].price, listings_data[i].sold_date) for i in candidates]
+    else:
+        rows = [(i, listings_data[i].title, listings_data[i].price) for i in candidates]
+
+    keys = values(*key_columns, name="listing_keys").data(rows).cte()
+    date_match = (
+        MarketPrice.sold_date.is_not_distinct_from(keys.c.sold_date) if has_dates else MarketPrice.sold_date.is_(None)
+    )
+
+    matches = session.exec(
+        select(keys.c.idx)
+        .join(
+            MarketPrice,
+            and_(
+                MarketPrice.card_id == card_id,
+                MarketPrice.title == keys.c.title,
+                MarketPrice.price == keys.c.price,
+                date_match,
+            ),
+        )
+        .distinct()
+    ).all()
+    return set(matches)
+
+
 def parse_search_results(
     html_content: str,
     card_id: int = 0,
@@ -301,7 +392,7 @@ def parse_search_results(
     target_rarity: str = "",
     return_all: bool = False,
     product_type: str = "Single",
-) -> List[MarketPrice]:
+) -> List[ListingRecord]:
     """
     Parses eBay HTML search results and extracts market prices (Sold listings).
 
@@ -321,9 +412,55 @@ def parse_search_results(
     )
 
 
+def parse_search_results_tagged(
+    html_content: str,
+    card_id: int = 0,
+    card_name: str = "",
+    target_rarity: str = "",
+    product_type: str = "Single",
+) -> List[ListingRecord]:
+    """
+    Parses eBay HTML sold results in a single pass, tagging each listing with its index status.
+
+    Every valid listing is returned (for stats) with is_indexed set if it is already
+    stored in the database. Callers derive both the stats set and the save set
+    from this one result instead of parsing the same page twice.
+    """
+    return _parse_tagged_results(
+        html_content,
+        card_id,
+        listing_type="sold",
+        card_name=card_name,
+        target_rarity=target_rarity,
+        product_type=product_type,
+        check_indexed=True,
+        include_indexed=True,
+    )
+
+
+async def parse_search_results_tagged_async(
+    html_content: str,
+    card_id: int = 0,
+    card_name: str = "",
+    target_rarity: str = "",
+    product_type: str = "Single",
+) -> List[ListingRecord]:
+    """parse_search_results_tagged for async scrape code (AI extraction is awaited)."""
+    return await _parse_tagged_results_async(
+        html_content,
+        card_id,
+        listing_type="sold",
+        card_name=card_name,
+        target_rarity=target_rarity,
+        product_type=product_type,
+        check_indexed=True,
+        include_indexed=True,
+    )
+
+
 def parse_active_results(
     html_content: str, card_id: int = 0, card_name: str = "", target_rarity: str = "", product_type: str = "Single"
-) -> List[MarketPrice]:
+) -> List[ListingRecord]:
     """
     Parses eBay HTML search results for ACTIVE listings.
 
@@ -340,6 +477,20 @@ def parse_active_results(
     )
 
 
+async def parse_active_results_async(
+    html_content: str, card_id: int = 0, card_name: str = "", target_rarity: str = "", product_type: str = "Single"
+) -> List[ListingRecord]:
+    """parse_active_results for async scrape code (AI extraction is awaited)."""
+    return await _parse_tagged_results_async(
+        html_content,
+        card_id,
+        listing_type="active",
+        card_name=card_name,
+        target_rarity=target_rarity,
+        product_type=product_type,
+    )
+
+
 def _extract_item_details(item) -> Tuple[Optional[str], Optional[str]]:
     """
     Extracts item ID and URL from the listing element.
@@ -377,18 +528,8 @@ def parse_total_results(html_content: str) -> int:
 
 
 def _is_alt_art(title: str) -> bool:
-    """Check if title indicates an Alt Art variant."""
-    title_lower = title.lower()
-
-    # Explicit alt art mentions
-    if "alt art" in title_lower or "alternate art" in title_lower:
-        return True
-
-    # A1-A8 numbering pattern (e.g., "#A2-361/401", "A5-361/401")
-    if re.search(r"[#\s]a[1-8]-\d+/\d+", title_lower):
-        return True
-
-    return False
+    """Check if title indicates an Alt Art variant ("alt art", or A1-A8 numbering like "#A2-361/401")."""
+    return extract_title_features(title).is_alt_art
 
 
 def _detect_treatment(title: str, product_type: str = "Single") -> str:
@@ -397,69 +538,7 @@ def _detect_treatment(title: str, product_type: str = "Single") -> str:
     For singles: card treatments (Foil, Serialized, etc.)
     For boxes/packs/lots: simplified condition (Sealed, Open Box, Unknown)
     """
-    title_lower = title.lower()
-
-    # Handle sealed products (Box, Pack, Lot, Bundle)
-    # Simplified to: Sealed, Open Box
-    if product_type in ("Box", "Pack", "Lot", "Bundle"):
-        # Check for sealed indicators first (unopened before opened check!)
-        if any(
-            kw in title_lower for kw in ["sealed", "factory sealed", "factory-sealed", "new", "unopened", "nib", "mint"]
-        ):
-            return "Sealed"
-        # Check for opened/used indicators
-        if "open box" in title_lower or "opened" in title_lower or "used" in title_lower:
-            return "Open Box"
-        # Default - assume sealed if no indicators (most eBay listings are sealed)
-        return "Sealed"
-
-    # Check for Alt Art first (will be appended to base treatment)
-    is_alt_art = _is_alt_art(title)
-
-    # Handle singles (cards)
-    base_treatment = None
-
-    # 1. Serialized / OCM (Highest Priority)
-    if (
-        "serialized" in title_lower
-        or "/10" in title_lower
-        or "/25" in title_lower
-        or "/50" in title_lower
-        or "/75" in title_lower
-        or "/99" in title_lower
-        or "ocm" in title_lower
-    ):
-        base_treatment = "OCM Serialized"
-
-    # 2. Special Foils
-    elif "stonefoil" in title_lower or "stone foil" in title_lower:
-        base_treatment = "Stonefoil"
-    elif "formless" in title_lower:
-        base_treatment = "Formless Foil"
-
-    # 3. Other Variants
-    elif "prerelease" in title_lower:
-        base_treatment = "Prerelease"
-    elif "promo" in title_lower:
-        base_treatment = "Promo"
-    elif "proof" in title_lower or "sample" in title_lower:
-        base_treatment = "Proof/Sample"
-    elif "errata" in title_lower or "error" in title_lower:
-        base_treatment = "Error/Errata"
-
-    # 4. Classic Foil
-    elif "foil" in title_lower or "holo" in title_lower or "refractor" in title_lower:
-        base_treatment = "Classic Foil"
-
-    # 5. Default for singles
-    else:
-        base_treatment = "Classic Paper"
-
-    # Append Alt Art suffix if applicable
-    if is_alt_art:
-        return f"{base_treatment} Alt Art"
-
-    return base_treatment
+    return extract_title_features(title, product_type).treatment
 
 
 def _detect_product_subtype(title: str, product_type: str = "Single") -> Optional[str]:
@@ -474,74 +553,7 @@ def _detect_product_subtype(title: str, product_type: str = "Single") -> Optiona
 
     Returns None for singles or undetectable subtypes.
     """
-    if product_type == "Single":
-        return None
-
-    title_lower = title.lower()
-
-    # === BOXES ===
-    if product_type == "Box":
-        # Case (highest value - 6-box case)
-        if "case" in title_lower:
-            return "Case"
-        # Collector Booster Box (12 packs)
-        if "collector" in title_lower and "booster" in title_lower and "box" in title_lower:
-            return "Collector Booster Box"
-        if "collector booster box" in title_lower:
-            return "Collector Booster Box"
-        # Generic booster box
-        if "booster" in title_lower and "box" in title_lower:
-            return "Collector Booster Box"
-        return "Box"
-
-    # === BUNDLES ===
-    if product_type == "Bundle":
-        # Serialized Advantage (premium bundle - 4 packs + guaranteed serialized)
-        if "serialized advantage" in title_lower:
-            return "Serialized Advantage"
-        # Starter Set / Starter Kit
-        if "starter" in title_lower and ("set" in title_lower or "kit" in title_lower):
-            return "Starter Set"
-        # Play Bundle (6 packs)
-        if "play bundle" in title_lower:
-            return "Play Bundle"
-        # Blaster Box (6 packs, same as Play Bundle)
-        if "blaster" in title_lower and "box" in title_lower:
-            return "Blaster Box"
-        if "blaster box" in title_lower:
-            return "Blaster Box"
-        # Generic bundle
-        if "bundle" in title_lower:
-            return "Play Bundle"
-        return "Bundle"
-
-    # === PACKS ===
-    if product_type == "Pack":
-        # Silver Pack (special promo pack)
-        if "silver" in title_lower and "pack" in title_lower:
-            return "Silver Pack"
-        # Collector Booster Pack
-        if "collector" in title_lower and ("booster" in title_lower or "pack" in title_lower):
-            return "Collector Booster Pack"
-        if "collector booster" in title_lower:
-            return "Collector Booster Pack"
-        # Play Booster Pack
-        if "play" in title_lower and ("booster" in title_lower or "pack" in title_lower):
-            return "Play Booster Pack"
-        if "play booster" in title_lower:
-            return "Play Booster Pack"
-        # Generic booster pack (default to collector since they're more common on eBay)
-        if "booster" in title_lower:
-            return "Collector Booster Pack"
-        return "Pack"
-
-    # === LOTS ===
-    if product_type == "Lot":
-        if "bulk" in title_lower:
-            return "Bulk"
-        return "Lot"
-
-    return None
+    return extract_title_features(title, product_type).product_subtype
 
 
 def _detect_grading(title: str) -> Optional[str]:
@@ -561,82 +573,7 @@ def _detect_grading(title: str) -> Optional[str]:
 
     Returns: Grade string (e.g., "PSA 10", "BGS 9.5", "TAG SLAB", "GRADED") or None for raw cards.
     """
-    import re
-
-    title_upper = title.upper()
-
-    # PSA grading patterns
-    # "PSA 10", "PSA10", "PSA-10", "PSA GEM MINT 10"
-    psa_patterns = [
-        r"PSA\s*[-]?\s*(\d+(?:\.\d)?)",  # PSA 10, PSA-10, PSA10
-        r"PSA\s+GEM\s*(?:MINT|MT)?\s*(\d+)",  # PSA GEM MINT 10
-        r"PSA\s+MINT\s*(\d+)",  # PSA MINT 9
-    ]
-    for pattern in psa_patterns:
-        match = re.search(pattern, title_upper)
-        if match:
-            grade = match.group(1)
-            return f"PSA {grade}"
-
-    # BGS (Beckett) grading patterns
-    # "BGS 9.5", "BGS9.5", "BGS 10 BLACK LABEL", "BECKETT 9.5"
-    bgs_patterns = [
-        r"BGS\s*[-]?\s*(\d+(?:\.\d)?)",  # BGS 9.5, BGS-9.5
-        r"BECKETT\s*[-]?\s*(\d+(?:\.\d)?)",  # BECKETT 9.5
-        r"BGS\s+(\d+)\s*(?:BLACK\s*LABEL|PRISTINE)",  # BGS 10 BLACK LABEL
-    ]
-    for pattern in bgs_patterns:
-        match = re.search(pattern, title_upper)
-        if match:
-            grade = match.group(1)
-            return f"BGS {grade}"
-
-    # TAG (Texas Authentication & Grading) patterns
-    # "TAG 10", "TAG-10", "TAG PERFECT 10", "TAG SLAB"
-    tag_patterns = [
-        r"(?<!S)TAG\s*[-]?\s*(\d+(?:\.\d)?)",  # TAG 10 (exclude STAG)
-        r"TAG\s+PERFECT\s*(\d+)",  # TAG PERFECT 10
-    ]
-    for pattern in tag_patterns:
-        match = re.search(pattern, title_upper)
-        if match:
-            grade = match.group(1)
-            return f"TAG {grade}"
-
-    # TAG SLAB without grade (common for WOTF prerelease)
-    if re.search(r"(?<!S)TAG\s+SLAB", title_upper) or re.search(r"(?<!S)TAG\s*[-]?\s*SLAB", title_upper):
-        return "TAG SLAB"
-
-    # CGC grading patterns
-    # "CGC 9.8", "CGC-9.8"
-    cgc_patterns = [
-        r"CGC\s*[-]?\s*(\d+(?:\.\d)?)",  # CGC 9.8
-    ]
-    for pattern in cgc_patterns:
-        match = re.search(pattern, title_upper)
-        if match:
-            grade = match.group(1)
-            return f"CGC {grade}"
-
-    # SGC grading patterns
-    # "SGC 10", "SGC-10"
-    sgc_patterns = [
-        r"SGC\s*[-]?\s*(\d+(?:\.\d)?)",  # SGC 10
-    ]
-    for pattern in sgc_patterns:
-        match = re.search(pattern, title_upper)
-        if match:
-            grade = match.group(1)
-            return f"SGC {grade}"
-
-    # Generic graded/slab mentions (without specific service or grade)
-    # "GRADED", "SLAB", "SLABBED" - indicates professional grading but unclear which service
-    if re.search(r"\bGRADED\b", title_upper):
-        return "GRADED"
-    if re.search(r"\bSLAB(?:BED)?\b", title_upper):
-        return "GRADED"
-
-    return None
+    return extract_title_features(title).grading
 
 
 def _detect_quantity(title: str, product_type: str = "Single") -> int:
@@ -653,79 +590,7 @@ def _detect_quantity(title: str, product_type: str = "Single") -> int:
 
     Returns 1 if no quantity detected.
     """
-    title_lower = title.lower()
-
-    # Helper to check if a number is likely a year (2020-2030)
-    def is_likely_year(num: int) -> bool:
-        return 2020 <= num <= 2030
-
-    # Skip titles containing card names with X in them (Carbon-X7, X7v1, etc.)
-    # These are card names, not quantities
-    skip_patterns = [
-        r"carbon-x\d",  # Carbon-X7 card name
-        r"x\d+v\d",  # X7v1 variant naming
-        r"experiment\s*x",  # Experiment X series
-    ]
-    for pattern in skip_patterns:
-        if re.search(pattern, title_lower):
-            return 1
-
-    # For singles, quantity is usually 1 unless explicitly stated
-    if product_type == "Single":
-        # Look for explicit quantity patterns at start of title or after separator
-        patterns = [
-            r"^(\d+)\s*x\s+",  # "2x Card Name" at start
-            r"^(\d+)\s+-\s+",  # "2 - Card Name" at start
-            r"^x\s*(\d+)\s+",  # "X3 Card Name" at start
-            r"(?:^|\s)(\d+)\s*x\s*(?:-|wonders|foil)",  # "3x -" or "2x Wonders"
-            r"lot\s+of\s+(\d+)",  # "lot of 5"
-            r"(\d+)\s*card\s*lot",  # "5 card lot"
-            r"(\d+)\s*ct\b",  # "3ct"
-            r"\sx\s*(\d+)\s*$",  # "x4" at end of title
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, title_lower)
-            if match:
-                qty = int(match.group(1))
-                # Exclude years (2020-2030) and unreasonable quantities
-                if 1 < qty <= 100 and not is_likely_year(qty):
-                    return qty
-        return 1
-
-    # For sealed products (Box, Pack, Bundle), detect multi-unit sales
-    # Important: "Bundle Box with 6 packs" is 1 bundle, not 6 packs
-
-    # First check if this is describing contents (not quantity being sold)
-    content_patterns = [
-        r"(\d+)\s*booster\s*packs?\s*(inside|included|contains|per|each)",
-        r"contains\s*(\d+)",
-        r"includes\s*(\d+)",
-        r"with\s*(\d+)\s*(booster|pack)",
-    ]
-    for pattern in content_patterns:
-        if re.search(pattern, title_lower):
-            # This describes contents, not sale quantity - return 1
-            return 1
-
-    # Now look for actual quantity being sold
-    quantity_patterns = [
-        r"^(\d+)\s*x\s*(wonders|existence|booster|play|collector|bundle|box|pack)",  # "2x Bundle" (requires x)
-        r"^(\d{1,2})\s+(wonders|existence|booster|play|collector|bundle|box|pack)",  # "2 Wonders..." (max 2 digits to exclude years)
-        r"(\d+)\s*(?:ct|count)\b",  # "5ct" or "5 count"
-        r"lot\s+of\s+(\d+)",  # "lot of 3"
-        r"set\s+of\s+(\d+)",  # "set of 2"
-        r"x(\d+)\b",  # "x4" at end
-    ]
-
-    for pattern in quantity_patterns:
-        match = re.search(pattern, title_lower)
-        if match:
-            qty = int(match.group(1))
-            # Exclude years (2020-2030) and unreasonable quantities
-            if 1 < qty <= 50 and not is_likely_year(qty):
-                return qty
-
-    return 1
+    return extract_title_features(title, product_type).quantity
 
 
 def _detect_bundle_pack_count(title: str) -> int:
@@ -740,40 +605,7 @@ def _detect_bundle_pack_count(title: str) -> int:
 
     Returns 0 if not a bundle (i.e., single pack listing).
     """
-    title_lower = title.lower()
-
-    # Known WOTF bundle products
-    if "play bundle" in title_lower or "blaster box" in title_lower:
-        return 6  # Play Bundle / Blaster Box = 6 packs
-    if "serialized advantage" in title_lower:
-        return 4  # Serialized Advantage = 4 packs
-    if "collector booster" in title_lower and "box" in title_lower:
-        return 12  # Collector Booster Box = 12 packs
-
-    # Check for explicit pack counts in title (for 30-pack boxes etc.)
-    if "collector" in title_lower and "30" in title_lower:
-        return 30
-
-    # Try to extract pack count from title patterns
-    # Be careful not to match single pack listings like "pack + 12 bonus cards"
-    patterns = [
-        r"box\s*(?:of\s*)?(\d+)\s*(?:booster\s*)?packs?",  # "box of 6 packs"
-        r"(\d+)\s*pack\s*box",  # "6 pack box"
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, title_lower)
-        if match:
-            count = int(match.group(1))
-            if 2 <= count <= 36:  # Reasonable pack count for bundles
-                return count
-
-    # Don't match single packs with bonus cards
-    # e.g., "COLLECTOR BOOSTER PACK Sealed +12 bonus" should return 0
-    if "bonus" in title_lower or "+ " in title_lower:
-        return 0
-
-    return 0
+    return extract_title_features(title).bundle_pack_count
 
 
 def _is_valid_match(title: str, card_name: str, target_rarity: str = "") -> bool:
@@ -808,11 +640,8 @@ def _is_valid_match(title: str, card_name: str, target_rarity: str = "") -> bool
     # Only apply blocklist if NO positive WOTF identifier is present
     # This prevents false positives like "Wonders of the First Dragon's Gold"
     # being blocked because "gold" matches some Pokemon/MTG term
-    if not has_wonders_identifier:
-        blocklist = load_blocklist()
-        for keyword in blocklist:
-            if keyword in title_lower:
-                return False
+    if not has_wonders_identifier and is_blocked(title_lower):
+        return False
 
     # Detect product types - use more lenient matching for sealed products
     product_type_keywords = ["box", "pack", "case", "lot", "bundle", "collection", "bulk", "sealed"]
@@ -1232,15 +1061,7 @@ def _clean_title_text(title: str) -> str:
     """
     Removes junk text like 'Opens in a new window or tab' from the title.
     """
-    junk_phrases = ["opens in a new window or tab", "opens in a new window", "opens in a new tab", "new listing"]
-    title_lower = title.lower()
-    for phrase in junk_phrases:
-        if phrase in title_lower:
-            # Case insensitive replace is tricky, do a regex replace
-            pattern = re.compile(re.escape(phrase), re.IGNORECASE)
-            title = pattern.sub("", title)
-
-    return title.strip()
+    return clean_title_text(title)
 
 
 def _parse_generic_results(
@@ -1251,11 +1072,106 @@ def _parse_generic_results(
     target_rarity: str = "",
     return_all: bool = False,
     product_type: str = "Single",
-) -> List[MarketPrice]:
+) -> List[ListingRecord]:
+    # Dedup only makes sense for sold listings (avoid re-saving same sale)
+    # IMPORTANT: Skip dedup for active listings - we always want fresh data
+    return _parse_tagged_results(
+        html_content,
+        card_id,
+        listing_type,
+        card_name=card_name,
+        target_rarity=target_rarity,
+        product_type=product_type,
+        check_indexed=listing_type == "sold" and not return_all,
+        include_indexed=return_all,
+    )
+
+
+def _parse_tagged_results(
+    html_content: str,
+    card_id: int,
+    listing_type: str,
+    card_name: str = "",
+    target_rarity: str = "",
+    product_type: str = "Single",
+    check_indexed: bool = False,
+    include_indexed: bool = True,
+) -> List[ListingRecord]:
+    """
+    Shared parse pipeline: filter/validate -> bulk dedup check -> AI extraction -> classify.
+
+    Args:
+        check_indexed: If True, run the bulk DB dedup check and tag indexed listings.
+        include_indexed: If False, indexed listings are dropped before AI extraction.
+    """
+    listings = _select_listings(
+        html_content, card_id, listing_type, card_name, target_rarity, product_type, check_indexed, include_indexed
+    )
+    if listings:
+        # Phase 2: Rule-first extraction (AI batch for ambiguous titles), Phase 3: classify in place
+        _classify_listings(listings, _extract_batch(listings, [product_type] * len(listings)), product_type)
+    return listings
+
+
+async def _parse_tagged_results_async(
+    html_content: str,
+    card_id: int,
+    listing_type: str,
+    card_name: str = "",
+    target_rarity: str = "",
+    product_type: str = "Single",
+    check_indexed: bool = False,
+    include_indexed: bool = True,
+) -> List[ListingRecord]:
+    """_parse_tagged_results with the AI extraction awaited instead of blocking the event loop."""
+    listings = _select_listings(
+        html_content, card_id, listing_type, card_name, target_rarity, product_type, check_indexed, include_indexed
+    )
+    if listings:
+        extracted_batch = await _extract_batch_async(listings, [product_type] * len(listings))
+        _classify_listings(listings, extracted_batch, product_type)
+    return listings
+
+
+def _select_listings(
+    html_content: str,
+    card_id: int,
+    listing_type: str,
+    card_name: str,
+    target_rarity: str,
+    product_type: str,
+    check_indexed: bool,
+    include_indexed: bool,
+) -> List[ListingRecord]:
+    """Phase 1 of the parse pipeline: the listings that go on to AI extraction."""
+    # Phase 1a: Collect ALL valid listings (filter, validate)
+    all_listings_data = _collect_listings(html_content, card_id, listing_type, card_name, target_rarity)
+    if not all_listings_data:
+        return []
+
+    # Phase 1b: Bulk DB dedup check (single query instead of N queries)
+    if check_indexed:
+        _tag_indexed(all_listings_data, card_id, card_name, product_type)
+
+    # Phase 1c: Filter out already-indexed listings (unless include_indexed=True for stats)
+    return [listing for listing in all_listings_data if include_indexed or not listing.is_indexed]
+
+
+def _collect_listings(
+    html_content: str,
+    card_id: int,
+    listing_type: str,
+    card_name: str = "",
+    target_rarity: str = "",
+) -> List[ListingRecord]:
+    """
+    Extract raw listings from a search results page.
+
+    Listings are validated against card_name when given; price is the raw listing price.
+    """
     soup = BeautifulSoup(html_content, "lxml")
     items = soup.select("li.s-item, li.s-card")
 
-    # Phase 1a: Collect ALL valid listings (filter, validate)
     all_listings_data = []
 
     for item in items:
@@ -1327,126 +1243,134 @@ def _parse_generic_results(
             if not image_url or "gif" in image_url or "base64" in image_url:
                 image_url = image_elem.get("data-src")
 
-        # Store all listing data for bulk dedup check
+        # Store all listings for bulk dedup check (price is the raw listing price until classified)
         all_listings_data.append(
-            {
-                "external_id": item_id,
-                "title": title,
-                "price": price,
-                "sold_date": sold_date,
-                "url": url,
-                "bid_count": bid_count,
-                "image_url": image_url,
-                "seller_name": seller_name,
-                "seller_feedback_score": seller_feedback_score,
-                "seller_feedback_percent": seller_feedback_percent,
-                "condition": condition,
-                "shipping_cost": shipping_cost,
-            }
+            ListingRecord(
+                card_id=card_id,
+                title=title,
+                price=price,
+                listing_type=listing_type,
+                sold_date=sold_date,
+                external_id=item_id,
+                url=url,
+                bid_count=bid_count,
+                image_url=image_url,
+                seller_name=seller_name,
+                seller_feedback_score=seller_feedback_score,
+                seller_feedback_percent=seller_feedback_percent,
+                condition=condition,
+                shipping_cost=shipping_cost,
+            )
         )
 
-    if not all_listings_data:
-        return []
+    return all_listings_data
 
-    # Phase 1b: Bulk DB dedup check (single query instead of N queries)
-    # IMPORTANT: Skip dedup for active listings - we always want fresh data
-    # Dedup only makes sense for sold listings (avoid re-saving same sale)
-    if listing_type == "active":
-        indexed_indices = set()  # No dedup for active listings
-    else:
-        indexed_indices = (
-            _bulk_check_indexed(card_id, all_listings_data, card_name=card_name, product_type=product_type)
-            if not return_all
-            else set()
-        )
 
-    # Phase 1c: Filter out already-indexed listings (unless return_all=True for stats)
-    listings_to_extract = []
-    listing_metadata = []
+def _tag_indexed(listings: List[ListingRecord], card_id: int, card_name: str, product_type: str) -> None:
+    """Set is_indexed on listings that already exist in the database for this card."""
+    indexed_indices = _bulk_check_indexed(card_id, listings, card_name=card_name, product_type=product_type)
+    for i, listing in enumerate(listings):
+        listing.is_indexed = i in indexed_indices
 
-    for i, listing_data in enumerate(all_listings_data):
-        if return_all or i not in indexed_indices:
-            # Include for AI extraction if: return_all=True OR not indexed yet
-            listings_to_extract.append(
-                {"title": listing_data["title"], "description": None, "price": listing_data["price"]}
-            )
-            listing_metadata.append(listing_data)
 
-    if not listings_to_extract:
-        return []
+def _extraction_inputs(listings: List[ListingRecord]) -> List[dict]:
+    return [{"title": listing.title, "description": None, "price": listing.price} for listing in listings]
+
+
+def _rule_first(listings: List[ListingRecord], product_types: List[str]) -> Tuple[List[Optional[dict]], List[int]]:
+    """
+    Rule-based results for titles the rules pin down (see rule_classifier).
 
-    # Phase 2: Batch AI extraction for all non-indexed listings
-    ai_extractor = get_ai_extractor()
-    extracted_batch = ai_extractor.extract_batch(listings_to_extract)
+    Returns (results with None for the ambiguous titles, indices of the ambiguous titles).
+    """
+    if not rule_first_enabled():
+        return [None] * len(listings), list(range(len(listings)))
+    threshold = rule_first_threshold()
+    extracted: List[Optional[dict]] = []
+    ambiguous = []
+    for i, (listing, product_type) in enumerate(zip(listings, product_types)):
+        rule = classify_title(listing.title, product_type)
+        if rule.confidence >= threshold:
+            extracted.append(rule.as_extraction(product_type))
+        else:
+            extracted.append(None)
+            ambiguous.append(i)
+    return extracted, ambiguous
+
+
+def _extract_batch(listings: List[ListingRecord], product_types: List[str]) -> List[dict]:
+    """Rule-first extraction; ambiguous titles go to the AI in one batch (cached per title)."""
+    extracted, ambiguous = _rule_first(listings, product_types)
+    if ambiguous:
+        ai_results = get_ai_extractor().extract_batch(_extraction_inputs([listings[i] for i in ambiguous]))
+        for i, result in zip(ambiguous, ai_results):
+            extracted[i] = result
+    return extracted
+
+
+async def _extract_batch_async(listings: List[ListingRecord], product_types: List[str]) -> List[dict]:
+    """
+    _extract_batch for async scrape code: sub-batches run concurrently off the event loop,
+    and ambiguous titles are batched together with those of concurrently scraped cards.
+    """
+    extracted, ambiguous = _rule_first(listings, product_types)
+    if ambiguous:
+        ai_extractor = get_ai_extractor()
+        inputs = _extraction_inputs([listings[i] for i in ambiguous])
+        if coalescing_enabled():
+            ai_results = await get_extraction_coalescer(ai_extractor).extract(inputs)
+        else:
+            ai_results = await ai_extractor.extract_batch_async(inputs)
+        for i, result in zip(ambiguous, ai_results):
+            extracted[i] = result
+    return extracted
+
+
+def _classify_listings(listings: List[ListingRecord], extracted_batch: List[dict], product_type: str) -> None:
+    """Apply treatment, quantity, subtype, grading and per-unit price to listings in place."""
+    for listing, extracted_data in zip(listings, extracted_batch):
+        # One pass over the title for every rule-based attribute
+        features = extract_title_features(listing.title, product_type)
 
-    # Phase 3: Create MarketPrice objects with extracted data
-    results = []
-    for metadata, extracted_data in zip(listing_metadata, extracted_batch):
         # For sealed products (Box, Pack, Lot, Bundle), always use rule-based detection
         # AI extractor doesn't understand sealed product treatments
         if product_type in ("Box", "Pack", "Lot", "Bundle"):
-            treatment = _detect_treatment(metadata["title"], product_type)
+            treatment = features.treatment
             # Use rule-based quantity detection for sealed products
-            quantity = _detect_quantity(metadata["title"], product_type)
+            quantity = features.quantity
             # Detect product subtype (Collector Booster Box, Play Bundle, etc.)
-            product_subtype = _detect_product_subtype(metadata["title"], product_type)
+            product_subtype = features.product_subtype
         else:
             # For singles, use AI extraction with fallback to rule-based if low confidence
             treatment = extracted_data["treatment"]
             quantity = extracted_data["quantity"]
             product_subtype = None  # Singles don't have subtypes
             if extracted_data["confidence"] < 0.7:
-                treatment = _detect_treatment(metadata["title"], product_type)
+                treatment = features.treatment
                 # Also use rule-based quantity for low confidence
-                rule_qty = _detect_quantity(metadata["title"], product_type)
-                if rule_qty > 1:
-                    quantity = rule_qty
+                if features.quantity > 1:
+                    quantity = features.quantity
 
         # Normalize price per unit for multi-quantity listings
-        raw_price = metadata["price"]
+        raw_price = listing.price
         unit_price = raw_price / quantity if quantity > 1 else raw_price
 
         # For packs being sold as bundles, calculate per-pack price
         # e.g., "2 Play Bundle Boxes" at $59.99 = 2 bundles * 6 packs = 12 packs
         # Per-pack price = $59.99 / 12 = $4.99
-        packs_per_bundle = _detect_bundle_pack_count(metadata["title"]) if product_type == "Pack" else 0
+        packs_per_bundle = features.bundle_pack_count if product_type == "Pack" else 0
         if packs_per_bundle > 0:
             total_packs = quantity * packs_per_bundle
             unit_price = raw_price / total_packs
             # Update quantity to reflect total packs
             quantity = total_packs
 
+        listing.price = round(unit_price, 2)  # Store normalized per-unit price
+        listing.quantity = quantity
+        listing.treatment = treatment
+        listing.product_subtype = product_subtype
         # Detect grading (PSA, TAG, BGS, CGC, SGC)
-        grading = _detect_grading(metadata["title"]) if product_type == "Single" else None
-
-        mp = MarketPrice(
-            card_id=card_id,
-            title=metadata["title"],
-            price=round(unit_price, 2),  # Store normalized per-unit price
-            quantity=quantity,
-            product_subtype=product_subtype,
-            sold_date=metadata["sold_date"],
-            listing_type=listing_type,
-            treatment=treatment,
-            bid_count=metadata["bid_count"],
-            external_id=metadata["external_id"],
-            url=metadata["url"],
-            image_url=metadata["image_url"],
-            platform="ebay",
-            # Seller info
-            seller_name=metadata.get("seller_name"),
-            seller_feedback_score=metadata.get("seller_feedback_score"),
-            seller_feedback_percent=metadata.get("seller_feedback_percent"),
-            # Listing details
-            condition=metadata.get("condition"),
-            shipping_cost=metadata.get("shipping_cost"),
-            grading=grading,
-            scraped_at=datetime.utcnow(),
-        )
-
-        results.append(mp)
-
-    return results
+        listing.grading = features.grading if product_type == "Single" else None
 
 
 def _clean_price(price_str: str) -> Optional[float]:
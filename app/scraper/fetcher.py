@@ -0,0 +1,160 @@
+"""
+Tiered page fetcher: cheap pooled HTTP first, browser only when needed.
+
+An HTTP page costs milliseconds and a few KB of memory; a browser page costs
+seconds and hundreds of MB. TieredFetcher tries the shared HTTP client
+(simple_http) first, classifies what came back, and escalates to the pydoll
+browser (get_page_content) only when the cheap tier is blocked or fails.
+
+A block puts that route (host + page kind, e.g. www.ebay.com/sch) into a
+cooldown window during which requests go straight to the browser, so we don't
+pay a wasted HTTP round trip per page while eBay is challenging us. Both tiers
+share tab_pool.domain_pacer; an escalated fetch is paced once (by the HTTP tier).
+
+Per-tier attempts, outcomes and latencies are kept in `tiered_fetcher.stats`
+(see get_stats()).
+
+Config (env):
+- SCRAPER_HTTP_TIER: "0" disables the HTTP tier (browser only)
+- SCRAPER_HTTP_COOLDOWN: seconds a blocked route skips HTTP (default 900)
+"""
+
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+from app.scraper.browser import get_page_content
+from app.scraper.page_cache import PageCacheMiss
+from app.scraper.page_classify import (
+    PAGE_BLOCKED,
+    PAGE_CAPTCHA,
+    PAGE_TRUNCATED,
+    PAGE_UNRECOGNIZED,
+    USABLE_PAGES,
+    classify_page,
+)
+from app.scraper.simple_http import get_page_simple
+from app.scraper.tab_pool import domain_pacer
+from app.core.env import env_number
+
+PageFetcher = Callable[[str], Awaitable[str]]
+
+
+def route_key(url: str) -> str:
+    """Host + first path segment - the granularity blocks are tracked at."""
+    parts = urlsplit(url)
+    segment = parts.path.strip("/").split("/", 1)[0]
+    return f"{parts.netloc.lower()}/{segment}"
+
+
+@dataclass
+class TierStats:
+    attempts: int = 0
+    successes: int = 0
+    outcomes: Dict[str, int] = field(default_factory=dict)
+    total_latency: float = 0.0
+
+    def record(self, outcome: str, latency: float, success: bool) -> None:
+        self.attempts += 1
+        self.successes += int(success)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.total_latency += latency
+
+    def as_dict(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "success_rate": round(self.successes / self.attempts, 3) if self.attempts else None,
+            "avg_latency_ms": round(self.total_latency / self.attempts * 1000) if self.attempts else None,
+            "outcomes": dict(self.outcomes),
+        }
+
+
+class TieredFetcher:
+    """HTTP tier -> browser tier escalation with per-route block cooldowns."""
+
+    def __init__(
+        self,
+        http_fetch: Optional[PageFetcher] = None,
+        browser_fetch: Optional[PageFetcher] = None,
+        cooldown: Optional[float] = None,
+        http_enabled: Optional[bool] = None,
+    ):
+        # Resolved at call time when not injected (so module-level patches apply)
+        self._http_fetch = http_fetch
+        self._browser_fetch = browser_fetch
+        self.cooldown = cooldown if cooldown is not None else env_number("SCRAPER_HTTP_COOLDOWN", 900.0)
+        if http_enabled is None:
+            http_enabled = env_number("SCRAPER_HTTP_TIER", 1, int) != 0
+        self.http_enabled = http_enabled
+        self._blocked_until: Dict[str, float] = {}
+        self.stats: Dict[str, TierStats] = {"http": TierStats(), "browser": TierStats()}
+        self.escalations = 0
+
+    def http_allowed(self, url: str) -> bool:
+        return self.http_enabled and time.monotonic() >= self._blocked_until.get(route_key(url), 0.0)
+
+    async def fetch(self, url: str) -> str:
+        escalated = False
+        if self.http_allowed(url):
+            html = await self._try_http(url)
+            if html is not None:
+                return html
+            self.escalations += 1
+            escalated = True
+
+        start = time.monotonic()
+        try:
+            # The HTTP attempt already waited out the domain interval for this URL
+            with domain_pacer.already_paced(url) if escalated else nullcontext():
+                html = await (self._browser_fetch or get_page_content)(url)
+        except Exception as e:
+            self.stats["browser"].record(type(e).__name__, time.monotonic() - start, success=False)
+            raise
+        outcome = classify_page(html, url)
+        blocked = outcome in (PAGE_BLOCKED, PAGE_CAPTCHA)
+        self.stats["browser"].record(outcome, time.monotonic() - start, success=not blocked)
+        return html
+
+    async def _try_http(self, url: str) -> Optional[str]:
+        """Fetch via HTTP. Returns None (and starts a cooldown if blocked) when the browser should take over."""
+        start = time.monotonic()
+        try:
+            html = await (self._http_fetch or get_page_simple)(url, retries=1)
+        except PageCacheMiss:
+            raise
+        except Exception as e:
+            self.stats["http"].record(type(e).__name__, time.monotonic() - start, success=False)
+            return None
+
+        outcome = classify_page(html, url)
+        usable = outcome in USABLE_PAGES
+        self.stats["http"].record(outcome, time.monotonic() - start, success=usable)
+        if usable:
+            return html
+        if outcome in (PAGE_UNRECOGNIZED, PAGE_TRUNCATED):
+            # Odd or cut-off markup for this one page - let the browser render it, keep the tier open
+            return None
+
+        key = route_key(url)
+        self._blocked_until[key] = time.monotonic() + self.cooldown
+        print(f"[Fetcher] HTTP tier got '{outcome}' for {key}; using browser for {self.cooldown:.0f}s")
+        return None
+
+    def get_stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            "tiers": {name: tier.as_dict() for name, tier in self.stats.items()},
+            "escalations": self.escalations,
+            "blocked_routes": {key: round(until - now) for key, until in self._blocked_until.items() if until > now},
+        }
+
+
+tiered_fetcher = TieredFetcher()
+
+
+async def fetch_page(url: str) -> str:
+    """Default page fetcher for the eBay scrapers (HTTP first, browser on block)."""
+    return await tiered_fetcher.fetch(url)
@@ -0,0 +1,208 @@
+"""
+On-disk HTML page cache for the scraper fetchers.
+
+Pages are content-addressed by a normalized URL (sha256), stored gzip-compressed
+with their URL and fetch time, and served to any caller - active scrape, sold
+scrape, seller backfill - while younger than the TTL for their listing type.
+
+Modes (SCRAPER_PAGE_CACHE env var):
+- "on" (default): serve fresh cached pages, store every fetch with usable content
+- "off": always hit the network, store nothing
+- "replay": serve ONLY cached pages regardless of age, never hit the network.
+  Lets parsing/classification changes be re-run over a week of real pages.
+  A miss raises PageCacheMiss.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.scraper.page_classify import USABLE_PAGES, classify_page
+
+CACHE_MODES = ("on", "off", "replay")
+
+# Freshness per listing type (seconds). Sold/active must stay below the 45 min
+# polling interval so each cycle sees new data; item pages (seller info) barely change.
+PAGE_CACHE_TTLS: Dict[str, int] = {
+    "sold": 30 * 60,
+    "active": 10 * 60,
+    "item": 7 * 24 * 3600,
+    "other": 10 * 60,
+}
+
+# Pages older than this are deleted by prune()
+PAGE_CACHE_RETENTION_SECONDS = 7 * 24 * 3600
+
+# Query params that don't change page content
+_TRACKING_PARAMS = {
+    "_trksid",
+    "_trkparms",
+    "hash",
+    "itmmeta",
+    "mkevt",
+    "mkcid",
+    "mkrid",
+    "campid",
+    "toolid",
+    "customid",
+}
+
+_ITEM_PATH = re.compile(r"^/itm/(?:[^/]+/)?(\d+)")
+
+
+class PageCacheMiss(Exception):
+    """Raised in replay mode when a URL has no cached page."""
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of a URL for cache keys: lowercase scheme/host, sorted query
+    params without tracking params, no fragment, /itm/<slug>/<id> -> /itm/<id>.
+    """
+    parts = urlsplit(url.strip())
+    path = parts.path or "/"
+    item = _ITEM_PATH.match(path)
+    if item:
+        path = f"/itm/{item.group(1)}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in _TRACKING_PARAMS)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def listing_type_for_url(url: str) -> str:
+    """Which TTL applies to a URL: sold, active, item or other."""
+    parts = urlsplit(url)
+    if _ITEM_PATH.match(parts.path):
+        return "item"
+    if "/sch/" in parts.path:
+        params = dict(parse_qsl(parts.query))
+        return "sold" if params.get("LH_Sold") == "1" else "active"
+    return "other"
+
+
+@dataclass
+class PageCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    expired: int = 0
+
+
+class PageCache:
+    """Content-addressed gzip page store keyed by normalized URL."""
+
+    def __init__(self, directory: str, mode: str = "on", ttls: Optional[Dict[str, int]] = None):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Invalid page cache mode {mode!r} (expected one of {CACHE_MODES})")
+        self.directory = directory
+        self.mode = mode
+        self.ttls = {**PAGE_CACHE_TTLS, **(ttls or {})}
+        self.stats = PageCacheStats()
+
+    @classmethod
+    def from_env(cls) -> "PageCache":
+        directory = os.getenv("SCRAPER_PAGE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "wonder_page_cache")
+        mode = (os.getenv("SCRAPER_PAGE_CACHE") or "on").lower()
+        if mode not in CACHE_MODES:
+            print(f"[PageCache] Unknown SCRAPER_PAGE_CACHE={mode!r}, using 'on'")
+            mode = "on"
+        return cls(directory, mode=mode)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(normalize_url(url).encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.html.gz")
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Cached HTML for a URL, or None if missing/stale.
+
+        Raises PageCacheMiss in replay mode instead of returning None.
+        """
+        if not self.enabled:
+            return None
+
+        entry = self._read(self._path(url))
+        if entry is not None:
+            fetched_at, html = entry
+            age = time.time() - fetched_at
+            if self.mode == "replay" or age <= self.ttls.get(listing_type_for_url(url), self.ttls["other"]):
+                self.stats.hits += 1
+                return html
+            self.stats.expired += 1
+
+        self.stats.misses += 1
+        if self.mode == "replay":
+            raise PageCacheMiss(f"No cached page for {url}")
+        return None
+
+    def put(self, url: str, html: str) -> bool:
+        """Store a fetched page. Returns False if not stored (disabled, replay, not usable content)."""
+        # Only real content: a cached bot-check, captcha or unrecognized page would be served
+        # to the browser tier in place of the render it escalated for
+        if self.mode != "on" or not html or classify_page(html, url) not in USABLE_PAGES:
+            return False
+
+        path = self._path(url)
+        header = json.dumps({"url": url, "fetched_at": time.time()})
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+                f.write(header)
+                f.write("\n")
+                f.write(html)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[PageCache] Failed to store {url}: {e}")
+            return False
+
+        self.stats.stores += 1
+        return True
+
+    def _read(self, path: str) -> Optional[tuple]:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                header = json.loads(f.readline())
+                return header["fetched_at"], f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[PageCache] Dropping unreadable entry {path}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+    def prune(self, max_age: int = PAGE_CACHE_RETENTION_SECONDS) -> int:
+        """Delete pages older than max_age. Returns number of files removed."""
+        if not os.path.isdir(self.directory):
+            return 0
+
+        cutoff = time.time() - max_age
+        removed = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    continue
+        return removed
+
+
+# Shared cache used by get_page_content / get_page_simple
+page_cache = PageCache.from_env()
@@ -0,0 +1,46 @@
+"""
+Classification of fetched eBay/marketplace HTML.
+
+Shared by the fetch tiers (escalate on block), the page cache (only store usable
+pages) and browser readiness waits (same markers).
+"""
+
+# Text that means we were served a bot-check page instead of content
+BLOCK_MARKERS = ("Pardon Our Interruption", "Security Measure", "Checking your browser")
+# eBay search pages that loaded fine but matched nothing
+EMPTY_MARKERS = ("No exact matches found", "0 results found")
+CAPTCHA_MARKERS = ("captcha", "hcaptcha", "g-recaptcha", "verify you are a human")
+# Markup present on server-rendered eBay result rows (old and new layouts)
+RESULT_MARKERS = ('class="s-item', "class='s-item", 'class="s-card', "class='s-card")
+
+# Page classes
+PAGE_RESULTS = "results"
+PAGE_EMPTY = "empty"
+PAGE_BLOCKED = "blocked"
+PAGE_CAPTCHA = "captcha"
+PAGE_OK = "ok"  # non-search page with content
+PAGE_UNRECOGNIZED = "unrecognized"  # search page with neither results nor a no-results message
+PAGE_TRUNCATED = "truncated"  # no or almost no HTML (cut-off response, blank render)
+
+# Classes that are real content (safe to parse and cache). A search page is only
+# "empty" when it says so; a truncated page could be anything and is never cached.
+USABLE_PAGES = (PAGE_RESULTS, PAGE_EMPTY, PAGE_OK)
+
+
+def classify_page(html: str, url: str = "") -> str:
+    """Classify fetched HTML: results, empty, blocked, captcha, unrecognized, truncated or ok (non-search page)."""
+    if html and any(marker in html for marker in BLOCK_MARKERS):
+        return PAGE_BLOCKED
+    if not html or len(html) < 100:
+        return PAGE_TRUNCATED
+
+    is_search = "/sch/" in url
+    if is_search and any(marker in html for marker in RESULT_MARKERS):
+        return PAGE_RESULTS
+
+    head = html[:20000].lower()
+    if any(marker in head for marker in CAPTCHA_MARKERS):
+        return PAGE_CAPTCHA
+    if is_search:
+        return PAGE_EMPTY if any(marker in html for marker in EMPTY_MARKERS) else PAGE_UNRECOGNIZED
+    return PAGE_OK
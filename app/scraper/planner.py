@@ -0,0 +1,153 @@
+"""
+Scrape cycle fetch planner.
+
+Many cards in one polling cycle issue identical eBay searches - every Lot card
+runs the same five generic queries ("Wonders of the First Lot", "... Bulk", ...),
+every Pack card the generic booster search, and cards with the same name share
+their primary query. The planner collects each card's (query, page, sold/active)
+fetches up front, dedupes them by URL, and serves every unique URL from a single
+fetch, routing the HTML to each card that asks for it.
+
+Usage:
+    planner = ScrapePlanner()
+    planner.plan(cards)
+    await scrape_card(..., fetch=planner.fetch)
+
+Pages are only held in memory until every planned consumer has read them (or the
+cycle ends); concurrent requests for the same URL share one in-flight fetch,
+which keeps running when one of its cards times out.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from app.scraper.fetcher import fetch_page
+from app.scraper.utils import build_ebay_url, build_search_queries
+
+PageFetcher = Callable[[str], Awaitable[str]]
+
+# Pages per sold query scrape_card reads by default
+DEFAULT_MAX_PAGES = 3
+
+
+@dataclass
+class PlannerStats:
+    """Fetch counts for one cycle."""
+
+    planned: int = 0  # (card, url) fetches the cycle's cards would issue
+    unique_planned: int = 0  # distinct URLs among them
+    requested: int = 0  # fetch() calls actually made
+    fetched: int = 0  # fetches actually sent to the browser
+
+    @property
+    def shared(self) -> int:
+        """Requests served from another card's fetch."""
+        return self.requested - self.fetched
+
+
+def card_fetch_urls(
+    card_name: str,
+    product_type: str = "Single",
+    rarity_name: str = "",
+    search_term: Optional[str] = None,
+    max_pages: int = DEFAULT_MAX_PAGES,
+) -> List[str]:
+    """
+    Every URL a scheduled scrape of this card may fetch (mirrors scrape_single_card):
+    sold pages for each query, active listings for the primary query and for the
+    scheduler's search term.
+    """
+    queries = build_search_queries(card_name, product_type=product_type, rarity_name=rarity_name)
+    urls = [build_ebay_url(q, sold_only=True, page=page) for q in queries for page in range(1, max_pages + 1)]
+    urls.append(build_ebay_url(queries[0], sold_only=False))
+    if search_term:
+        urls.append(build_ebay_url(search_term, sold_only=False))
+    # A card never needs the same URL twice
+    return list(dict.fromkeys(urls))
+
+
+class ScrapePlanner:
+    """Per-cycle fetch deduplication shared by every card scraped in the cycle."""
+
+    def __init__(self, fetcher: Optional[PageFetcher] = None):
+        # Resolved at fetch time so tests can patch app.scraper.planner.fetch_page
+        self._fetcher = fetcher
+        # url -> card ids that plan to fetch it
+        self.consumers: Dict[str, Set[int]] = {}
+        # url -> reads left before the page is dropped
+        self._remaining: Dict[str, int] = {}
+        self._pages: Dict[str, "asyncio.Future[str]"] = {}
+        self.stats = PlannerStats()
+
+    def plan(self, cards: Iterable, max_pages: int = DEFAULT_MAX_PAGES) -> Dict[str, Set[int]]:
+        """
+        Register the fetches of this cycle's cards.
+
+        Args:
+            cards: Card rows (name, set_name, product_type, id).
+            max_pages: Sold pages per query (scrape_card's max_pages).
+
+        Returns: url -> ids of the cards that need it
+        """
+        for card in cards:
+            urls = card_fetch_urls(
+                card.name,
+                product_type=getattr(card, "product_type", None) or "Single",
+                search_term=f"{card.name} {card.set_name}",
+                max_pages=max_pages,
+            )
+            for url in urls:
+                self.consumers.setdefault(url, set()).add(card.id)
+            self.stats.planned += len(urls)
+
+        self.stats.unique_planned = len(self.consumers)
+        self._remaining = {url: len(ids) for url, ids in self.consumers.items()}
+        return self.consumers
+
+    def shared_urls(self) -> Dict[str, Set[int]]:
+        """Planned URLs needed by more than one card."""
+        return {url: ids for url, ids in self.consumers.items() if len(ids) > 1}
+
+    async def fetch(self, url: str) -> str:
+        """
+        Drop-in replacement for fetch_page: fetches each URL once per cycle
+        and hands the same HTML to every card that requests it.
+        """
+        self.stats.requested += 1
+        page = self._pages.get(url)
+        if page is None:
+            fetcher = self._fetcher or fetch_page
+            page = asyncio.ensure_future(fetcher(url))
+            self._pages[url] = page
+            self.stats.fetched += 1
+
+        try:
+            # Shielded: a card cancelled by its timeout must not cancel the fetch other cards wait on
+            html = await asyncio.shield(page)
+        except BaseException:
+            # Let the next card retry instead of replaying a failed or cancelled fetch
+            failed = page.done() and (page.cancelled() or page.exception() is not None)
+            if failed and self._pages.get(url) is page:
+                del self._pages[url]
+            raise
+
+        remaining = self._remaining.get(url, 1) - 1
+        if remaining > 0:
+            self._remaining[url] = remaining
+        else:
+            self._remaining.pop(url, None)
+            self._pages.pop(url, None)
+        return html
+
+    def clear(self) -> None:
+        """Release held pages at the end of the cycle."""
+        self._pages.clear()
+        self._remaining.clear()
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"{s.planned} planned fetches -> {s.unique_planned} unique URLs; "
+            f"{s.requested} requests served by {s.fetched} fetches ({s.shared} shared)"
+        )
@@ -0,0 +1,143 @@
+"""
+Warm Chrome profile template.
+
+Every browser start used to begin from an empty profile: first-run setup,
+empty HTTP/disk state and no eBay cookies (so eBay treats each session as a
+brand-new visitor). Instead, after a clean session - pages served, no block
+page seen - the profile is snapshotted as a template, minus caches and lock
+files. Later starts clone the template into their profile directory, using a
+copy-on-write reflink (cp --reflink=auto) where the filesystem supports it
+and a plain copy otherwise.
+
+The first start on a machine (no template yet) is cold; every start after
+the first clean session is warm. Sessions that hit a block page never
+overwrite the template, so a flagged cookie jar is not propagated.
+
+Config (env):
+- SCRAPER_WARM_PROFILE: "0" disables cloning and snapshots (default on)
+- SCRAPER_PROFILE_TEMPLATE: template directory (default <tmp>/pydoll_profile_template)
+"""
+
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import Optional
+
+# Written into a template once it is complete - a half-copied template is never cloned
+TEMPLATE_MARKER = ".wonder_profile_template"
+
+# Regenerable caches - skipped so snapshots and clones stay small and fast
+SKIP_DIRS = frozenset(
+    {
+        "Cache",
+        "Code Cache",
+        "GPUCache",
+        "GrShaderCache",
+        "ShaderCache",
+        "GraphiteDawnCache",
+        "DawnCache",
+        "Service Worker",
+        "Crashpad",
+        "BrowserMetrics",
+    }
+)
+# Per-instance lock files Chrome refuses to start with if copied
+LOCK_FILES = frozenset({"SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile"})
+
+
+def warm_profiles_enabled() -> bool:
+    return os.getenv("SCRAPER_WARM_PROFILE", "1").lower() not in ("0", "false", "off")
+
+
+def template_dir() -> str:
+    return os.getenv("SCRAPER_PROFILE_TEMPLATE") or os.path.join(tempfile.gettempdir(), "pydoll_profile_template")
+
+
+def template_ready(template: Optional[str] = None) -> bool:
+    return os.path.exists(os.path.join(template or template_dir(), TEMPLATE_MARKER))
+
+
+def _ignore(directory: str, names) -> set:
+    return {name for name in names if name in SKIP_DIRS or name in LOCK_FILES}
+
+
+def _copy_tree(src: str, dest: str) -> None:
+    """Copy a profile, reflinking files where the filesystem allows it."""
+    try:
+        subprocess.run(
+            ["cp", "-a", "--reflink=auto", src, dest],
+            check=True,
+            capture_output=True,
+            timeout=60,
+        )
+        return
+    except (OSError, subprocess.SubprocessError):
+        # No GNU cp (macOS) or copy failed part-way - fall back to a plain copy
+        shutil.rmtree(dest, ignore_errors=True)
+    shutil.copytree(src, dest, symlinks=True, ignore=_ignore)
+
+
+def _remove_locks(profile_dir: str) -> None:
+    for root, dirs, files in os.walk(profile_dir):
+        for name in LOCK_FILES.intersection(files + dirs):
+            path = os.path.join(root, name)
+            # SingletonLock/Socket are symlinks - remove the link, not its target
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+def clone_profile(profile_dir: str, template: Optional[str] = None) -> bool:
+    """
+    Replace profile_dir with a copy of the template.
+
+    Returns True for a warm profile, False when there is no usable template (the
+    browser then starts on whatever profile_dir holds, as before).
+    """
+    template = template or template_dir()
+    if not warm_profiles_enabled() or not template_ready(template):
+        return False
+    try:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        _copy_tree(template, profile_dir)
+        _remove_locks(profile_dir)
+        return True
+    except Exception as e:
+        print(f"[Browser] Profile clone failed, starting cold: {type(e).__name__}: {e}")
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        return False
+
+
+def save_template(profile_dir: str, template: Optional[str] = None) -> bool:
+    """
+    Snapshot a stopped browser's profile as the new template.
+
+    Built beside the template and swapped in with renames, so concurrent
+    processes never clone a partial copy.
+    """
+    template = template or template_dir()
+    if not warm_profiles_enabled() or not os.path.isdir(profile_dir):
+        return False
+    staging = f"{template}.tmp-{os.getpid()}"
+    retired = f"{template}.old-{os.getpid()}"
+    try:
+        shutil.rmtree(staging, ignore_errors=True)
+        shutil.rmtree(retired, ignore_errors=True)
+        shutil.copytree(profile_dir, staging, symlinks=True, ignore=_ignore)
+        with open(os.path.join(staging, TEMPLATE_MARKER), "w") as f:
+            f.write(str(time.time()))
+        if os.path.exists(template):
+            os.replace(template, retired)
+        os.replace(staging, template)
+        shutil.rmtree(retired, ignore_errors=True)
+        return True
+    except Exception as e:
+        print(f"[Browser] Profile template snapshot failed: {type(e).__name__}: {e}")
+        shutil.rmtree(staging, ignore_errors=True)
+        return False
@@ -0,0 +1,109 @@
+"""
+Page readiness detection for browser navigations.
+
+Instead of sleeping a fixed 2-4 s after every tab.go_to, poll the page until it
+shows what we came for - eBay result rows (li.s-item / li.s-card), an eBay
+"no results" message, or a known block page - and return as soon as it does.
+Pages without a known marker (OpenSea, item pages) wait for
+document.readyState == "complete" plus a short settle delay for client rendering.
+
+Request pacing (human-like jitter between hits) is NOT done here - that is
+tab_pool.DomainPacer's job.
+
+Config (env):
+- SCRAPER_READY_TIMEOUT: max seconds to wait for readiness (default 15)
+- SCRAPER_SETTLE_SECONDS: extra wait for pages without a readiness marker (default 1.5)
+"""
+
+import asyncio
+import json
+import time
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+from app.scraper.page_classify import BLOCK_MARKERS, EMPTY_MARKERS
+from app.core.env import env_number
+
+# Result rows on eBay search pages (old and new layouts)
+EBAY_RESULT_SELECTOR = "li.s-item, li.s-card"
+
+POLL_INTERVAL = 0.25
+# Once a page with a readiness selector has fully loaded without it (unknown
+# layout), stop waiting after this grace period instead of the full timeout
+LOADED_GRACE_SECONDS = 3.0
+
+# Page states returned by wait_until_ready
+READY_RESULTS = "results"
+READY_EMPTY = "empty"
+READY_BLOCKED = "blocked"
+READY_LOADED = "loaded"  # readyState complete (page type has no marker, or none appeared)
+READY_TIMEOUT = "timeout"
+
+_STATE_SCRIPT = """
+    const selector = %s;
+    if (selector && document.querySelector(selector)) return "results";
+    const text = (document.title || "") + " " + (document.body ? document.body.innerText.slice(0, 4000) : "");
+    if (%s.some((m) => text.includes(m))) return "blocked";
+    if (selector && %s.some((m) => text.includes(m))) return "empty";
+    return document.readyState === "complete" ? "complete" : "loading";
+"""
+
+
+def readiness_selector(url: str) -> Optional[str]:
+    """CSS selector that marks the page as ready, or None if the page type has none."""
+    parts = urlsplit(url)
+    if "ebay." in parts.netloc and "/sch/" in parts.path:
+        return EBAY_RESULT_SELECTOR
+    return None
+
+
+def _script_value(result: Any) -> Optional[str]:
+    """Unwrap pydoll's execute_script response ({"result": {"result": {"value": ...}}})."""
+    if isinstance(result, dict):
+        inner = result.get("result", {})
+        if isinstance(inner, dict):
+            inner = inner.get("result", {})
+            if isinstance(inner, dict):
+                return inner.get("value")
+    return None
+
+
+async def wait_until_ready(tab, url: str, timeout: Optional[float] = None) -> str:
+    """
+    Poll a navigated tab until its content is usable.
+
+    Returns one of READY_RESULTS, READY_EMPTY, READY_BLOCKED, READY_LOADED,
+    READY_TIMEOUT. Callers read page_source in every case - a timeout just
+    means we stop waiting.
+    """
+    timeout = timeout if timeout is not None else env_number("SCRAPER_READY_TIMEOUT", 15.0)
+    selector = readiness_selector(url)
+    script = _STATE_SCRIPT % (json.dumps(selector), json.dumps(BLOCK_MARKERS), json.dumps(EMPTY_MARKERS))
+    deadline = time.monotonic() + timeout
+    loaded_at = None
+
+    while True:
+        try:
+            state = _script_value(await tab.execute_script(script, return_by_value=True))
+        except Exception as e:
+            # Page mid-navigation (context destroyed) - keep polling until the deadline
+            state = None
+            last_error = e
+        else:
+            last_error = None
+
+        if state in (READY_RESULTS, READY_EMPTY, READY_BLOCKED):
+            return state
+        if state == "complete":
+            if selector is None:
+                await asyncio.sleep(env_number("SCRAPER_SETTLE_SECONDS", 1.5))
+                return READY_LOADED
+            loaded_at = loaded_at or time.monotonic()
+            if time.monotonic() - loaded_at >= LOADED_GRACE_SECONDS:
+                return READY_LOADED
+
+        if time.monotonic() >= deadline:
+            detail = f" ({type(last_error).__name__})" if last_error else ""
+            print(f"[Browser] Readiness timeout after {timeout:.0f}s{detail}: {url}")
+            return READY_TIMEOUT
+        await asyncio.sleep(POLL_INTERVAL)
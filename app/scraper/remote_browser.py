@@ -0,0 +1,312 @@
+"""
+Remote browser pool: scrape through browser-service replicas instead of a local Chrome.
+
+browser-service/server.js runs a Playwright launchServer and publishes its
+WebSocket endpoint at GET /ws-endpoint. RemoteBrowserPool connects to one or
+more of those services, leases a fresh context + page per navigation and
+spreads pages over the healthy endpoints (fewest pages in flight first).
+
+An endpoint that can't be reached, or whose connection drops mid-page, is taken
+out of rotation and reconnected on the next health check - a dead replica costs
+a retry on another endpoint, not a scrape cycle.
+
+When BROWSER_SERVICE_URLS is set, get_page_content and BrowserManager route
+through this pool and the scraper container never launches Chrome; browser
+capacity grows by adding browser-service replicas. Domain pacing, resource
+blocking and readiness waits are the same as for the local browser.
+
+Config (env):
+- BROWSER_SERVICE_URLS: comma-separated services (http://browser-service:3000),
+  or ws:// endpoints to connect to directly
+- BROWSER_SERVICE_PAGES: concurrent pages per endpoint (default 3)
+- BROWSER_SERVICE_HEALTH_INTERVAL: seconds between health checks (default 30)
+- BROWSER_SERVICE_NAV_TIMEOUT: navigation timeout in seconds (default 30)
+
+Needs the playwright Python package (client only - no local browser install).
+"""
+
+import asyncio
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.scraper.readiness import READY_BLOCKED, wait_until_ready
+from app.scraper.resource_blocking import ResourceBlocker
+from app.scraper.simple_http import USER_AGENTS
+from app.scraper.tab_pool import DomainPacer
+from app.core.env import env_number
+
+# Playwright request.resource_type -> the CDP resource type names ResourceBlocker uses
+PLAYWRIGHT_RESOURCE_TYPES = {
+    "image": "Image",
+    "media": "Media",
+    "font": "Font",
+    "script": "Script",
+    "ping": "Ping",
+    "cspviolationreport": "CSPViolationReport",
+}
+
+
+def ws_url_from_info(service_url: str, info: dict) -> str:
+    """
+    Build the connectable WS URL from server.js's /ws-endpoint response.
+
+    server.js reports the endpoint on its bind address (0.0.0.0), so the host is
+    replaced with the one we reached the service at.
+    """
+    parts = urlsplit(service_url)
+    scheme = "wss" if parts.scheme == "https" else "ws"
+    return f"{scheme}://{parts.hostname}:{info['wsPort']}{info['wsPath']}"
+
+
+async def resolve_ws_endpoint(service_url: str) -> str:
+    """Ask a browser-service for its WS endpoint (ws:// URLs are used as-is)."""
+    if service_url.startswith(("ws://", "wss://")):
+        return service_url
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        response = await client.get(service_url.rstrip("/") + "/ws-endpoint")
+        response.raise_for_status()
+        return ws_url_from_info(service_url, response.json())
+
+
+class _PlaywrightTab:
+    """Just enough of pydoll's tab interface for readiness.wait_until_ready."""
+
+    def __init__(self, page):
+        self.page = page
+
+    async def execute_script(self, script: str, return_by_value: bool = True) -> dict:
+        value = await self.page.evaluate("() => {" + script + "}")
+        return {"result": {"result": {"value": value}}}
+
+
+@dataclass
+class RemoteEndpoint:
+    url: str
+    ws_endpoint: Optional[str] = None
+    browser: Any = None
+    healthy: bool = False
+    in_flight: int = 0
+    pages: int = 0
+    failures: int = 0
+    last_error: Optional[str] = None
+
+    @property
+    def connected(self) -> bool:
+        try:
+            return self.browser is not None and self.browser.is_connected()
+        except Exception:
+            return False
+
+    def as_dict(self) -> dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "in_flight": self.in_flight,
+            "pages": self.pages,
+            "failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class RemoteBrowserPool:
+    """Leases pages from browser-service endpoints, least-loaded healthy endpoint first."""
+
+    def __init__(
+        self,
+        service_urls: Iterable[str] = (),
+        pages_per_endpoint: int = 3,
+        health_interval: float = 30.0,
+        nav_timeout: float = 30.0,
+        pacer: Optional[DomainPacer] = None,
+        blocker: Optional[ResourceBlocker] = None,
+        connect: Optional[Callable[[str], Awaitable[Any]]] = None,
+        resolve: Optional[Callable[[str], Awaitable[str]]] = None,
+    ):
+        self.endpoints: List[RemoteEndpoint] = [RemoteEndpoint(u.strip()) for u in service_urls if u.strip()]
+        self.pages_per_endpoint = max(1, pages_per_endpoint)
+        self.health_interval = health_interval
+        self.nav_timeout = nav_timeout
+        self.pacer = pacer or DomainPacer.from_env()
+        self.blocker = blocker or ResourceBlocker.from_env()
+        self._connect = connect or self._playwright_connect
+        self._resolve = resolve or resolve_ws_endpoint
+        self._playwright = None
+        self._last_health = 0.0
+        self._health_lock = asyncio.Lock()
+        self._slots = asyncio.Condition()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "RemoteBrowserPool":
+        urls = os.getenv("BROWSER_SERVICE_URLS", "")
+        return cls(
+            service_urls=urls.split(","),
+            pages_per_endpoint=env_number("BROWSER_SERVICE_PAGES", 3, int),
+            health_interval=env_number("BROWSER_SERVICE_HEALTH_INTERVAL", 30.0),
+            nav_timeout=env_number("BROWSER_SERVICE_NAV_TIMEOUT", 30.0),
+            **kwargs,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.endpoints)
+
+    async def _playwright_connect(self, ws_endpoint: str):
+        if self._playwright is None:
+            try:
+                from playwright.async_api import async_playwright
+            except ImportError as e:
+                raise RuntimeError("BROWSER_SERVICE_URLS is set but the playwright package is not installed") from e
+            self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.connect(ws_endpoint, timeout=self.nav_timeout * 1000)
+
+    async def _check_endpoint(self, endpoint: RemoteEndpoint) -> None:
+        if endpoint.connected:
+            endpoint.healthy = True
+            return
+        try:
+            await self._disconnect(endpoint)
+            endpoint.ws_endpoint = await self._resolve(endpoint.url)
+            endpoint.browser = await self._connect(endpoint.ws_endpoint)
+            endpoint.healthy = True
+            endpoint.last_error = None
+            print(f"[RemoteBrowser] Connected to {endpoint.url}")
+        except Exception as e:
+            endpoint.healthy = False
+            endpoint.failures += 1
+            endpoint.last_error = f"{type(e).__name__}: {e}"
+            print(f"[RemoteBrowser] {endpoint.url} unavailable: {endpoint.last_error}")
+
+    async def check_health(self, force: bool = False) -> int:
+        """(Re)connect endpoints that aren't connected. Returns the number of healthy endpoints."""
+        async with self._health_lock:
+            if force or time.monotonic() - self._last_health >= self.health_interval:
+                await asyncio.gather(*(self._check_endpoint(e) for e in self.endpoints))
+                self._last_health = time.monotonic()
+        async with self._slots:
+            self._slots.notify_all()
+        return sum(e.healthy for e in self.endpoints)
+
+    async def start(self) -> int:
+        """Connect to every endpoint; raises if none is reachable."""
+        healthy = await self.check_health(force=True)
+        print(f"[RemoteBrowser] {healthy}/{len(self.endpoints)} browser-service endpoints healthy")
+        if not healthy:
+            raise Exception("No healthy browser-service endpoints")
+        return healthy
+
+    async def _acquire(self) -> RemoteEndpoint:
+        while True:
+            if not any(e.healthy for e in self.endpoints):
+                await self.check_health(force=True)
+            else:
+                await self.check_health()
+            async with self._slots:
+                healthy = [e for e in self.endpoints if e.healthy]
+                if not healthy:
+                    raise Exception("No healthy browser-service endpoints")
+                free = [e for e in healthy if e.in_flight < self.pages_per_endpoint]
+                if free:
+                    endpoint = min(free, key=lambda e: e.in_flight)
+                    endpoint.in_flight += 1
+                    return endpoint
+                # Woken by a released page or a health change
+                await self._slots.wait()
+
+    async def _release(self, endpoint: RemoteEndpoint) -> None:
+        async with self._slots:
+            endpoint.in_flight -= 1
+            self._slots.notify_all()
+
+    async def _disconnect(self, endpoint: RemoteEndpoint) -> None:
+        browser, endpoint.browser = endpoint.browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+
+    async def _route(self, route) -> None:
+        request = route.request
+        resource_type = PLAYWRIGHT_RESOURCE_TYPES.get(request.resource_type, request.resource_type)
+        try:
+            if self.blocker.decide(request.url, resource_type):
+                await route.abort("blockedbyclient")
+            else:
+                await route.continue_()
+        except Exception:
+            # Page closed or navigated away - the request is gone either way
+            pass
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        """Lease a fresh context + page on the least-loaded healthy endpoint."""
+        endpoint = await self._acquire()
+        context = None
+        try:
+            context = await endpoint.browser.new_context(user_agent=random.choice(USER_AGENTS))
+            page = await context.new_page()
+            if self.blocker.enabled:
+                await page.route("**/*", self._route)
+            yield page
+            endpoint.pages += 1
+        except Exception as e:
+            if not endpoint.connected:
+                # Replica died or dropped the socket - out of rotation until the next health check
+                endpoint.healthy = False
+                endpoint.failures += 1
+                endpoint.last_error = f"{type(e).__name__}: {e}"
+                print(f"[RemoteBrowser] Lost {endpoint.url}: {endpoint.last_error}")
+                await self._disconnect(endpoint)
+            raise
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._release(endpoint)
+
+    async def get_page_content(self, url: str, retries: int = 3) -> str:
+        """Navigate on a leased remote page and return the HTML (same contract as browser.get_page_content)."""
+        last_error: Optional[Exception] = None
+        for attempt in range(retries + 1):
+            try:
+                async with self.page() as page:
+                    await self.pacer.wait(url)
+                    await page.goto(url, wait_until="domcontentloaded", timeout=self.nav_timeout * 1000)
+                    state = await wait_until_ready(_PlaywrightTab(page), url)
+                    if state == READY_BLOCKED:
+                        print(f"[RemoteBrowser] Block page served for {url}")
+                    content = await page.content()
+
+                if not content or len(content) < 100:
+                    raise Exception("Empty or invalid page content received")
+                return content
+            except Exception as e:
+                last_error = e
+                print(f"[RemoteBrowser] Error (attempt {attempt + 1}/{retries + 1}): {type(e).__name__}: {e}")
+                if attempt < retries:
+                    await asyncio.sleep(1)
+
+        raise last_error
+
+    async def close(self) -> None:
+        for endpoint in self.endpoints:
+            await self._disconnect(endpoint)
+            endpoint.healthy = False
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+    def get_stats(self) -> dict:
+        return {"endpoints": [e.as_dict() for e in self.endpoints]}
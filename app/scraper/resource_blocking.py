@@ -0,0 +1,131 @@
+"""
+Request interception for the pydoll browser.
+
+We only read tab.page_source, so images, media, fonts, tracking beacons and
+third-party scripts are pure cost: load time, container bandwidth and Chrome
+memory. ResourceBlocker attaches to each pooled tab, pauses every request
+(Fetch domain, request stage) and fails the ones we don't need with
+BlockedByClient before they hit the network.
+
+Scripts are allowed only from SCRIPT_ALLOWED_DOMAINS (and subdomains) - eBay's
+own bundles render result rows, OpenSea is a client-rendered app.
+
+Blocked requests never return a size, so blocked bytes are ESTIMATED from
+typical per-type sizes (ESTIMATED_BYTES); request counts are exact.
+
+Config (env):
+- SCRAPER_BLOCK_RESOURCES: "0" disables interception (default on)
+- SCRAPER_SCRIPT_ALLOWLIST: comma-separated script domains (replaces the default)
+"""
+
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Iterable, Optional, Tuple
+from urllib.parse import urlsplit
+
+from pydoll.protocol.fetch.events import FetchEvent
+from pydoll.protocol.network.types import ErrorReason
+
+# CDP resource types we never need for page_source
+BLOCKED_RESOURCE_TYPES = frozenset({"Image", "Media", "Font", "Ping", "CSPViolationReport"})
+
+SCRIPT_ALLOWED_DOMAINS: Tuple[str, ...] = ("ebay.com", "ebaystatic.com", "opensea.io", "blokpax.com")
+
+# Rough transfer size per blocked request, for reporting only
+ESTIMATED_BYTES = {
+    "Image": 15_000,
+    "Media": 250_000,
+    "Font": 40_000,
+    "Script": 60_000,
+    "Ping": 500,
+    "CSPViolationReport": 500,
+}
+
+
+def _domain_allowed(host: str, allowed: Iterable[str]) -> bool:
+    host = host.lower()
+    return any(host == domain or host.endswith("." + domain) for domain in allowed)
+
+
+@dataclass
+class BlockingStats:
+    allowed: int = 0
+    blocked: Counter = field(default_factory=Counter)  # resource type -> count
+    blocked_domains: Counter = field(default_factory=Counter)
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked.values())
+
+    @property
+    def estimated_bytes_blocked(self) -> int:
+        return sum(ESTIMATED_BYTES.get(rtype, 0) * count for rtype, count in self.blocked.items())
+
+    def summary(self) -> str:
+        top = ", ".join(f"{rtype}={count}" for rtype, count in self.blocked.most_common(4))
+        return (
+            f"blocked {self.blocked_requests} requests (~{self.estimated_bytes_blocked / 1_000_000:.1f} MB est.; {top}), "
+            f"allowed {self.allowed}"
+        )
+
+
+class ResourceBlocker:
+    """Decides and enforces which sub-resources a tab may load."""
+
+    def __init__(
+        self,
+        blocked_types: Iterable[str] = BLOCKED_RESOURCE_TYPES,
+        script_domains: Iterable[str] = SCRIPT_ALLOWED_DOMAINS,
+        enabled: bool = True,
+    ):
+        self.blocked_types = frozenset(blocked_types)
+        self.script_domains = tuple(d.strip().lower() for d in script_domains if d.strip())
+        self.enabled = enabled
+        self.stats = BlockingStats()
+
+    @classmethod
+    def from_env(cls) -> "ResourceBlocker":
+        allowlist = os.getenv("SCRAPER_SCRIPT_ALLOWLIST")
+        return cls(
+            script_domains=allowlist.split(",") if allowlist else SCRIPT_ALLOWED_DOMAINS,
+            enabled=os.getenv("SCRAPER_BLOCK_RESOURCES", "1").lower() not in ("0", "false", "off"),
+        )
+
+    def should_block(self, url: str, resource_type: Optional[str]) -> bool:
+        if resource_type in self.blocked_types:
+            return True
+        if resource_type == "Script":
+            return not _domain_allowed(urlsplit(url).hostname or "", self.script_domains)
+        return False
+
+    def decide(self, url: str, resource_type: Optional[str]) -> bool:
+        """should_block() plus stats bookkeeping - call once per intercepted request."""
+        if self.should_block(url, resource_type):
+            self.stats.blocked[resource_type] += 1
+            self.stats.blocked_domains[urlsplit(url).hostname or ""] += 1
+            return True
+        self.stats.allowed += 1
+        return False
+
+    async def attach(self, tab) -> None:
+        """Start intercepting requests on a tab (once per tab)."""
+        if not self.enabled:
+            return
+
+        async def on_request_paused(event):
+            params = event.get("params", {})
+            request_id = params.get("requestId")
+            url = params.get("request", {}).get("url", "")
+            resource_type = params.get("resourceType")
+            try:
+                if self.decide(url, resource_type):
+                    await tab.fail_request(request_id, ErrorReason.BLOCKED_BY_CLIENT)
+                else:
+                    await tab.continue_request(request_id)
+            except Exception:
+                # Tab closed or navigated away - the request is gone either way
+                pass
+
+        await tab.enable_fetch_events()
+        await tab.on(FetchEvent.REQUEST_PAUSED, on_request_paused)
@@ -0,0 +1,206 @@
+"""
+Rule-first listing classification.
+
+For a single card the AI extraction only decides treatment and quantity
+(ebay._classify_listings), and most titles - "Wonders of the First Existence
+Progo Classic Foil 123/401" - already pin both down for the rules of
+title_features. classify_title() grades how well a title is determined and
+returns a confidence; titles below AI_RULE_FIRST_CONFIDENCE go to the LLM.
+Sealed products (Box, Pack, Lot, Bundle) never use the AI output, so they are
+always rule-classified.
+
+A title is ambiguous when the rules have to guess: conflicting treatment
+keywords, sealed-product or lot wording in a single's title, or no treatment
+keyword at all. Confidence is looked up per evidence bucket from CONFIDENCE,
+meant as the share of titles in that bucket where rules and AI agree.
+scripts/evaluate_rule_classifier.py measures exactly that over stored titles;
+rerun it after rule or prompt changes and adjust the table.
+
+Status: with the default threshold (1.0) rule-first is in effect for sealed
+products only - every single-card title still goes to the LLM. The CONFIDENCE
+values for singles are initial estimates; they have not been measured against
+labelled titles yet. Run the evaluation, commit the measured values, and only
+then lower AI_RULE_FIRST_CONFIDENCE to the buckets it confirms.
+
+Config (env):
+- AI_RULE_FIRST=0 sends every single-card title to the AI again
+- AI_RULE_FIRST_CONFIDENCE: minimum confidence to skip the LLM (default 1.0)
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from app.core.env import env_number
+from app.scraper.title_features import SEALED_PRODUCT_TYPES, extract_title_features, normalize_title
+from app.services.ai_extractor import WOTF_INDICATORS
+
+# Rule/AI agreement per evidence bucket (see module docstring); unmeasured
+# estimates except "sealed"
+CONFIDENCE: Dict[str, float] = {
+    "sealed": 1.0,  # AI output is not used for sealed products
+    "explicit": 0.95,  # one treatment keyword, nothing else to interpret
+    "explicit_quantity": 0.9,  # ... plus an explicit "3x"/"lot of 3" quantity
+    "default_numbered": 0.85,  # no treatment keyword, but a card number ("123/401")
+    "default_wotf": 0.8,  # no treatment keyword, WOTF context only
+    "default": 0.7,  # no treatment keyword at all
+    "quantity_terms": 0.6,  # lot/playset/bundle wording without a parsed quantity
+    "sealed_terms": 0.55,  # box/pack/booster wording in a single's title
+    "conflict": 0.5,  # keywords of several treatments
+}
+
+# Treatment keyword families, checked against the lowercased title in this order;
+# a matched keyword is blanked out so "stone foil" doesn't also count as foil.
+_TREATMENT_KEYWORDS = (
+    ("OCM Serialized", re.compile(r"serialized|\bocm\b|/(?:10|25|50|75|99)\b")),
+    ("Stonefoil", re.compile(r"stone[\s-]?foil")),
+    ("Formless Foil", re.compile(r"formless(?:\s+foil)?")),
+    ("Prerelease", re.compile(r"pre-?release")),
+    ("Promo", re.compile(r"\bpromo\b")),
+    ("Proof/Sample", re.compile(r"\bproof\b|\bsample\b")),
+    ("Error/Errata", re.compile(r"\berror\b|\berrata\b")),
+    ("Classic Paper", re.compile(r"non[\s-]?foil|classic paper|\bpaper\b")),
+    ("Classic Foil", re.compile(r"classic foil|\bfoil\b|\bholo\b|refractor")),
+)
+# Keyword pairs that describe one treatment ("prerelease promo")
+_COMPATIBLE = ({"Prerelease", "Promo"},)
+
+_CARD_NUMBER = re.compile(r"\b\d{1,3}/\d{3}\b")
+_QUANTITY_TERMS = re.compile(r"\blot\b|\bplayset\b|\bbundle\b|\bbulk\b|\bset of\b|\bcards\b|\bx\d|\d\s*x\b")
+_SEALED_TERMS = re.compile(r"\bbox\b|\bpacks?\b|\bbooster\b|\bcase\b|\bsealed\b")
+
+
+def rule_first_enabled() -> bool:
+    return os.getenv("AI_RULE_FIRST", "1").lower() not in ("0", "false", "off")
+
+
+def rule_first_threshold() -> float:
+    """Minimum confidence to skip the LLM; the default 1.0 lets only sealed products through."""
+    return env_number("AI_RULE_FIRST_CONFIDENCE", 1.0)
+
+
+@dataclass(frozen=True, slots=True)
+class RuleClassification:
+    """Rule-based treatment/quantity of a title and how sure the rules are."""
+
+    treatment: str
+    quantity: int
+    confidence: float
+    evidence: str  # CONFIDENCE bucket
+
+    def as_extraction(self, product_type: str) -> Dict[str, Any]:
+        """Same shape as an AIListingExtractor result."""
+        return {
+            "quantity": self.quantity,
+            "product_type": product_type,
+            "condition": None,
+            "treatment": self.treatment,
+            "confidence": self.confidence,
+            "method": "rule",
+        }
+
+
+def treatment_keywords(title_lower: str) -> Set[str]:
+    """Treatments named by keywords in the title."""
+    found = set()
+    for treatment, pattern in _TREATMENT_KEYWORDS:
+        if pattern.search(title_lower):
+            found.add(treatment)
+            title_lower = pattern.sub(" ", title_lower)
+    return found
+
+
+def classify_title(title: str, product_type: str = "Single") -> RuleClassification:
+    """Rule-based classification of a listing title with a calibrated confidence."""
+    features = extract_title_features(title, product_type)
+    evidence = _evidence(normalize_title(title), product_type, features.treatment, features.quantity)
+    return RuleClassification(
+        treatment=features.treatment,
+        quantity=features.quantity,
+        confidence=CONFIDENCE[evidence],
+        evidence=evidence,
+    )
+
+
+def _evidence(t: str, product_type: str, treatment: str, quantity: int) -> str:
+    if product_type in SEALED_PRODUCT_TYPES:
+        return "sealed"
+
+    keywords = treatment_keywords(t)
+    if len(keywords) > 1 and keywords not in _COMPATIBLE:
+        return "conflict"
+    # The keyword names another treatment than the rules picked ("non-foil" -> Classic Foil)
+    if keywords and treatment.removesuffix(" Alt Art") not in keywords:
+        return "conflict"
+    if _SEALED_TERMS.search(t):
+        return "sealed_terms"
+    if quantity == 1 and _QUANTITY_TERMS.search(t):
+        return "quantity_terms"
+    if keywords:
+        return "explicit_quantity" if quantity > 1 else "explicit"
+    if _CARD_NUMBER.search(t):
+        return "default_numbered"
+    if _wotf_context(t):
+        return "default_wotf"
+    return "default"
+
+
+def _wotf_context(t: str) -> Optional[str]:
+    for indicator in WOTF_INDICATORS:
+        if indicator in t:
+            return indicator
+    return None
+
+
+def same_extraction(rule: RuleClassification, ai_result: Dict[str, Any]) -> bool:
+    """Whether rules and AI agree on what _classify_listings uses (treatment without Alt Art, quantity)."""
+    return (
+        rule.treatment.removesuffix(" Alt Art") == ai_result.get("treatment")
+        and rule.quantity == ai_result.get("quantity", 1)
+    )
+
+
+def evaluate_agreement(
+    samples: Iterable[Tuple[str, str, Optional[Dict[str, Any]]]], threshold: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Rule vs AI agreement over (title, product_type, ai_result) samples, per evidence bucket.
+
+    ai_result may be None (sealed products, where the AI output is never used).
+    "ai_titles" is what would still go to the LLM at this threshold, against all
+    titles before rule-first; "rule_first_agreement" is how often skipping the
+    LLM gives the same answer it would have.
+    """
+    threshold = rule_first_threshold() if threshold is None else threshold
+    buckets: Dict[str, Dict[str, Any]] = {}
+    titles = ai_titles = skipped_compared = skipped_agree = 0
+    for title, product_type, ai_result in samples:
+        titles += 1
+        rule = classify_title(title, product_type)
+        bucket = buckets.setdefault(
+            rule.evidence, {"titles": 0, "compared": 0, "agree": 0, "confidence": rule.confidence}
+        )
+        bucket["titles"] += 1
+        skipped = rule.confidence >= threshold
+        if not skipped:
+            ai_titles += 1
+        if ai_result is None:
+            continue
+        agree = same_extraction(rule, ai_result)
+        bucket["compared"] += 1
+        bucket["agree"] += agree
+        if skipped:
+            skipped_compared += 1
+            skipped_agree += agree
+
+    for bucket in buckets.values():
+        bucket["agreement"] = round(bucket["agree"] / bucket["compared"], 3) if bucket["compared"] else None
+    return {
+        "threshold": threshold,
+        "titles": titles,
+        "ai_titles": ai_titles,
+        "ai_titles_saved": titles - ai_titles,
+        "rule_first_agreement": round(skipped_agree / skipped_compared, 3) if skipped_compared else None,
+        "buckets": dict(sorted(buckets.items(), key=lambda item: -item[1]["confidence"])),
+    }
@@ -6,6 +6,10 @@ Uses httpx with proper headers to mimic a real browser.
 import httpx
 import asyncio
 import random
+from typing import Dict, Optional
+
+from app.scraper.page_cache import page_cache
+from app.scraper.tab_pool import domain_pacer
 
 # Rotate through multiple user agents
 USER_AGENTS = [
@@ -16,18 +20,26 @@ USER_AGENTS = [
 ]
 
 
-async def get_page_simple(url: str, retries: int = 3) -> str:
-    """
-    Fetches a page using simple HTTP requests with proper headers.
-    More reliable than browser automation for basic scraping.
-    """
-    headers = {
+# HTTP/2 needs h2 (installed with the httpx[http2] dependency); without it the
+# shared client still pools keep-alive HTTP/1.1 connections
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _browser_headers() -> Dict[str, str]:
+    return {
         "User-Agent": random.choice(USER_AGENTS),
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
         "Accept-Language": "en-US,en;q=0.5",
         "Accept-Encoding": "gzip, deflate, br",
         "DNT": "1",
-        "Connection": "keep-alive",
         "Upgrade-Insecure-Requests": "1",
         "Sec-Fetch-Dest": "document",
         "Sec-Fetch-Mode": "navigate",
@@ -36,23 +48,62 @@ async def get_page_simple(url: str, retries: int = 3) -> str:
         "Cache-Control": "max-age=0",
     }
 
+
+def get_http_client() -> httpx.AsyncClient:
+    """Shared connection-pooled client (HTTP/2 when available, keep-alive otherwise)."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    # Pooled connections belong to one event loop (scripts may call asyncio.run repeatedly)
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client_loop = loop
+        _client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=30.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5, keepalive_expiry=60),
+        )
+    return _client
+
+
+async def close_http_client() -> None:
+    """Close the shared client's pooled connections (call alongside BrowserManager.close())."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def get_page_simple(url: str, retries: int = 3) -> str:
+    """
+    Fetches a page using simple HTTP requests with proper headers.
+    More reliable than browser automation for basic scraping.
+    Shares the on-disk page cache with get_page_content.
+
+    Requests go through one shared pooled client, so repeat fetches reuse
+    connections instead of paying TCP/TLS setup per attempt, and are spaced
+    per domain by the pacer shared with the browser (tab_pool.domain_pacer).
+    """
+    cached = page_cache.get(url)
+    if cached is not None:
+        return cached
+
     last_error = None
 
     for attempt in range(retries):
         try:
-            async with httpx.AsyncClient(timeout=30.0, follow_redirects=True, headers=headers) as client:
-                # Add random delay to mimic human behavior
-                await asyncio.sleep(random.uniform(0.5, 1.5))
+            # Same per-domain spacing (min interval + jitter) as browser navigations
+            await domain_pacer.wait(url)
 
-                response = await client.get(url)
-                response.raise_for_status()
+            response = await get_http_client().get(url, headers=_browser_headers())
+            response.raise_for_status()
 
-                content = response.text
+            content = response.text
 
-                if not content or len(content) < 100:
-                    raise Exception("Empty or invalid page content")
+            if not content or len(content) < 100:
+                raise Exception("Empty or invalid page content")
 
-                return content
+            page_cache.put(url, content)
+            return content
 
         except Exception as e:
             last_error = e
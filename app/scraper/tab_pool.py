@@ -0,0 +1,223 @@
+"""
+Warm tab pool and per-domain pacing for the shared browser.
+
+get_page_content used to serialize every navigation behind one semaphore and
+open/close a tab per page. The pool keeps up to `size` tabs open and lends them
+out concurrently, so throughput scales with tab count. Politeness toward eBay
+is explicit and separate: DomainPacer spaces requests to the same domain by
+a minimum interval plus jitter, however many tabs are in flight. One instance,
+domain_pacer, is shared by the browser and the HTTP fetch tier; a fetch that
+escalates from HTTP to the browser is paced once, not twice (already_paced).
+
+Tabs are health-checked before reuse and recycled after `max_uses` navigations
+(long-lived tabs accumulate memory). A tab that errors is discarded, not reused.
+
+Config (env):
+- SCRAPER_TAB_POOL_SIZE: concurrent tabs (default 3)
+- SCRAPER_TAB_MAX_USES: navigations before a tab is recycled (default 25)
+- SCRAPER_MIN_INTERVAL: minimum seconds between navigations per domain (default 2.0)
+- SCRAPER_PACING_JITTER: extra random delay, 0..jitter seconds (default 2.0)
+"""
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from app.core.env import env_number
+
+# Seconds allowed for the pre-use health check
+TAB_HEALTH_TIMEOUT = 5.0
+
+# Domain this task has just paced and hit (see DomainPacer.already_paced)
+_already_paced: ContextVar[Optional[str]] = ContextVar("already_paced", default=None)
+
+
+class DomainPacer:
+    """Spaces out navigations to the same domain (min interval + random jitter)."""
+
+    def __init__(self, min_interval: float = 2.0, jitter: float = 2.0):
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_allowed: Dict[str, float] = {}
+
+    @classmethod
+    def from_env(cls) -> "DomainPacer":
+        return cls(
+            min_interval=env_number("SCRAPER_MIN_INTERVAL", 2.0),
+            jitter=env_number("SCRAPER_PACING_JITTER", 2.0),
+        )
+
+    async def wait(self, url: str) -> float:
+        """Block until this URL's domain may be hit again. Returns seconds waited."""
+        domain = urlsplit(url).netloc.lower()
+        if _already_paced.get() == domain:
+            _already_paced.set(None)
+            return 0.0
+        lock = self._locks.setdefault(domain, asyncio.Lock())
+        async with lock:
+            delay = self._next_allowed.get(domain, 0.0) - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_allowed[domain] = time.monotonic() + self.min_interval + random.uniform(0, self.jitter)
+            return max(delay, 0.0)
+
+    @contextmanager
+    def already_paced(self, url: str):
+        """
+        The caller has just paced and hit this URL's domain (e.g. the HTTP tier
+        before escalating to the browser): the next wait() for it in this task
+        returns immediately instead of paying the interval a second time.
+        """
+        token = _already_paced.set(urlsplit(url).netloc.lower())
+        try:
+            yield
+        finally:
+            _already_paced.reset(token)
+
+
+# Shared by every fetch tier (browser tabs, remote browsers, pooled HTTP)
+domain_pacer = DomainPacer.from_env()
+
+
+@dataclass
+class PooledTab:
+    tab: Any
+    generation: int
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class TabPoolStats:
+    created: int = 0
+    reused: int = 0
+    recycled: int = 0  # closed after max_uses
+    discarded: int = 0  # closed after an error or failed health check
+
+
+class TabPool:
+    """
+    Bounded pool of open browser tabs.
+
+    new_tab: coroutine factory opening a tab on the current browser
+    (BrowserManager wires this to browser.new_tab()).
+    """
+
+    def __init__(
+        self,
+        new_tab: Callable[[], Awaitable[Any]],
+        size: int = 3,
+        max_uses: int = 25,
+    ):
+        self._new_tab = new_tab
+        self.size = max(1, size)
+        self.max_uses = max_uses
+        self._slots = asyncio.Semaphore(self.size)
+        self._idle: List[PooledTab] = []
+        # generation -> tabs currently lent out (for draining a recycled browser)
+        self._in_use: Dict[int, int] = {}
+        # Bumped on browser restart so tabs from a dead browser are never reused
+        self._generation = 0
+        self.stats = TabPoolStats()
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def in_use(self, generation: Optional[int] = None) -> int:
+        """Tabs currently lent out (optionally only those opened in `generation`)."""
+        if generation is None:
+            return sum(self._in_use.values())
+        return self._in_use.get(generation, 0)
+
+    async def warm(self, count: Optional[int] = None) -> int:
+        """Pre-open tabs so the first navigations don't pay tab creation. Returns tabs opened."""
+        target = min(count or self.size, self.size)
+        opened = 0
+        while len(self._idle) < target:
+            self._idle.append(await self._open())
+            opened += 1
+        return opened
+
+    @asynccontextmanager
+    async def tab(self):
+        """
+        Borrow a healthy tab. An exception inside the block discards the tab
+        (it may be mid-navigation or attached to a crashed renderer).
+        """
+        async with self._slots:
+            pooled = await self._checkout()
+            self._in_use[pooled.generation] = self._in_use.get(pooled.generation, 0) + 1
+            try:
+                yield pooled.tab
+            except BaseException:
+                await self._close(pooled)
+                self.stats.discarded += 1
+                raise
+            else:
+                pooled.uses += 1
+                if pooled.generation != self._generation or pooled.uses >= self.max_uses:
+                    await self._close(pooled)
+                    self.stats.recycled += 1
+                else:
+                    self._idle.append(pooled)
+            finally:
+                self._in_use[pooled.generation] -= 1
+                if not self._in_use[pooled.generation]:
+                    del self._in_use[pooled.generation]
+
+    async def reset(self) -> None:
+        """Drop every idle tab (call when the browser is closed or restarted)."""
+        self._generation += 1
+        idle, self._idle = self._idle, []
+        for pooled in idle:
+            await self._close(pooled)
+
+    async def drain(self, generation: int, timeout: float) -> bool:
+        """Wait until every tab from `generation` has been returned. False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self.in_use(generation):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.1)
+        return True
+
+    async def _checkout(self) -> PooledTab:
+        while self._idle:
+            pooled = self._idle.pop()
+            if pooled.generation == self._generation and await self._is_healthy(pooled.tab):
+                self.stats.reused += 1
+                return pooled
+            await self._close(pooled)
+            self.stats.discarded += 1
+        return await self._open()
+
+    async def _open(self) -> PooledTab:
+        tab = await self._new_tab()
+        self.stats.created += 1
+        return PooledTab(tab=tab, generation=self._generation)
+
+    @staticmethod
+    async def _is_healthy(tab) -> bool:
+        try:
+            await asyncio.wait_for(tab.execute_script("return 1"), timeout=TAB_HEALTH_TIMEOUT)
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    async def _close(pooled: PooledTab) -> None:
+        try:
+            await pooled.tab.close()
+        except Exception:
+            pass
@@ -0,0 +1,310 @@
+"""
+One-pass listing title classifier.
+
+Derives every rule-based attribute of an eBay listing title (treatment, product
+subtype, grading, quantity, bundle pack count, alt art) in a single call.
+The title is lowercased once, all regexes come from the precompiled PATTERNS
+registry, and results are memoized by normalized title + product type.
+
+The rules here are the ones behind ebay._detect_* - those functions are thin
+wrappers over extract_title_features().
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Pattern, Tuple
+
+SEALED_PRODUCT_TYPES = ("Box", "Pack", "Lot", "Bundle")
+
+# Memo size for extract_title_features (titles repeat heavily across pages/queries)
+FEATURE_CACHE_SIZE = 20000
+
+
+def _compile(*patterns: str) -> Tuple[Pattern[str], ...]:
+    return tuple(re.compile(p) for p in patterns)
+
+
+# Precompiled pattern registry. All patterns run against the LOWERCASED title.
+PATTERNS: Dict[str, Tuple[Pattern[str], ...]] = {
+    # Junk text eBay appends to titles (case-insensitive, longest phrase first)
+    "junk": (re.compile(r"opens in a new window or tab|opens in a new window|opens in a new tab|new listing", re.I),),
+    # A1-A8 numbering pattern (e.g., "#A2-361/401", "A5-361/401")
+    "alt_art_number": _compile(r"[#\s]a[1-8]-\d+/\d+"),
+    # Grading - checked in this order, first match wins
+    "grading_psa": _compile(
+        r"psa\s*[-]?\s*(\d+(?:\.\d)?)",  # PSA 10, PSA-10, PSA10
+        r"psa\s+gem\s*(?:mint|mt)?\s*(\d+)",  # PSA GEM MINT 10
+        r"psa\s+mint\s*(\d+)",  # PSA MINT 9
+    ),
+    "grading_bgs": _compile(
+        r"bgs\s*[-]?\s*(\d+(?:\.\d)?)",  # BGS 9.5, BGS-9.5
+        r"beckett\s*[-]?\s*(\d+(?:\.\d)?)",  # BECKETT 9.5
+        r"bgs\s+(\d+)\s*(?:black\s*label|pristine)",  # BGS 10 BLACK LABEL
+    ),
+    "grading_tag": _compile(
+        r"(?<!s)tag\s*[-]?\s*(\d+(?:\.\d)?)",  # TAG 10 (exclude STAG)
+        r"tag\s+perfect\s*(\d+)",  # TAG PERFECT 10
+    ),
+    "grading_tag_slab": _compile(r"(?<!s)tag\s+slab", r"(?<!s)tag\s*[-]?\s*slab"),
+    "grading_cgc": _compile(r"cgc\s*[-]?\s*(\d+(?:\.\d)?)"),
+    "grading_sgc": _compile(r"sgc\s*[-]?\s*(\d+(?:\.\d)?)"),
+    "grading_generic": _compile(r"\bgraded\b", r"\bslab(?:bed)?\b"),
+    # Card names containing X + digit (Carbon-X7, X7v1) - not quantities
+    "quantity_skip": _compile(
+        r"carbon-x\d",  # Carbon-X7 card name
+        r"x\d+v\d",  # X7v1 variant naming
+        r"experiment\s*x",  # Experiment X series
+    ),
+    "quantity_single": _compile(
+        r"^(\d+)\s*x\s+",  # "2x Card Name" at start
+        r"^(\d+)\s+-\s+",  # "2 - Card Name" at start
+        r"^x\s*(\d+)\s+",  # "X3 Card Name" at start
+        r"(?:^|\s)(\d+)\s*x\s*(?:-|wonders|foil)",  # "3x -" or "2x Wonders"
+        r"lot\s+of\s+(\d+)",  # "lot of 5"
+        r"(\d+)\s*card\s*lot",  # "5 card lot"
+        r"(\d+)\s*ct\b",  # "3ct"
+        r"\sx\s*(\d+)\s*$",  # "x4" at end of title
+    ),
+    # Sealed listings describing contents ("Bundle Box with 6 packs"), not sale quantity
+    "quantity_contents": _compile(
+        r"(\d+)\s*booster\s*packs?\s*(inside|included|contains|per|each)",
+        r"contains\s*(\d+)",
+        r"includes\s*(\d+)",
+        r"with\s*(\d+)\s*(booster|pack)",
+    ),
+    "quantity_sealed": _compile(
+        r"^(\d+)\s*x\s*(wonders|existence|booster|play|collector|bundle|box|pack)",  # "2x Bundle" (requires x)
+        r"^(\d{1,2})\s+(wonders|existence|booster|play|collector|bundle|box|pack)",  # "2 Wonders..." (max 2 digits)
+        r"(\d+)\s*(?:ct|count)\b",  # "5ct" or "5 count"
+        r"lot\s+of\s+(\d+)",  # "lot of 3"
+        r"set\s+of\s+(\d+)",  # "set of 2"
+        r"x(\d+)\b",  # "x4" at end
+    ),
+    # Explicit pack counts in bundle titles ("box of 6 packs", "6 pack box")
+    "bundle_pack_count": _compile(
+        r"box\s*(?:of\s*)?(\d+)\s*(?:booster\s*)?packs?",
+        r"(\d+)\s*pack\s*box",
+    ),
+}
+
+_SEALED_KEYWORDS = ("sealed", "factory sealed", "factory-sealed", "new", "unopened", "nib", "mint")
+_SERIALIZED_KEYWORDS = ("serialized", "/10", "/25", "/50", "/75", "/99", "ocm")
+
+
+@dataclass(frozen=True, slots=True)
+class TitleFeatures:
+    """All rule-based attributes derived from one listing title."""
+
+    treatment: str
+    product_subtype: Optional[str]
+    grading: Optional[str]
+    quantity: int
+    bundle_pack_count: int
+    is_alt_art: bool
+
+
+def normalize_title(title: str) -> str:
+    """Normalization used as the memo key - every rule is case-insensitive."""
+    return title.lower()
+
+
+def clean_title_text(title: str) -> str:
+    """Remove eBay junk text ('Opens in a new window or tab', 'New Listing') from a title."""
+    return PATTERNS["junk"][0].sub("", title).strip()
+
+
+def extract_title_features(title: str, product_type: str = "Single") -> TitleFeatures:
+    """
+    Classify a listing title in one pass.
+
+    Args:
+        title: Listing title (already cleaned with clean_title_text).
+        product_type: Single, Box, Pack, Bundle or Lot - affects treatment,
+            subtype and quantity rules.
+    """
+    return _extract_features(normalize_title(title), product_type)
+
+
+def clear_title_features_cache() -> None:
+    """Drop memoized features (e.g. after changing rules in a long-running process)."""
+    _extract_features.cache_clear()
+
+
+@lru_cache(maxsize=FEATURE_CACHE_SIZE)
+def _extract_features(title_lower: str, product_type: str) -> TitleFeatures:
+    is_alt_art = _is_alt_art(title_lower)
+    return TitleFeatures(
+        treatment=_treatment(title_lower, product_type, is_alt_art),
+        product_subtype=_product_subtype(title_lower, product_type),
+        grading=_grading(title_lower),
+        quantity=_quantity(title_lower, product_type),
+        bundle_pack_count=_bundle_pack_count(title_lower),
+        is_alt_art=is_alt_art,
+    )
+
+
+def _search_any(group: str, text: str) -> Optional[re.Match]:
+    """Return the first match from a pattern group (patterns are tried in order)."""
+    for pattern in PATTERNS[group]:
+        match = pattern.search(text)
+        if match:
+            return match
+    return None
+
+
+def _is_alt_art(t: str) -> bool:
+    # Explicit alt art mentions
+    if "alt art" in t or "alternate art" in t:
+        return True
+    return _search_any("alt_art_number", t) is not None
+
+
+def _treatment(t: str, product_type: str, is_alt_art: bool) -> str:
+    # Sealed products simplified to: Sealed, Open Box
+    if product_type in SEALED_PRODUCT_TYPES:
+        # Check for sealed indicators first (unopened before opened check!)
+        if any(kw in t for kw in _SEALED_KEYWORDS):
+            return "Sealed"
+        if "open box" in t or "opened" in t or "used" in t:
+            return "Open Box"
+        # Default - assume sealed if no indicators (most eBay listings are sealed)
+        return "Sealed"
+
+    # Singles - priority order matters
+    if any(kw in t for kw in _SERIALIZED_KEYWORDS):
+        base_treatment = "OCM Serialized"
+    elif "stonefoil" in t or "stone foil" in t:
+        base_treatment = "Stonefoil"
+    elif "formless" in t:
+        base_treatment = "Formless Foil"
+    elif "prerelease" in t:
+        base_treatment = "Prerelease"
+    elif "promo" in t:
+        base_treatment = "Promo"
+    elif "proof" in t or "sample" in t:
+        base_treatment = "Proof/Sample"
+    elif "errata" in t or "error" in t:
+        base_treatment = "Error/Errata"
+    elif "foil" in t or "holo" in t or "refractor" in t:
+        base_treatment = "Classic Foil"
+    else:
+        base_treatment = "Classic Paper"
+
+    if is_alt_art:
+        return f"{base_treatment} Alt Art"
+    return base_treatment
+
+
+def _product_subtype(t: str, product_type: str) -> Optional[str]:
+    if product_type == "Box":
+        if "case" in t:
+            return "Case"
+        if "booster" in t and "box" in t:
+            return "Collector Booster Box"
+        return "Box"
+
+    if product_type == "Bundle":
+        if "serialized advantage" in t:
+            return "Serialized Advantage"
+        if "starter" in t and ("set" in t or "kit" in t):
+            return "Starter Set"
+        if "play bundle" in t:
+            return "Play Bundle"
+        if "blaster" in t and "box" in t:
+            return "Blaster Box"
+        if "bundle" in t:
+            return "Play Bundle"
+        return "Bundle"
+
+    if product_type == "Pack":
+        if "silver" in t and "pack" in t:
+            return "Silver Pack"
+        if "collector" in t and ("booster" in t or "pack" in t):
+            return "Collector Booster Pack"
+        if "play" in t and ("booster" in t or "pack" in t):
+            return "Play Booster Pack"
+        # Generic booster pack (default to collector since they're more common on eBay)
+        if "booster" in t:
+            return "Collector Booster Pack"
+        return "Pack"
+
+    if product_type == "Lot":
+        if "bulk" in t:
+            return "Bulk"
+        return "Lot"
+
+    return None
+
+
+def _grading(t: str) -> Optional[str]:
+    for group, label in (("grading_psa", "PSA"), ("grading_bgs", "BGS"), ("grading_tag", "TAG")):
+        match = _search_any(group, t)
+        if match:
+            return f"{label} {match.group(1)}"
+
+    # TAG SLAB without grade (common for WOTF prerelease)
+    if _search_any("grading_tag_slab", t):
+        return "TAG SLAB"
+
+    for group, label in (("grading_cgc", "CGC"), ("grading_sgc", "SGC")):
+        match = _search_any(group, t)
+        if match:
+            return f"{label} {match.group(1)}"
+
+    # Generic graded/slab mentions (without specific service or grade)
+    if _search_any("grading_generic", t):
+        return "GRADED"
+    return None
+
+
+def _is_likely_year(num: int) -> bool:
+    return 2020 <= num <= 2030
+
+
+def _quantity(t: str, product_type: str) -> int:
+    if _search_any("quantity_skip", t):
+        return 1
+
+    if product_type == "Single":
+        for pattern in PATTERNS["quantity_single"]:
+            match = pattern.search(t)
+            if match:
+                qty = int(match.group(1))
+                if 1 < qty <= 100 and not _is_likely_year(qty):
+                    return qty
+        return 1
+
+    # Sealed: "Bundle Box with 6 packs" is 1 bundle, not 6 packs
+    if _search_any("quantity_contents", t):
+        return 1
+
+    for pattern in PATTERNS["quantity_sealed"]:
+        match = pattern.search(t)
+        if match:
+            qty = int(match.group(1))
+            if 1 < qty <= 50 and not _is_likely_year(qty):
+                return qty
+    return 1
+
+
+def _bundle_pack_count(t: str) -> int:
+    # Known WOTF bundle products
+    if "play bundle" in t or "blaster box" in t:
+        return 6
+    if "serialized advantage" in t:
+        return 4
+    if "collector booster" in t and "box" in t:
+        return 12
+    if "collector" in t and "30" in t:
+        return 30
+
+    for pattern in PATTERNS["bundle_pack_count"]:
+        match = pattern.search(t)
+        if match:
+            count = int(match.group(1))
+            if 2 <= count <= 36:
+                return count
+
+    # Single packs with bonus cards ("pack + 12 bonus cards") are not bundles
+    return 0
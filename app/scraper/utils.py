@@ -1,4 +1,5 @@
 import urllib.parse
+from typing import List
 
 EBAY_BASE_URL = "https://www.ebay.com/sch/i.html"
 TCG_CATEGORY_ID = "183454"  # CCG Individual Cards
@@ -48,3 +49,71 @@ def build_ebay_url(card_name: str, set_name: str = None, sold_only: bool = True,
 
     query_string = urllib.parse.urlencode(params)
     return f"{EBAY_BASE_URL}?{query_string}"
+
+
+def build_search_queries(card_name: str, product_type: str = "Single", rarity_name: str = "") -> List[str]:
+    """
+    Builds the optimized eBay search query list for a card (1-5 queries, deduplicated).
+
+    - Primary: "Wonders of the First [card_name]" - specific, filters non-Wonders
+    - Fallbacks depend on product type (set name, generic sealed searches, rarity)
+
+    Generic fallbacks (e.g. "Wonders of the First Lot") are shared by many cards,
+    which is what the scrape cycle planner dedupes.
+    """
+    unique_queries = []
+
+    # Check if card_name already contains "Wonders of the First" to avoid doubling
+    has_wonders_prefix = "wonders of the first" in card_name.lower()
+
+    # Primary query - add prefix only if not already present
+    if has_wonders_prefix:
+        unique_queries.append(card_name)
+    else:
+        unique_queries.append(f"Wonders of the First {card_name}")
+
+    # Add product-type specific fallback
+    if product_type == "Box":
+        # For boxes, also try with "Existence" set name
+        if not has_wonders_prefix:
+            unique_queries.append(f"Wonders of the First Existence {card_name}")
+        unique_queries.append(card_name)
+
+    elif product_type == "Pack":
+        # Use actual card name
+        unique_queries.append(card_name)
+        # Add generic booster pack search if not already searching for booster
+        if "booster" not in card_name.lower():
+            unique_queries.append("Wonders of the First Booster Pack")
+
+    elif product_type == "Lot":
+        # Lots are catch-all for bulk/bundle/collection sales
+        # Search multiple variations since sellers use different terms
+        unique_queries.append("Wonders of the First Lot")
+        unique_queries.append("Wonders of the First Bundle")
+        unique_queries.append("Wonders of the First Bulk")
+        unique_queries.append("Wonders of the First Collection")
+        unique_queries.append("Wonders Existence Lot")  # Abbreviated variation
+
+    elif product_type == "Proof":
+        # Use actual card name for proofs
+        unique_queries.append(card_name)
+        if "proof" not in card_name.lower():
+            unique_queries.append("Wonders of the First Proof")
+
+    else:
+        # Single cards - add Existence set search
+        if not has_wonders_prefix:
+            unique_queries.append(f"Wonders of the First Existence {card_name}")
+        # For very specific cards, add rarity if available
+        if rarity_name and rarity_name.lower() not in ["common", "uncommon"]:
+            unique_queries.append(f"{card_name} {rarity_name} Wonders")
+
+    # Deduplicate (case-insensitive)
+    seen = set()
+    deduped = []
+    for q in unique_queries:
+        if q.lower() not in seen:
+            deduped.append(q)
+            seen.add(q.lower())
+    return deduped
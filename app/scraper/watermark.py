@@ -0,0 +1,76 @@
+"""
+High-water marks for incremental sold scrapes.
+
+scrape_card stops paging a query once pages come back fully indexed; these
+helpers persist the newest sold_date seen per (card, query) so each run knows
+where the previous one left off.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models.market import ScrapeWatermark
+
+
+@dataclass
+class QueryProgress:
+    """What one sold query saw during a scrape."""
+
+    newest_sold_date: Optional[datetime] = None
+    pages_fetched: int = 0
+    new_listings: int = 0
+
+    def observe(self, sold_date: Optional[datetime]) -> None:
+        if sold_date and (self.newest_sold_date is None or sold_date > self.newest_sold_date):
+            self.newest_sold_date = sold_date
+
+
+def load_watermarks(card_id: int) -> Dict[str, Optional[datetime]]:
+    """Newest sold_date recorded per query for a card (empty if none or table missing)."""
+    if card_id <= 0:
+        return {}
+    try:
+        with Session(engine) as session:
+            rows = session.exec(
+                select(ScrapeWatermark.query, ScrapeWatermark.newest_sold_date).where(
+                    ScrapeWatermark.card_id == card_id
+                )
+            ).all()
+        return {query: newest for query, newest in rows}
+    except Exception as e:
+        print(f"[Watermark] Could not load watermarks for card {card_id}: {e}")
+        return {}
+
+
+def save_watermarks(card_id: int, progress: Dict[str, QueryProgress]) -> None:
+    """Upsert the per-query marks for a card in one transaction. Marks only move forward."""
+    if card_id <= 0 or not progress:
+        return
+    try:
+        with Session(engine) as session:
+            existing = {
+                mark.query: mark
+                for mark in session.exec(
+                    select(ScrapeWatermark).where(
+                        ScrapeWatermark.card_id == card_id, ScrapeWatermark.query.in_(list(progress))
+                    )
+                ).all()
+            }
+            now = datetime.utcnow()
+            for query, seen in progress.items():
+                mark = existing.get(query) or ScrapeWatermark(card_id=card_id, query=query)
+                if seen.newest_sold_date and (
+                    mark.newest_sold_date is None or seen.newest_sold_date > mark.newest_sold_date
+                ):
+                    mark.newest_sold_date = seen.newest_sold_date
+                mark.pages_fetched = seen.pages_fetched
+                mark.new_listings = seen.new_listings
+                mark.updated_at = now
+                session.add(mark)
+            session.commit()
+    except Exception as e:
+        print(f"[Watermark] Could not save watermarks for card {card_id}: {e}")
@@ -14,8 +14,13 @@ from typing import Optional, Dict, Any, List
 from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from openai import OpenAI
+from app.core.env import env_number
+from app.services.extraction_cache import ExtractionCacheStore
+from app.services.title_canonical import NearDuplicateIndex, canonical_title
+import asyncio
 import json
 import re
 import os
@@ -323,6 +328,26 @@ CONDITION_KEYWORDS = {
 }
 
 
+# Bumped when canonical_title changes, so stored results are re-keyed (part of the cache version)
+TITLE_CANONICAL_VERSION = "canonical-1"
+
+# System prompt of extract_listing_data/extract_batch (part of the extraction cache version)
+EXTRACTION_SYSTEM_PROMPT = """You are an expert at parsing TCG/CCG marketplace listings.
+Extract structured data from listings for 'Wonders of the First' trading card game.
+Always return valid JSON matching the schema exactly."""
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion from sync code, even when called inside a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # Sync caller on an event loop thread: run on a private loop (blocks the caller, as before)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
 class AIListingExtractor:
     """AI-powered listing data extractor using GPT-4o-mini."""
 
@@ -350,32 +375,37 @@ class AIListingExtractor:
         # Feedback loop - track AI decisions for review
         self._feedback_log: List[Dict[str, Any]] = []
 
+        # Persistent tier behind the in-memory LRU (extraction_cache table)
+        self._store = ExtractionCacheStore()
+
+        # Cache keys from canonical titles (see title_canonical); optional near-duplicate lookup
+        self.canonical_titles = os.getenv("AI_TITLE_CANONICAL", "1").lower() not in ("0", "false", "off")
+        near_dups = os.getenv("AI_TITLE_NEAR_DUP", "0").lower() not in ("0", "false", "off")
+        self._near_dups = NearDuplicateIndex(max_entries=self.MAX_CACHE_SIZE) if near_dups else None
+
+        # Sub-batch concurrency and per-call timeout of extract_batch_async
+        self.concurrency = env_number("AI_EXTRACTION_CONCURRENCY", 4, int)
+        self.batch_timeout = env_number("AI_EXTRACTION_TIMEOUT", 30.0)
+
         # Performance metrics
-        self._metrics = {
-            "cache_hits": 0,
-            "cache_misses": 0,
-            "ai_calls": 0,
-            "fallback_calls": 0,
-            "batch_calls": 0,
-            "cache_evictions": 0,
-            "rule_based_accepts": 0,
-            "rule_based_rejects": 0,
-            "ai_accepts": 0,
-            "ai_rejects": 0,
-        }
+        self._metrics = self._empty_metrics()
 
         if not api_key:
             print("WARNING: OPENROUTER_API_KEY not set, AI extraction will fallback to rule-based")
             self.client = None
             self.model = None
         else:
-            self.client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=api_key)
+            # Client timeout matches the batch timeout so abandoned calls don't linger in worker threads
+            self.client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=api_key, timeout=self.batch_timeout)
             # Using gpt-4o-mini for reliable, fast extraction
             self.model = "openai/gpt-4o-mini"
 
+        # Persistent cache keyspace: a model or prompt change invalidates stored results
+        self.cache_version = self._extraction_version()
+
     def _hash_title(self, title: str) -> str:
-        """Generate SHA256 hash of normalized title for cache key."""
-        normalized = title.lower().strip()
+        """Generate SHA256 hash of normalized (canonical, unless disabled) title for cache key."""
+        normalized = canonical_title(title) if self.canonical_titles else title.lower().strip()
         return hashlib.sha256(normalized.encode()).hexdigest()
 
     def _evict_expired_cache_entries(self):
@@ -428,8 +458,56 @@ class AIListingExtractor:
         self._title_cache[title_hash] = value
         self._cache_timestamps[title_hash] = datetime.utcnow().timestamp()
 
+    def _extraction_version(self) -> str:
+        """Short hash of everything that shapes an extraction: title canonicalization, model and prompts."""
+        sample = {"title": "{title}", "description": "{description}", "price": 1.0}
+        material = "\n".join(
+            ([TITLE_CANONICAL_VERSION] if self.canonical_titles else [])
+            + [
+                str(self.model),
+                EXTRACTION_SYSTEM_PROMPT,
+                self._build_extraction_prompt(sample["title"], sample["description"], sample["price"]),
+                self._build_batch_extraction_prompt([sample]),
+            ]
+        )
+        return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+    def _persistent_get(self, title_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up memory misses in the persistent tier; hits are promoted to memory."""
+        if not self.client or not title_hashes:
+            return {}
+        return self._persistent_found(title_hashes, self._store.get_many(title_hashes, self.cache_version))
+
+    async def _persistent_get_async(self, title_hashes: List[str]) -> Dict[str, Dict[str, Any]]:
+        """_persistent_get with the database read in a worker thread."""
+        if not self.client or not title_hashes:
+            return {}
+        found = await asyncio.to_thread(self._store.get_many, title_hashes, self.cache_version)
+        return self._persistent_found(title_hashes, found)
+
+    def _persistent_found(self, title_hashes: List[str], found: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        self._metrics["persistent_cache_hits"] += len(found)
+        self._metrics["persistent_cache_misses"] += len(set(title_hashes)) - len(found)
+        for title_hash, result in found.items():
+            self._cache_set(title_hash, result)
+        return found
+
+    def _persistent_put(self, entries: Dict[str, tuple]):
+        """Persist AI results ({title_hash: (title, result)}); fallbacks are never stored."""
+        if not self.client or not entries:
+            return
+        self._metrics["persistent_cache_writes"] += self._store.put_many(entries, self.cache_version)
+
+    async def _persistent_put_async(self, entries: Dict[str, tuple]):
+        """_persistent_put with the database write in a worker thread."""
+        if not self.client or not entries:
+            return
+        written = await asyncio.to_thread(self._store.put_many, entries, self.cache_version)
+        self._metrics["persistent_cache_writes"] += written
+
     def get_metrics(self) -> Dict[str, int]:
         """Get performance metrics."""
+        persistent_lookups = self._metrics["persistent_cache_hits"] + self._metrics["persistent_cache_misses"]
         return {
             **self._metrics,
             "cache_size": len(self._title_cache),
@@ -438,13 +516,25 @@ class AIListingExtractor:
                 if (self._metrics["cache_hits"] + self._metrics["cache_misses"]) > 0
                 else 0.0
             ),
+            "persistent_cache_hit_rate": (
+                self._metrics["persistent_cache_hits"] / persistent_lookups if persistent_lookups > 0 else 0.0
+            ),
+            "cache_version": self.cache_version,
         }
 
     def reset_metrics(self):
         """Reset metrics (useful for benchmarking)."""
-        self._metrics = {
+        self._metrics = self._empty_metrics()
+
+    @staticmethod
+    def _empty_metrics() -> Dict[str, int]:
+        return {
             "cache_hits": 0,
             "cache_misses": 0,
+            "persistent_cache_hits": 0,
+            "persistent_cache_misses": 0,
+            "persistent_cache_writes": 0,
+            "near_dup_hits": 0,
             "ai_calls": 0,
             "fallback_calls": 0,
             "batch_calls": 0,
@@ -580,6 +670,8 @@ class AIListingExtractor:
         """Clear all cache entries (useful for testing)."""
         self._title_cache.clear()
         self._cache_timestamps.clear()
+        if self._near_dups is not None:
+            self._near_dups.clear()
 
     def _estimate_batch_chars(self, listings: List[Dict[str, Any]]) -> int:
         """Estimate character count for batch prompt."""
@@ -649,6 +741,10 @@ class AIListingExtractor:
         if cached_result is not None:
             return cached_result
 
+        stored = self._persistent_get([title_hash])
+        if title_hash in stored:
+            return stored[title_hash]
+
         # If no API key configured, use fallback immediately
         if not self.client:
             self._metrics["fallback_calls"] += 1
@@ -665,9 +761,7 @@ class AIListingExtractor:
                 messages=[
                     {
                         "role": "system",
-                        "content": """You are an expert at parsing TCG/CCG marketplace listings.
-Extract structured data from listings for 'Wonders of the First' trading card game.
-Always return valid JSON matching the schema exactly.""",
+                        "content": EXTRACTION_SYSTEM_PROMPT,
                     },
                     {"role": "user", "content": prompt},
                 ],
@@ -690,6 +784,7 @@ Always return valid JSON matching the schema exactly.""",
 
             # Cache the result before returning
             self._cache_set(title_hash, result)
+            self._persistent_put({title_hash: (title, result)})
             return result
 
         except Exception as e:
@@ -704,6 +799,9 @@ Always return valid JSON matching the schema exactly.""",
         """
         Extract data for multiple listings efficiently.
 
+        Synchronous wrapper around extract_batch_async; async code should await
+        that directly so the event loop keeps running during API calls.
+
         Args:
             listings: List of dicts with 'title', 'description' (opt), 'price' (opt)
 
@@ -712,7 +810,56 @@ Always return valid JSON matching the schema exactly.""",
         """
         if not listings:
             return []
+        return _run_sync(self.extract_batch_async(listings))
 
+    async def extract_batch_async(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Extract data for multiple listings without blocking the event loop.
+
+        Uncached listings are split into safe sub-batches that run concurrently,
+        at most `concurrency` API calls at a time, each bounded by `batch_timeout`.
+        A sub-batch that fails or times out falls back to rule-based extraction
+        on its own; the other sub-batches keep their AI results.
+
+        Returns:
+            List of extraction results in same order as input
+        """
+        if not listings:
+            return []
+
+        results, uncached_indices, uncached_listings = await self.lookup_cached_async(listings)
+        if uncached_listings:
+            for i, extracted in zip(uncached_indices, await self.extract_uncached_async(uncached_listings)):
+                results[i] = extracted
+        return results
+
+    async def extract_uncached_async(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        AI extraction of listings that already missed both cache tiers (no lookup).
+
+        Results are cached and persisted like extract_batch_async's; used directly by
+        ExtractionCoalescer, which does its own cache lookup before batching.
+        """
+        # No API key: every listing takes the fallback below
+        all_extractions = []
+        if self.client:
+            semaphore = asyncio.Semaphore(max(1, self.concurrency))
+            sub_batches = self._split_into_safe_batches(listings)
+            for sub_extractions in await asyncio.gather(
+                *(self._extract_sub_batch(sub_batch, semaphore) for sub_batch in sub_batches)
+            ):
+                all_extractions.extend(sub_extractions)
+
+        results, to_persist = self._apply_extractions(listings, all_extractions)
+        await self._persistent_put_async(to_persist)
+        return results
+
+    async def lookup_cached_async(self, listings: List[Dict[str, Any]]) -> tuple:
+        """
+        Resolve listings from the memory and persistent tiers (database read in a worker thread).
+
+        Returns (results with None placeholders, uncached indices, uncached listings).
+        """
         results = []
         uncached_indices = []
         uncached_listings = []
@@ -730,69 +877,93 @@ Always return valid JSON matching the schema exactly.""",
                 uncached_indices.append(i)
                 uncached_listings.append(listing)
 
-        # If all cached, return early
         if not uncached_listings:
-            return results
+            return results, uncached_indices, uncached_listings
+
+        # Second tier: titles already classified by an earlier process or cycle
+        uncached_hashes = [self._hash_title(listing.get("title", "")) for listing in uncached_listings]
+        stored = await self._persistent_get_async(uncached_hashes)
+        if stored:
+            remaining = []
+            for i, listing, title_hash in zip(uncached_indices, uncached_listings, uncached_hashes):
+                if title_hash in stored:
+                    results[i] = stored[title_hash]
+                else:
+                    remaining.append((i, listing))
+            uncached_indices = [i for i, _ in remaining]
+            uncached_listings = [listing for _, listing in remaining]
 
-        # If no API key, use fallback for uncached
-        if not self.client:
-            self._metrics["fallback_calls"] += len(uncached_listings)
+        # Third: a near-duplicate title extracted earlier in this process
+        if self._near_dups is not None and uncached_listings:
+            remaining = []
             for i, listing in zip(uncached_indices, uncached_listings):
-                fallback = self._fallback_extraction(listing.get("title", ""), listing.get("description"))
-                results[i] = fallback
-                title_hash = self._hash_title(listing.get("title", ""))
-                self._cache_set(title_hash, fallback)
-            return results
+                match = self._near_dups.find(listing.get("title", ""))
+                shared = self._title_cache.get(match) if match else None
+                if shared is not None:
+                    self._metrics["near_dup_hits"] += 1
+                    self._cache_set(self._hash_title(listing.get("title", "")), shared)
+                    results[i] = shared
+                else:
+                    remaining.append((i, listing))
+            uncached_indices = [i for i, _ in remaining]
+            uncached_listings = [listing for _, listing in remaining]
 
-        # Split into safe sub-batches to avoid token limit issues
-        sub_batches = self._split_into_safe_batches(uncached_listings)
+        return results, uncached_indices, uncached_listings
 
-        # Extract all sub-batches
-        all_extractions = []
-        for sub_batch in sub_batches:
-            sub_extractions = self._extract_single_batch(sub_batch)
-            all_extractions.extend(sub_extractions)
-
-        # Map extractions back to results
-        for i, extraction_idx in enumerate(uncached_indices):
-            if i < len(all_extractions):
-                extracted = all_extractions[i]
-                if extracted is not None:
-                    results[extraction_idx] = extracted
-                    # Cache the result
-                    title_hash = self._hash_title(uncached_listings[i].get("title", ""))
-                    self._cache_set(title_hash, extracted)
-                else:
-                    # Fallback if extraction returned None
-                    self._metrics["fallback_calls"] += 1
-                    listing = uncached_listings[i]
-                    fallback = self._fallback_extraction(listing.get("title", ""), listing.get("description"))
-                    results[extraction_idx] = fallback
-                    title_hash = self._hash_title(listing.get("title", ""))
-                    self._cache_set(title_hash, fallback)
+    def _apply_extractions(
+        self, listings: List[Dict[str, Any]], all_extractions: List[Optional[Dict[str, Any]]]
+    ) -> tuple:
+        """
+        AI results (cached) for listings, rule-based fallbacks where there is none.
+
+        Returns (results, {title_hash: (title, result)} of the AI results to persist).
+        """
+        results = []
+        to_persist = {}
+        for i, listing in enumerate(listings):
+            title = listing.get("title", "")
+            title_hash = self._hash_title(title)
+            extracted = all_extractions[i] if i < len(all_extractions) else None
+            if extracted is not None:
+                self._cache_set(title_hash, extracted)
+                to_persist[title_hash] = (title, extracted)
+                if self._near_dups is not None:
+                    self._near_dups.add(title_hash, title)
             else:
-                # Fallback if index out of range
+                # No AI result (no client, failed/timed out batch, short response)
                 self._metrics["fallback_calls"] += 1
-                listing = uncached_listings[i]
-                fallback = self._fallback_extraction(listing.get("title", ""), listing.get("description"))
-                results[extraction_idx] = fallback
-                title_hash = self._hash_title(listing.get("title", ""))
-                self._cache_set(title_hash, fallback)
+                extracted = self._fallback_extraction(title, listing.get("description"))
+                self._cache_set(title_hash, extracted)
+            results.append(extracted)
 
-        return results
+        return results, to_persist
+
+    async def _extract_sub_batch(
+        self, listings: List[Dict[str, Any]], semaphore: asyncio.Semaphore
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Run one sub-batch in a worker thread under the concurrency limit and timeout."""
+        async with semaphore:
+            self._metrics["batch_calls"] += 1
+            self._metrics["ai_calls"] += 1
+            try:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(self._extract_single_batch, listings), timeout=self.batch_timeout
+                )
+            except asyncio.TimeoutError:
+                print(f"Batch extraction timed out after {self.batch_timeout:g}s ({len(listings)} listings)")
+                return [None] * len(listings)
 
     def _extract_single_batch(self, listings: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
         """
         Extract data for a single batch of listings (internal method).
 
+        Runs in a worker thread (see _extract_sub_batch), so it only reads shared state.
         Returns list of extraction results or None for failed extractions.
         """
         if not listings:
             return []
 
         try:
-            self._metrics["batch_calls"] += 1
-            self._metrics["ai_calls"] += 1
             batch_prompt = self._build_batch_extraction_prompt(listings)
 
             response = self.client.chat.completions.create(
@@ -800,9 +971,7 @@ Always return valid JSON matching the schema exactly.""",
                 messages=[
                     {
                         "role": "system",
-                        "content": """You are an expert at parsing TCG/CCG marketplace listings.
-Extract structured data from listings for 'Wonders of the First' trading card game.
-Always return valid JSON matching the schema exactly.""",
+                        "content": EXTRACTION_SYSTEM_PROMPT,
                     },
                     {"role": "user", "content": batch_prompt},
                 ],
@@ -0,0 +1,112 @@
+"""
+Persistent tier of the AI extraction cache.
+
+AIListingExtractor keeps an in-memory LRU (1h TTL, 10k entries) in front of this
+table, so a title classified once is never paid for again - across restarts,
+deploys, scripts and hourly expiry. Sold titles never change, so entries do not
+expire; instead every key carries the extractor's version (model + prompts), and
+a prompt or model change simply stops matching old rows.
+
+Only AI results are stored. Rule-based fallbacks (no API key, failed call) stay
+in memory, so a transient outage does not pin fallback output forever.
+
+A database error disables the tier for AI_EXTRACTION_CACHE_RETRY seconds
+(default 300) and extraction carries on with the memory tier alone.
+
+Config (env): AI_EXTRACTION_CACHE=0 disables the persistent tier.
+"""
+
+import os
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, select
+
+from app.models.extraction_cache import ExtractionCacheEntry
+from app.core.env import env_number
+
+
+class ExtractionCacheStore:
+    """Batch get/put of extraction results keyed by (title_hash, version)."""
+
+    def __init__(self, engine: Optional[Engine] = None, enabled: Optional[bool] = None):
+        self._engine = engine
+        if enabled is None:
+            enabled = os.getenv("AI_EXTRACTION_CACHE", "1").lower() not in ("0", "false", "off")
+        self.enabled = enabled
+        self._disabled_until = 0.0
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            # Imported lazily so scripts that never extract don't need a database
+            from app.db import engine
+
+            self._engine = engine
+        return self._engine
+
+    @property
+    def available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._disabled_until
+
+    def _failed(self, action: str, e: Exception) -> None:
+        retry = env_number("AI_EXTRACTION_CACHE_RETRY", 300.0)
+        self._disabled_until = time.monotonic() + retry
+        print(f"[ExtractionCache] {action} failed ({type(e).__name__}: {e}), memory-only for {retry:.0f}s")
+
+    def get_many(self, title_hashes: Iterable[str], version: str) -> Dict[str, Dict[str, Any]]:
+        """title_hash -> stored result for the hashes present under this version."""
+        title_hashes = list(dict.fromkeys(title_hashes))
+        if not title_hashes or not self.available:
+            return {}
+        try:
+            with Session(self.engine) as session:
+                rows = session.exec(
+                    select(ExtractionCacheEntry.title_hash, ExtractionCacheEntry.result).where(
+                        ExtractionCacheEntry.version == version,
+                        ExtractionCacheEntry.title_hash.in_(title_hashes),
+                    )
+                ).all()
+        except Exception as e:
+            self._failed("Lookup", e)
+            return {}
+        return {title_hash: result for title_hash, result in rows}
+
+    def put_many(self, entries: Dict[str, tuple], version: str) -> int:
+        """
+        Store {title_hash: (title, result)}; existing keys are left untouched.
+        Returns the number of rows actually inserted (0 on error).
+        """
+        if not entries or not self.available:
+            return 0
+        rows = [
+            {"title_hash": title_hash, "version": version, "title": title[:500], "result": result}
+            for title_hash, (title, result) in entries.items()
+        ]
+        try:
+            dialect = self.engine.dialect.name
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert
+            elif dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                insert = None
+
+            with Session(self.engine) as session:
+                if insert is not None:
+                    statement = insert(ExtractionCacheEntry).values(rows).on_conflict_do_nothing(
+                        index_elements=["title_hash", "version"]
+                    )
+                    # Rows skipped by ON CONFLICT DO NOTHING are not counted
+                    written = session.exec(statement).rowcount
+                else:
+                    existing = set(self.get_many(entries, version))
+                    new_rows = [ExtractionCacheEntry(**row) for row in rows if row["title_hash"] not in existing]
+                    session.add_all(new_rows)
+                    written = len(new_rows)
+                session.commit()
+        except Exception as e:
+            self._failed("Write", e)
+            return 0
+        return written
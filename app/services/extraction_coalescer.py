@@ -0,0 +1,176 @@
+"""
+Cross-card micro-batching of AI extraction requests.
+
+Every scraped page asks for extraction of its own uncached titles, usually 3-8,
+so on its own each page pays a full round-trip and the whole system prompt for a
+fraction of MAX_BATCH_SIZE. Card scrapes run concurrently on the worker pool, so
+the coalescer pools their titles: a batch is dispatched as soon as it is full, or
+when the oldest waiting title has waited AI_EXTRACTION_COALESCE_WAIT seconds
+(default 0.25), and each caller gets back exactly its own results, in order.
+
+Titles are checked against both cache tiers before they are queued, and a title
+already waiting or in flight for another card is shared, not sent twice.
+Dispatched batches run at most AI_EXTRACTION_CONCURRENCY at a time, so
+titles keep accumulating into full batches while the API is busy.
+
+A coalescer belongs to one event loop; get_extraction_coalescer() hands out the
+one of the running loop.
+
+Config (env): AI_EXTRACTION_COALESCE=0 disables coalescing (each page extracts
+its own titles), AI_EXTRACTION_COALESCE_WAIT.
+"""
+
+import asyncio
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.env import env_number
+from app.services.ai_extractor import AIListingExtractor
+
+
+def coalescing_enabled() -> bool:
+    return os.getenv("AI_EXTRACTION_COALESCE", "1").lower() not in ("0", "false", "off")
+
+
+@dataclass
+class CoalescerStats:
+    """Request and batch counts since the coalescer was created."""
+
+    requests: int = 0  # extract() calls
+    titles: int = 0  # titles asked for
+    cached: int = 0  # answered from the cache tiers without queueing
+    shared: int = 0  # already waiting/in flight for another caller
+    batches: int = 0  # batches dispatched to the extractor
+    dispatched: int = 0  # titles in those batches
+    deadline_flushes: int = 0  # batches sent before they were full
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            **self.__dict__,
+            "avg_batch_size": round(self.dispatched / self.batches, 1) if self.batches else 0.0,
+        }
+
+
+class ExtractionCoalescer:
+    """Pools uncached titles of concurrent callers into full extraction batches."""
+
+    def __init__(
+        self,
+        extractor: AIListingExtractor,
+        max_wait: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        self.extractor = extractor
+        self.max_wait = env_number("AI_EXTRACTION_COALESCE_WAIT", 0.25) if max_wait is None else max_wait
+        self.batch_size = batch_size or extractor.MAX_BATCH_SIZE
+        self.loop = asyncio.get_running_loop()
+        self.stats = CoalescerStats()
+        # title_hash -> listing, waiting for the next batch (oldest first)
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # title_hash -> result future, from queueing until the batch answers
+        self._futures: Dict[str, asyncio.Future] = {}
+        self._deadline: Optional[asyncio.TimerHandle] = None
+        self._slots = asyncio.Semaphore(max(1, concurrency or extractor.concurrency))
+        self._batches: Set[asyncio.Task] = set()
+
+    async def extract(self, listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """extract_batch_async, with the uncached titles batched together with other callers'."""
+        if not listings:
+            return []
+        self.stats.requests += 1
+        self.stats.titles += len(listings)
+
+        results, uncached_indices, uncached_listings = await self.extractor.lookup_cached_async(listings)
+        self.stats.cached += len(listings) - len(uncached_listings)
+
+        waiting = {}
+        seen = set()
+        for i, listing in zip(uncached_indices, uncached_listings):
+            title_hash = self.extractor._hash_title(listing.get("title", ""))
+            future = self._futures.get(title_hash)
+            if future is None:
+                future = self._futures[title_hash] = self.loop.create_future()
+                self._pending[title_hash] = listing
+            elif title_hash not in seen:
+                self.stats.shared += 1
+            seen.add(title_hash)
+            waiting[i] = future
+        self._schedule()
+
+        for i, future in waiting.items():
+            # Shielded: a cancelled caller must not cancel a result other callers wait for
+            results[i] = await asyncio.shield(future)
+        return results
+
+    def _schedule(self) -> None:
+        while len(self._pending) >= self.batch_size:
+            self._dispatch()
+        if self._pending and self._deadline is None:
+            self._deadline = self.loop.call_later(self.max_wait, self._on_deadline)
+
+    def _on_deadline(self) -> None:
+        self._deadline = None
+        while self._pending:
+            if len(self._pending) < self.batch_size:
+                self.stats.deadline_flushes += 1
+            self._dispatch()
+
+    def _dispatch(self) -> None:
+        batch = [self._pending.popitem(last=False) for _ in range(min(self.batch_size, len(self._pending)))]
+        if not self._pending and self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+        self.stats.batches += 1
+        self.stats.dispatched += len(batch)
+        task = self.loop.create_task(self._run_batch(batch))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch: List[tuple]) -> None:
+        listings = [listing for _, listing in batch]
+        extracted: List[Dict[str, Any]] = []
+        try:
+            async with self._slots:
+                extracted = await self.extractor.extract_uncached_async(listings)
+        except Exception as e:
+            # extract_uncached_async falls back per sub-batch; this is the last resort
+            print(f"[Coalescer] Batch of {len(batch)} failed ({type(e).__name__}: {e}), using fallback")
+            extracted = [self._fallback(listing) for listing in listings]
+        finally:
+            # Every waiting title gets an answer, also when the batch was cancelled or came back short,
+            # so later callers of the same title never wait on a future nobody resolves
+            for i, (title_hash, listing) in enumerate(batch):
+                future = self._futures.pop(title_hash, None)
+                if future is not None and not future.done():
+                    future.set_result(extracted[i] if i < len(extracted) else self._fallback(listing))
+
+    def _fallback(self, listing: Dict[str, Any]) -> Dict[str, Any]:
+        return self.extractor._fallback_extraction(listing.get("title", ""), listing.get("description"))
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"{s.titles} titles from {s.requests} requests ({s.cached} cached, {s.shared} shared) -> "
+            f"{s.batches} batches of {s.dispatched} titles (avg {s.as_dict()['avg_batch_size']}, "
+            f"{s.deadline_flushes} flushed at deadline)"
+        )
+
+
+_coalescer: Optional[ExtractionCoalescer] = None
+
+
+def get_extraction_coalescer(extractor: AIListingExtractor) -> ExtractionCoalescer:
+    """The running loop's coalescer for this extractor (created on first use)."""
+    global _coalescer
+    loop = asyncio.get_running_loop()
+    if _coalescer is None or _coalescer.loop is not loop or _coalescer.extractor is not extractor:
+        _coalescer = ExtractionCoalescer(extractor)
+    return _coalescer
+
+
+def current_coalescer() -> Optional[ExtractionCoalescer]:
+    """The coalescer in use, if any request went through one yet."""
+    return _coalescer
@@ -0,0 +1,238 @@
+"""
+Title canonicalization and near-duplicate lookup for the AI extraction cache.
+
+Sellers decorate the same listing differently - "🔥WOTF Existence Foo Classic Foil
+NM🔥" and "Wonders of the First Existence Foo Classic Foil - NM" ask the
+extractor the same question, but a lowercased-title hash makes them two cache
+misses. canonical_title() reduces a title to what extraction depends on:
+
+- emoji, symbols and punctuation are dropped (card numbers and serials like
+  "123/401", "/25" are kept)
+- promo fluff ("l@@k", "free shipping", "rare", ...) and condition words are
+  removed - extraction does return a condition, but nothing downstream reads
+  it (a listing's condition comes from the eBay markup, ebay._extract_condition),
+  so two titles differing only in "NM"/"LP" may share one result
+- set/brand/treatment synonyms are unified ("wonders of the first" -> "wotf",
+  "stone foil" -> "stonefoil", "holo" -> "foil")
+- the remaining words form a sorted token set, so word order and repeats
+  don't matter
+
+NearDuplicateIndex is the optional second step (AI_TITLE_NEAR_DUP=1): MinHash
+signatures over character trigrams of the canonical tokens, LSH buckets for
+candidates, and an exact Jaccard check. A candidate only counts if it carries the same numbers and the same
+treatment/quantity words, so "Foo Classic Foil" never borrows the result of
+"Foo Stonefoil" however similar the rest is. The index stops growing at
+max_entries; keys whose result left the memory cache simply miss.
+
+scripts/evaluate_title_canonicalization.py reports hit rate and false-share
+rate of both steps over stored titles.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Multi-word synonyms first: phrase -> canonical phrase
+SYNONYMS: Tuple[Tuple[str, str], ...] = (
+    (r"\bwonders? (?:of )?(?:the )?first\b", "wotf"),
+    (r"\bwotf tcg\b|\bwotf ccg\b", "wotf"),
+    (r"\bstone[\s-]*foil\b", "stonefoil"),
+    (r"\bformless[\s-]*foil\b", "formless"),
+    (r"\bclassic[\s-]*foil\b|\bholo(?:foil|graphic)?\b|\brefractor\b", "foil"),
+    (r"\bclassic[\s-]*paper\b|\bnon[\s-]*foil\b", "paper"),
+    (r"\bpre[\s-]*release\b", "prerelease"),
+    (r"\bserialis?ed\b|\bserial numbered\b|\bnumbered\b", "serialized"),
+    (r"\bexistence set\b|\bexistence 1st(?: edition)?\b", "existence"),
+    (r"\blot of (\d+)\b|\b(\d+)\s*card lot\b", r"lot \1\2"),
+    # "3x", "3 x", "x3" -> "3x" (not "carbon-x7", "x7v1": card names)
+    (r"\b(\d+)\s*x\b|(?<![\w-])x\s*(\d+)\b", r"\1\2x"),
+)
+_SYNONYMS = tuple((re.compile(pattern), replacement) for pattern, replacement in SYNONYMS)
+
+# Words that never change an extraction result
+FLUFF = frozenset(
+    """
+    l@@k look wow hot rare htf sick must see fire nice beautiful gorgeous amazing investment
+    free fast shipping ship ships shipped same day tracked usa seller
+    nm near mint mt lp mp hp gem pristine condition excellent
+    tcg ccg card cards trading game single the a an and with of in for
+    """.split()
+)
+_FLUFF_PHRASES = re.compile(
+    r"opens in a new (?:window or tab|window|tab)|new listing|must see|free shipping|fast shipping"
+)
+
+# Tokens a near-duplicate has to share exactly (besides numbers)
+SIGNATURE_WORDS = frozenset(
+    """
+    foil paper stonefoil formless serialized ocm prerelease promo proof sample error errata alt art
+    lot bundle box pack booster case playset bulk sealed graded psa bgs cgc tag sgc slab
+    """.split()
+)
+
+_TOKEN = re.compile(r"[a-z0-9@]+(?:/[a-z0-9]+)?|/\d+")
+
+
+def _strip_symbols(title: str) -> str:
+    """Drop emoji, symbols and accents, keep letters, digits, whitespace and '/'."""
+    decomposed = unicodedata.normalize("NFKD", title)
+    kept = []
+    for char in decomposed:
+        category = unicodedata.category(char)
+        if category.startswith(("L", "N")) or char in " /@-":
+            kept.append(char if char.isascii() else "")
+        elif category.startswith(("Z", "P", "S", "C")):
+            kept.append(" ")
+    return "".join(kept)
+
+
+def canonical_tokens(title: str) -> List[str]:
+    """Sorted, de-duplicated tokens of a title after fluff removal and synonym unification."""
+    text = _FLUFF_PHRASES.sub(" ", _strip_symbols(title.lower()))
+    for pattern, replacement in _SYNONYMS:
+        text = pattern.sub(replacement, text)
+    tokens = {token for token in _TOKEN.findall(text) if token not in FLUFF}
+    return sorted(tokens)
+
+
+def canonical_title(title: str) -> str:
+    """Canonical form of a title for cache keys (see module docstring)."""
+    tokens = canonical_tokens(title)
+    # Nothing left (all fluff/emoji): fall back to the plain normalization
+    return " ".join(tokens) if tokens else title.lower().strip()
+
+
+def signature(tokens: Iterable[str]) -> FrozenSet[str]:
+    """Tokens that must match exactly between near-duplicates: numbers and treatment/quantity words."""
+    return frozenset(token for token in tokens if token in SIGNATURE_WORDS or any(c.isdigit() for c in token))
+
+
+def _shingles(tokens: List[str]) -> Set[str]:
+    # Character trigrams per token: order-free, and a typo only changes a few shingles
+    shingles = set()
+    for token in tokens:
+        padded = f" {token} "
+        shingles.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return shingles
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of canonical titles -> cache key of an already extracted title."""
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 32, bands: int = 8, max_entries: int = 10000):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[Set[str], FrozenSet[str]]] = {}  # key -> (shingles, signature)
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _minhash(self, shingles: Set[str]) -> List[int]:
+        hashes = [int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big") for s in shingles]
+        # Permutations as (a*x + seed) mod 2^61-1 over the shingle hashes
+        prime = (1 << 61) - 1
+        return [min(((2 * seed + 1) * h + seed) % prime for h in hashes) for seed in range(self.num_perm)]
+
+    def _band_keys(self, minhash: List[int]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [(band, tuple(minhash[band * self.rows : (band + 1) * self.rows])) for band in range(self.bands)]
+
+    def add(self, key: str, title: str) -> None:
+        if key in self._entries or len(self._entries) >= self.max_entries:
+            return
+        tokens = canonical_tokens(title)
+        if not tokens:
+            return
+        shingles = _shingles(tokens)
+        self._entries[key] = (shingles, signature(tokens))
+        for band_key in self._band_keys(self._minhash(shingles)):
+            self._buckets.setdefault(band_key, set()).add(key)
+
+    def find(self, title: str) -> Optional[str]:
+        """Key of the most similar indexed title above the threshold, with the same signature."""
+        tokens = canonical_tokens(title)
+        if not tokens:
+            return None
+        shingles = _shingles(tokens)
+        title_signature = signature(tokens)
+        candidates = set()
+        for band_key in self._band_keys(self._minhash(shingles)):
+            candidates |= self._buckets.get(band_key, set())
+
+        best, best_score = None, self.threshold
+        for key in candidates:
+            entry_shingles, entry_signature = self._entries[key]
+            if entry_signature != title_signature:
+                continue
+            score = jaccard(shingles, entry_shingles)
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._buckets.clear()
+
+
+def evaluate_sharing(titles: Iterable[str], classify: Callable[[str], Any], near_dup: bool = True) -> Dict[str, Any]:
+    """
+    Replay titles through the extraction cache keyed three ways and measure sharing.
+
+    exact: the old key (lowercased title); canonical: canonical_title();
+    near_dup: canonical plus NearDuplicateIndex. A hit is a title answered by an
+    earlier title's result; it is a false share when classify() (title -> any
+    comparable value, e.g. treatment and quantity) differs between the two.
+    """
+    exact_seen: Set[str] = set()
+    source: Dict[str, str] = {}  # canonical key -> title whose result the key holds
+    index = NearDuplicateIndex(max_entries=1 << 30)
+    counts = {mode: {"hits": 0, "false_shares": 0} for mode in ("exact", "canonical", "near_dup")}
+    total = 0
+
+    def record(mode: str, title: str, shared_from: str) -> None:
+        counts[mode]["hits"] += 1
+        if classify(title) != classify(shared_from):
+            counts[mode]["false_shares"] += 1
+
+    for title in titles:
+        total += 1
+        exact = title.lower().strip()
+        if exact in exact_seen:
+            counts["exact"]["hits"] += 1
+        exact_seen.add(exact)
+
+        key = canonical_title(title)
+        if key in source:
+            record("canonical", title, source[key])
+            if near_dup:
+                record("near_dup", title, source[key])
+            continue
+
+        match = index.find(title) if near_dup else None
+        if match is not None:
+            record("near_dup", title, source[match])
+            source[key] = source[match]
+        else:
+            source[key] = title
+            index.add(key, title)
+
+    return {
+        "titles": total,
+        **{
+            mode: {
+                **c,
+                "hit_rate": round(c["hits"] / total, 4) if total else 0.0,
+                "false_share_rate": round(c["false_shares"] / c["hits"], 4) if c["hits"] else 0.0,
+            }
+            for mode, c in counts.items()
+            if near_dup or mode != "near_dup"
+        },
+    }
@@ -0,0 +1,202 @@
+"""
+Scheduler and scrape worker process, separate from the API.
+
+    python -m app.worker                 # scheduler (if leader) + queue consumer
+    python -m app.worker --no-scheduler  # extra queue consumers
+    python -m app.worker --no-queue      # scheduler only
+
+Running the scheduler here keeps scrape jobs off the API's event loop; start the
+API with SCHEDULER_IN_API=0 so it never schedules. The scheduler is guarded by a
+Postgres advisory lock (app/core/leader.py), so however many of these run,
+exactly one schedules jobs and the rest stand by. The queue consumer needs
+SCRAPE_QUEUE=1; without it, scheduled jobs scrape in-process in the leader.
+
+QueueWorker leases ScrapeJob rows (app/core/job_queue.py) and scrapes their
+cards with the same pipeline as the in-process market job
+(scheduler.scrape_cards: browser, fetch dedupe, worker pool). Each round leases
+up to SCRAPE_WORKER_BATCH jobs (default 20), scrapes them, and records
+done/failed per job. Leases are renewed by a heartbeat while the
+batch runs; a worker that dies simply lets its leases expire and another worker
+picks the jobs up. Retries belong to the queue (backoff, max attempts), so the
+executor's own retry lane is off here.
+
+Config (env): SCRAPE_WORKER_BATCH, SCRAPE_WORKER_POLL (idle poll seconds,
+default 10), plus the SCRAPE_QUEUE_* settings of app/core/job_queue.py.
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import socket
+from typing import Dict, List, Optional
+
+from sqlmodel import Session, select
+
+from app.core import job_queue
+from app.core.scheduler import run_scheduler, scrape_cards, scrape_single_card
+from app.db import engine
+from app.models.card import Card
+from app.models.scrape_job import ScrapeJob
+from app.core.env import env_number
+from scripts.scrape_card import scrape_card as scrape_sold_data
+
+HANDLED_KINDS = (job_queue.MARKET, job_queue.BACKFILL)
+
+
+async def scrape_backfill_card(card: Card, payload: Optional[dict] = None, fetch=None) -> bool:
+    """Sold-history scrape of one card (what admin backfills and bulk_scrape ran inline)."""
+    payload = payload or {}
+    await scrape_sold_data(
+        card_name=card.name,
+        card_id=card.id,
+        search_term=f"{card.name} {card.set_name}",
+        set_name=card.set_name,
+        product_type=card.product_type if hasattr(card, "product_type") else "Single",
+        is_backfill=payload.get("is_backfill", True),
+        fetch=fetch,
+    )
+    return True
+
+
+class QueueWorker:
+    """Lease -> scrape -> complete/fail loop over the scrape job queue."""
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size or env_number("SCRAPE_WORKER_BATCH", 20, int)
+        self.poll_interval = env_number("SCRAPE_WORKER_POLL", 10.0) if poll_interval is None else poll_interval
+        self.stopping = asyncio.Event()
+        # Leased jobs of the current batch that have no outcome yet
+        self._pending: Dict[int, ScrapeJob] = {}
+
+    def stop(self) -> None:
+        """Finish the current batch, then exit."""
+        self.stopping.set()
+
+    async def run(self) -> None:
+        print(f"[Worker] {self.worker_id} consuming {', '.join(HANDLED_KINDS)} jobs")
+        while not self.stopping.is_set():
+            processed = await self.run_once()
+            if not processed:
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        print(f"[Worker] {self.worker_id} stopped")
+
+    async def run_once(self) -> int:
+        """Lease and process one batch. Returns the number of jobs leased."""
+        with Session(engine) as session:
+            jobs = job_queue.lease(session, self.worker_id, kinds=HANDLED_KINDS, limit=self.batch_size)
+            card_ids = [job.card_id for job in jobs if job.card_id is not None]
+            cards = {card.id: card for card in session.exec(select(Card).where(Card.id.in_(card_ids))).all()}
+
+        if not jobs:
+            return 0
+
+        print(f"[Worker] Leased {len(jobs)} jobs")
+        self._pending = {job.id: job for job in jobs}
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            for kind in HANDLED_KINDS:
+                group = [job for job in jobs if job.kind == kind and job.card_id in cards]
+                if group:
+                    await self._scrape_group(kind, group, cards)
+        finally:
+            heartbeat.cancel()
+            # Timed out, never run (browser down) or missing card
+            for job in list(self._pending.values()):
+                error = "card not found" if job.card_id not in cards else "not completed in this attempt"
+                self._finish(job, False, error)
+        return len(jobs)
+
+    async def _scrape_group(self, kind: str, jobs: List[ScrapeJob], cards: Dict[int, Card]) -> None:
+        job_by_card = {job.card_id: job for job in jobs}
+
+        async def run_job(card: Card, fetch=None) -> bool:
+            job = job_by_card[card.id]
+            error = ""
+            try:
+                if kind == job_queue.BACKFILL:
+                    ok = await scrape_backfill_card(card, job.payload, fetch=fetch)
+                else:
+                    ok = await scrape_single_card(card, fetch=fetch)
+                if not ok:
+                    error = "scrape failed"
+            except Exception as e:
+                ok, error = False, f"{type(e).__name__}: {e}"
+            self._finish(job, ok, error)
+            return ok
+
+        await scrape_cards(
+            [cards[job.card_id] for job in jobs], scrape=run_job, scrape_type=f"queue-{kind}", max_retries=0
+        )
+
+    def _finish(self, job: ScrapeJob, ok: bool, error: str = "") -> None:
+        if self._pending.pop(job.id, None) is None:
+            return
+        with Session(engine) as session:
+            if ok:
+                recorded = job_queue.complete(session, job.id, self.worker_id)
+            else:
+                recorded = job_queue.fail(session, job.id, self.worker_id, error)
+        if not recorded:
+            print(f"[Worker] Lost lease on job {job.id} before it finished")
+
+    async def _heartbeat(self) -> None:
+        interval = max(1.0, job_queue.visibility_timeout() / 3)
+        while True:
+            await asyncio.sleep(interval)
+            if not self._pending:
+                continue
+            try:
+                with Session(engine) as session:
+                    lost = job_queue.heartbeat(session, list(self._pending), self.worker_id)
+                for job_id in lost:
+                    print(f"[Worker] Lease on job {job_id} was taken over")
+                    self._pending.pop(job_id, None)
+            except Exception as e:
+                print(f"[Worker] Heartbeat failed: {type(e).__name__}: {e}")
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Scheduler + scrape worker process")
+    parser.add_argument("--no-scheduler", action="store_true", help="only consume the scrape queue")
+    parser.add_argument("--no-queue", action="store_true", help="only run the scheduler")
+    args = parser.parse_args(argv)
+
+    stopping = asyncio.Event()
+    tasks = []
+    if not args.no_scheduler:
+        # Leader-elected: with several workers exactly one runs the jobs
+        tasks.append(run_scheduler(stopping))
+    worker = None
+    if not args.no_queue and job_queue.queue_enabled():
+        worker = QueueWorker()
+        tasks.append(worker.run())
+    if not tasks:
+        print("[Worker] Nothing to run (scheduler disabled and SCRAPE_QUEUE off)")
+        return
+
+    def stop() -> None:
+        stopping.set()
+        if worker:
+            worker.stop()
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop)
+        except NotImplementedError:
+            pass
+    await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,9 @@
 #!/bin/sh
+# APP_ROLE=worker runs the scheduler + scrapers (python -m app.worker); default is the API.
+# Give API services SCHEDULER_IN_API=0 once a worker service is deployed.
+if [ "$APP_ROLE" = "worker" ]; then
+    exec python -m app.worker
+fi
+
 # Railway always uses port 8080
 exec uvicorn app.main:app --host 0.0.0.0 --port 8080
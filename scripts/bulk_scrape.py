@@ -7,6 +7,7 @@ from app.models.card import Card
 from app.models.market import MarketSnapshot
 from scripts.scrape_card import scrape_card
 from app.scraper.browser import BrowserManager
+from app.core.job_queue import BACKFILL, enqueue_cards, queue_enabled
 
 async def bulk_scrape(limit: int = 1000, force_all: bool = False):
     """
@@ -48,6 +49,13 @@ async def bulk_scrape(limit: int = 1000, force_all: bool = False):
         print("No cards need updating.")
         return
 
+    if queue_enabled():
+        # Let the queue workers (python -m app.worker) do the scraping
+        with Session(engine) as session:
+            added = enqueue_cards(session, BACKFILL, [card.id for card in cards_to_scrape], payload={"is_backfill": True})
+        print(f"Enqueued {added} backfill jobs ({len(cards_to_scrape) - added} already queued).")
+        return
+
     # Initialize browser once (with Pydoll's internal 60s timeout)
     print("Initializing browser (may take up to 60 seconds)...")
     try:
@@ -0,0 +1,45 @@
+"""
+Create extraction_cache table (persistent tier of the AI listing extraction cache).
+"""
+import sys
+sys.path.insert(0, ".")
+
+from sqlmodel import text
+from app.db import engine
+
+def migrate():
+    """Create extraction_cache table."""
+    with engine.connect() as conn:
+        # Check if table already exists
+        result = conn.execute(text("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_name = 'extraction_cache'
+        """))
+
+        if result.fetchone():
+            print("Table extraction_cache already exists, skipping...")
+            return
+
+        # Create the table
+        conn.execute(text("""
+            CREATE TABLE extraction_cache (
+                id SERIAL PRIMARY KEY,
+                title_hash VARCHAR NOT NULL,
+                version VARCHAR NOT NULL,
+                title VARCHAR NOT NULL,
+                result JSON NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+            )
+        """))
+
+        # Lookups and ON CONFLICT DO NOTHING writes go through this index
+        conn.execute(text("""
+            CREATE UNIQUE INDEX ux_extraction_cache_hash_version ON extraction_cache(title_hash, version)
+        """))
+
+        conn.commit()
+        print("Created extraction_cache table with indexes")
+
+if __name__ == "__main__":
+    migrate()
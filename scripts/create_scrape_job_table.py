@@ -0,0 +1,66 @@
+"""
+Create scrape_job table for the distributed scrape job queue (app/core/job_queue.py).
+"""
+import sys
+sys.path.insert(0, ".")
+
+from sqlmodel import text
+from app.db import engine
+
+def migrate():
+    """Create scrape_job table."""
+    with engine.connect() as conn:
+        # Check if table already exists
+        result = conn.execute(text("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_name = 'scrape_job'
+        """))
+
+        if result.fetchone():
+            print("Table scrape_job already exists, skipping...")
+            return
+
+        # Create the table
+        conn.execute(text("""
+            CREATE TABLE scrape_job (
+                id SERIAL PRIMARY KEY,
+                kind VARCHAR NOT NULL,
+                card_id INTEGER NULL REFERENCES card(id),
+                payload JSON NULL,
+                dedupe_key VARCHAR NULL,
+                priority DOUBLE PRECISION NOT NULL DEFAULT 0,
+                status VARCHAR NOT NULL DEFAULT 'queued',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL DEFAULT 3,
+                available_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc'),
+                leased_by VARCHAR NULL,
+                lease_expires_at TIMESTAMP NULL,
+                heartbeat_at TIMESTAMP NULL,
+                last_error TEXT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc'),
+                finished_at TIMESTAMP NULL
+            )
+        """))
+
+        # Create indexes
+        conn.execute(text("""
+            CREATE INDEX ix_scrape_job_kind ON scrape_job(kind)
+        """))
+        conn.execute(text("""
+            CREATE INDEX ix_scrape_job_card_id ON scrape_job(card_id)
+        """))
+        conn.execute(text("""
+            CREATE INDEX ix_scrape_job_status_available ON scrape_job(status, available_at)
+        """))
+        # One queued/leased job per dedupe key - concurrent enqueues of the same card collapse
+        conn.execute(text("""
+            CREATE UNIQUE INDEX ux_scrape_job_active_dedupe ON scrape_job(dedupe_key)
+            WHERE status IN ('queued', 'leased')
+        """))
+
+        conn.commit()
+        print("Created scrape_job table with indexes")
+
+if __name__ == "__main__":
+    migrate()
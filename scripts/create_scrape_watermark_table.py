@@ -0,0 +1,49 @@
+"""
+Create scrapewatermark table (per card/query high-water marks of incremental sold scrapes, app/scraper/watermark.py).
+"""
+import sys
+sys.path.insert(0, ".")
+
+from sqlmodel import text
+from app.db import engine
+
+def migrate():
+    """Create scrapewatermark table."""
+    with engine.connect() as conn:
+        # Check if table already exists
+        result = conn.execute(text("""
+            SELECT table_name
+            FROM information_schema.tables
+            WHERE table_name = 'scrapewatermark'
+        """))
+
+        if result.fetchone():
+            print("Table scrapewatermark already exists, skipping...")
+            return
+
+        # Create the table
+        conn.execute(text("""
+            CREATE TABLE scrapewatermark (
+                id SERIAL PRIMARY KEY,
+                card_id INTEGER NOT NULL REFERENCES card(id),
+                query VARCHAR NOT NULL,
+                newest_sold_date TIMESTAMP,
+                pages_fetched INTEGER NOT NULL DEFAULT 0,
+                new_listings INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+            )
+        """))
+
+        # One row per (card, query); loads go through card_id
+        conn.execute(text("""
+            CREATE UNIQUE INDEX ix_scrapewatermark_card_query ON scrapewatermark(card_id, query)
+        """))
+        conn.execute(text("""
+            CREATE INDEX ix_scrapewatermark_card_id ON scrapewatermark(card_id)
+        """))
+
+        conn.commit()
+        print("Created scrapewatermark table with indexes")
+
+if __name__ == "__main__":
+    migrate()
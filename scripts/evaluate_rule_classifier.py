@@ -0,0 +1,89 @@
+"""
+Offline evaluation of rule-first classification against the AI extractor.
+
+Classifies a sample of stored eBay titles with both the rules
+(app/scraper/rule_classifier.py) and the AI extractor, and reports per evidence
+bucket how often they agree, how many titles would skip the LLM at the current
+threshold, and how often skipping gives the answer the LLM would have. Use the
+per-bucket agreement to recalibrate rule_classifier.CONFIDENCE.
+
+AI results come through the extractor's caches (memory + extraction_cache table),
+so titles classified before cost nothing. Needs OPENROUTER_API_KEY.
+
+Usage:
+    python scripts/evaluate_rule_classifier.py                  # 1000 most recent titles
+    python scripts/evaluate_rule_classifier.py --limit 5000 --threshold 0.9
+    python scripts/evaluate_rule_classifier.py --json report.json
+"""
+
+import argparse
+import json
+import math
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models.card import Card
+from app.models.market import MarketPrice
+from app.scraper.rule_classifier import evaluate_agreement
+from app.scraper.title_features import SEALED_PRODUCT_TYPES
+from app.services.ai_extractor import get_ai_extractor
+
+
+def load_titles(limit: int):
+    """Distinct (title, product_type) of the most recent eBay listings."""
+    with Session(engine) as session:
+        rows = session.exec(
+            select(MarketPrice.title, Card.product_type)
+            .join(Card, Card.id == MarketPrice.card_id)
+            .where(MarketPrice.platform == "ebay")
+            .order_by(MarketPrice.id.desc())
+            .limit(limit * 3)
+        ).all()
+    samples = list(dict.fromkeys((title, product_type or "Single") for title, product_type in rows if title))
+    return samples[:limit]
+
+
+def main(limit: int, threshold: float = None, json_path: str = None):
+    extractor = get_ai_extractor()
+    if not extractor.client:
+        print("OPENROUTER_API_KEY not set - nothing to compare the rules against")
+        return
+
+    samples = load_titles(limit)
+    singles = [(title, product_type) for title, product_type in samples if product_type not in SEALED_PRODUCT_TYPES]
+    print(f"Evaluating {len(samples)} titles ({len(singles)} singles)...")
+
+    ai_results = dict(
+        zip(singles, extractor.extract_batch([{"title": title, "description": None} for title, _ in singles]))
+    )
+    report = evaluate_agreement(
+        ((title, product_type, ai_results.get((title, product_type))) for title, product_type in samples),
+        threshold=threshold,
+    )
+
+    batch = extractor.MAX_BATCH_SIZE
+    print(f"\nThreshold {report['threshold']}: {report['ai_titles_saved']}/{report['titles']} titles skip the LLM")
+    print(
+        f"LLM titles {report['titles']} -> {report['ai_titles']} "
+        f"(~{math.ceil(report['titles'] / batch)} -> {math.ceil(report['ai_titles'] / batch)} full-batch calls)"
+    )
+    print(f"Agreement where the LLM is skipped: {report['rule_first_agreement']}")
+    print(f"\n{'bucket':<20}{'titles':>8}{'compared':>10}{'agreement':>11}{'confidence':>12}")
+    for name, bucket in report["buckets"].items():
+        agreement = "-" if bucket["agreement"] is None else f"{bucket['agreement']:.3f}"
+        print(f"{name:<20}{bucket['titles']:>8}{bucket['compared']:>10}{agreement:>11}{bucket['confidence']:>12.2f}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {json_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare rule-first classification with the AI extractor")
+    parser.add_argument("--limit", type=int, default=1000, help="Number of distinct titles to evaluate")
+    parser.add_argument("--threshold", type=float, default=None, help="Rule-first confidence threshold")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+    main(args.limit, args.threshold, args.json_path)
@@ -0,0 +1,89 @@
+"""
+Cache hit rate and false-share rate of title canonicalization over stored titles.
+
+Replays a sample of stored eBay titles (oldest first) through the extraction
+cache keyed three ways - the old lowercased title, canonical_title(), and
+canonical plus the near-duplicate index - and reports for each how many titles
+would be answered from an earlier title's result (hit rate) and how many of
+those answers differ from the title's own classification (false-share rate).
+
+Titles are compared by their rule-based treatment and quantity by default
+(free, no API calls). With --ai they are compared by their AI extraction of
+the raw, non-canonical title (cached per title; needs OPENROUTER_API_KEY).
+
+Usage:
+    python scripts/evaluate_title_canonicalization.py               # 5000 titles, rule comparison
+    python scripts/evaluate_title_canonicalization.py --limit 20000 --ai
+"""
+
+import argparse
+import json
+
+from sqlmodel import Session, select
+
+from app.db import engine
+from app.models.card import Card
+from app.models.market import MarketPrice
+from app.scraper.title_features import extract_title_features
+from app.services.ai_extractor import AIListingExtractor
+from app.services.title_canonical import evaluate_sharing
+
+
+def load_titles(limit: int):
+    """(title, product_type) of the most recent eBay listings, in scrape order."""
+    with Session(engine) as session:
+        rows = session.exec(
+            select(MarketPrice.title, Card.product_type)
+            .join(Card, Card.id == MarketPrice.card_id)
+            .where(MarketPrice.platform == "ebay")
+            .order_by(MarketPrice.id.desc())
+            .limit(limit)
+        ).all()
+    return [(title, product_type or "Single") for title, product_type in reversed(rows) if title]
+
+
+def main(limit: int, use_ai: bool = False, json_path: str = None):
+    samples = load_titles(limit)
+    product_types = dict(samples)
+    print(f"Replaying {len(samples)} titles...")
+
+    if use_ai:
+        extractor = AIListingExtractor()
+        if not extractor.client:
+            print("OPENROUTER_API_KEY not set - use the rule comparison instead")
+            return
+        # Raw-title keys: every title gets its own extraction to compare against
+        extractor.canonical_titles = False
+        extractor.cache_version = extractor._extraction_version()
+        titles = list(product_types)
+        extracted = dict(zip(titles, extractor.extract_batch([{"title": title} for title in titles])))
+
+        def classify(title):
+            return extracted[title]["treatment"], extracted[title]["quantity"]
+
+    else:
+
+        def classify(title):
+            features = extract_title_features(title, product_types[title])
+            return features.treatment, features.quantity
+
+    report = evaluate_sharing((title for title, _ in samples), classify)
+
+    print(f"\n{'key':<12}{'hits':>8}{'hit rate':>10}{'false shares':>14}{'false-share rate':>18}")
+    for mode in ("exact", "canonical", "near_dup"):
+        r = report[mode]
+        print(f"{mode:<12}{r['hits']:>8}{r['hit_rate']:>10.2%}{r['false_shares']:>14}{r['false_share_rate']:>18.2%}")
+
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {json_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate extraction cache sharing of canonical titles")
+    parser.add_argument("--limit", type=int, default=5000, help="Number of recent titles to replay")
+    parser.add_argument("--ai", action="store_true", help="Compare AI extractions instead of rule-based features")
+    parser.add_argument("--json", dest="json_path", default=None, help="Also write the report to this file")
+    args = parser.parse_args()
+    main(args.limit, args.ai, args.json_path)
@@ -1,86 +1,71 @@
 import asyncio
 import sys
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Awaitable, Callable, List, Optional, Set
 from sqlmodel import Session, select
 from app.db import engine
 from app.models.card import Card, Rarity
 from app.models.market import MarketSnapshot, MarketPrice
-from app.scraper.browser import get_page_content
-from app.scraper.simple_http import get_page_simple
-from app.scraper.utils import build_ebay_url
-from app.scraper.ebay import parse_search_results, parse_total_results
+from app.scraper.fetcher import fetch_page as tiered_fetch_page
+from app.scraper.simple_http import close_http_client, get_page_simple
+from app.scraper.utils import build_ebay_url, build_search_queries
+from app.scraper.ebay import parse_search_results_tagged_async, parse_total_results
 from app.services.math import calculate_stats
 from app.scraper.browser import BrowserManager
 from app.scraper.active import scrape_active_data
+from app.scraper.watermark import QueryProgress, load_watermarks, save_watermarks
 from app.discord_bot.logger import log_new_sale
 
-async def scrape_card(card_name: str, card_id: int = 0, rarity_name: str = "", search_term: Optional[str] = None, set_name: str = "", product_type: str = "Single", max_pages: int = 3, is_backfill: bool = False):
+def indexed_listings_for_stats(
+    card_id: int, exclude_ids: Set[str], before: Optional[datetime], limit: int
+) -> List[MarketPrice]:
+    """
+    Most recent stored sold listings of a card, newest first, older than `before`.
+
+    Stands in for sold pages the incremental stop skipped: those pages are already
+    indexed, so their listings are the next ones in the DB by sold_date.
+    """
+    if limit <= 0 or card_id <= 0:
+        return []
+    try:
+        with Session(engine) as session:
+            statement = select(MarketPrice).where(
+                MarketPrice.card_id == card_id,
+                MarketPrice.listing_type == "sold",
+                MarketPrice.sold_date.is_not(None),
+            )
+            if before is not None:
+                statement = statement.where(MarketPrice.sold_date <= before)
+            rows = session.exec(statement.order_by(MarketPrice.sold_date.desc()).limit(limit + len(exclude_ids))).all()
+    except Exception as e:
+        print(f"Failed to load indexed listings for stats: {e}")
+        return []
+    return [row for row in rows if not row.external_id or row.external_id not in exclude_ids][:limit]
+
+
+async def scrape_card(card_name: str, card_id: int = 0, rarity_name: str = "", search_term: Optional[str] = None, set_name: str = "", product_type: str = "Single", max_pages: int = 3, is_backfill: bool = False, fetch: Optional[Callable[[str], Awaitable[str]]] = None,
+                      incremental: Optional[bool] = None, stop_after_indexed_pages: int = 1):
     """
     Scrape eBay for a card with OPTIMIZED query generation.
 
     Strategy: Use 1-2 targeted queries instead of 8+ variations.
     - Primary: "Wonders of the First [card_name]" - specific, filters non-Wonders
     - Fallback: "[card_name] Existence" - catches abbreviated listings
-    """
 
-    # Build optimized query list (max 2-3 queries)
-    unique_queries = []
-
-    # Check if card_name already contains "Wonders of the First" to avoid doubling
-    has_wonders_prefix = "wonders of the first" in card_name.lower()
+    fetch: page fetcher (defaults to the tiered HTTP->browser fetcher). The scheduler passes a
+    ScrapePlanner.fetch so searches shared between cards are fetched once per cycle.
 
-    # Primary query - add prefix only if not already present
-    if has_wonders_prefix:
-        unique_queries.append(card_name)
-    else:
-        unique_queries.append(f"Wonders of the First {card_name}")
-
-    # Add product-type specific fallback
-    if product_type == "Box":
-        # For boxes, also try with "Existence" set name
-        if not has_wonders_prefix:
-            unique_queries.append(f"Wonders of the First Existence {card_name}")
-        unique_queries.append(card_name)
-
-    elif product_type == "Pack":
-        # Use actual card name
-        unique_queries.append(card_name)
-        # Add generic booster pack search if not already searching for booster
-        if "booster" not in card_name.lower():
-            unique_queries.append("Wonders of the First Booster Pack")
-
-    elif product_type == "Lot":
-        # Lots are catch-all for bulk/bundle/collection sales
-        # Search multiple variations since sellers use different terms
-        unique_queries.append("Wonders of the First Lot")
-        unique_queries.append("Wonders of the First Bundle")
-        unique_queries.append("Wonders of the First Bulk")
-        unique_queries.append("Wonders of the First Collection")
-        unique_queries.append("Wonders Existence Lot")  # Abbreviated variation
-
-    elif product_type == "Proof":
-        # Use actual card name for proofs
-        unique_queries.append(card_name)
-        if "proof" not in card_name.lower():
-            unique_queries.append("Wonders of the First Proof")
+    incremental: stop paging a query after `stop_after_indexed_pages` consecutive
+    pages with no new listings (results are newest-first, so deeper pages are
+    already indexed). Defaults to on, off for backfills. Snapshot stats still cover
+    the full page set: listings of the skipped pages are read back from the DB.
+    """
+    fetch_page = fetch or tiered_fetch_page
+    if incremental is None:
+        incremental = not is_backfill
 
-    else:
-        # Single cards - add Existence set search
-        if not has_wonders_prefix:
-            unique_queries.append(f"Wonders of the First Existence {card_name}")
-        # For very specific cards, add rarity if available
-        if rarity_name and rarity_name.lower() not in ['common', 'uncommon']:
-            unique_queries.append(f"{card_name} {rarity_name} Wonders")
-
-    # Deduplicate (case-insensitive)
-    seen = set()
-    deduped = []
-    for q in unique_queries:
-        if q.lower() not in seen:
-            deduped.append(q)
-            seen.add(q.lower())
-    unique_queries = deduped
+    # Build optimized query list (max 2-3 queries)
+    unique_queries = build_search_queries(card_name, product_type=product_type, rarity_name=rarity_name)
             
     # Override max_pages for historical backfills to capture more data
     if is_backfill and max_pages < 10:
@@ -93,7 +78,7 @@ async def scrape_card(card_name: str, card_id: int = 0, rarity_name: str = "", s
     
     # 1. Active Data (Use the primary query)
     print("Fetching active listings...")
-    active_ask, active_inv, highest_bid = await scrape_active_data(card_name, card_id, search_term=unique_queries[0], product_type=product_type)
+    active_ask, active_inv, highest_bid = await scrape_active_data(card_name, card_id, search_term=unique_queries[0], product_type=product_type, fetch=fetch)
 
     # Fallback: If scraper found no active listings, check existing DB records
     # Active listings within the last 24 hours are still relevant
@@ -130,35 +115,41 @@ async def scrape_card(card_name: str, card_id: int = 0, rarity_name: str = "", s
     seen_ids = set()
     seen_keys = set()
 
+    # High-water marks from previous runs (newest sold_date seen per query)
+    watermarks = load_watermarks(card_id)
+    query_progress = {}
+    # Listings the pages skipped by the incremental stop would have added to the stats
+    skipped_for_stats = 0
+
     for query in unique_queries:
         print(f"Trying Query: {query}")
+        if watermarks.get(query):
+            print(f"  Last run's newest sale: {watermarks[query]}")
 
         query_prices = []
         query_prices_for_stats = []
+        progress = query_progress[query] = QueryProgress()
+        indexed_pages = 0
         for page in range(1, max_pages + 1):
             url = build_ebay_url(query, sold_only=True, page=page)
 
             try:
-                # Use Pydoll browser (handles eBay's bot detection)
-                html = await get_page_content(url)
+                # HTTP first, Pydoll browser when eBay blocks it
+                html = await fetch_page(url)
             except Exception as e:
                 print(f"Failed to fetch page {page}: {e}")
                 break
 
-            # Parse this page - get ALL listings for stats calculation
-            page_prices_for_stats = parse_search_results(html, card_id=card_id, card_name=clean_name,
-                                                         target_rarity=rarity_name, return_all=True,
-                                                         product_type=product_type)
-            # Parse this page - get only NEW listings for saving to DB
-            page_prices = parse_search_results(html, card_id=card_id, card_name=clean_name,
-                                              target_rarity=rarity_name, return_all=False,
-                                              product_type=product_type)
+            # Parse this page ONCE - every valid listing, tagged with whether it's already indexed
+            page_listings = await parse_search_results_tagged_async(html, card_id=card_id, card_name=clean_name,
+                                                                    target_rarity=rarity_name, product_type=product_type)
 
-            if not page_prices_for_stats:
+            if not page_listings:
                 break
 
-            # Add unique prices for DB saving (new listings only)
-            for mp in page_prices:
+            progress.pages_fetched += 1
+            page_new = 0
+            for mp in page_listings:
                 is_duplicate = False
 
                 # Check ID match (Best)
@@ -170,38 +161,39 @@ async def scrape_card(card_name: str, card_id: int = 0, rarity_name: str = "", s
                 if key in seen_keys:
                     is_duplicate = True
 
-                if not is_duplicate:
-                    if mp.external_id:
-                        seen_ids.add(mp.external_id)
-                    seen_keys.add(key)
+                if is_duplicate:
+                    continue
 
-                    query_prices.append(mp)
-                    all_prices.append(mp)
+                if mp.external_id:
+                    seen_ids.add(mp.external_id)
+                seen_keys.add(key)
 
-            # Add ALL listings for stats calculation (includes already-indexed ones)
-            for mp in page_prices_for_stats:
-                is_duplicate = False
+                # ALL unique listings count toward stats (includes already-indexed ones)
+                query_prices_for_stats.append(mp)
+                all_prices_for_stats.append(mp)
+                progress.observe(mp.sold_date)
 
-                # Check ID match (Best)
-                if mp.external_id and mp.external_id in seen_ids:
-                    is_duplicate = True
-
-                # Check composite key match (Fallback)
-                key = (mp.title, mp.price, mp.sold_date)
-                if key in seen_keys:
-                    is_duplicate = True
-
-                if not is_duplicate:
-                    if mp.external_id:
-                        seen_ids.add(mp.external_id)
-                    seen_keys.add(key)
-
-                    query_prices_for_stats.append(mp)
-                    all_prices_for_stats.append(mp)
+                # Only NEW listings are saved to DB
+                if not mp.is_indexed:
+                    query_prices.append(mp)
+                    all_prices.append(mp)
+                    page_new += 1
             
+            progress.new_listings += page_new
+
             # Get total from first page of FIRST query only (best approximation)
             if page == 1 and query == unique_queries[0]:
                 total_volume = parse_total_results(html)
+
+            # Incremental: results are newest-first, so once pages stop yielding
+            # new listings the rest of this query is already indexed
+            indexed_pages = indexed_pages + 1 if page_new == 0 else 0
+            if incremental and indexed_pages >= stop_after_indexed_pages:
+                if page < max_pages:
+                    print(f"  Page {page} fully indexed, skipping pages {page + 1}-{max_pages}")
+                    skipped_for_stats += (max_pages - page) * len(page_listings)
+                break
+
             await asyncio.sleep(1)
 
         print(f"Found {len(query_prices)} new listings to save, {len(query_prices_for_stats)} total for stats. Total unique: {len(all_prices_for_stats)}")
@@ -214,6 +206,16 @@ async def scrape_card(card_name: str, card_id: int = 0, rarity_name: str = "", s
             print(f"✓ Sufficient data ({len(all_prices_for_stats)} results), skipping remaining queries.")
             break
 
+    save_watermarks(card_id, query_progress)
+
+    # Stats keep covering the full page set: the skipped pages are already indexed, read them back
+    if skipped_for_stats:
+        oldest = min((p.sold_date for p in all_prices_for_stats if p.sold_date), default=None)
+        indexed = indexed_listings_for_stats(card_id, seen_ids, oldest, skipped_for_stats)
+        if indexed:
+            print(f"Adding {len(indexed)} indexed listings from skipped pages to stats")
+            all_prices_for_stats.extend(indexed)
+
     # Use stats prices (includes existing listings) for market snapshot
     prices_for_stats = all_prices_for_stats
     # Use new prices for saving to database
@@ -331,7 +333,8 @@ async def scrape_card(card_name: str, card_id: int = 0, rarity_name: str = "", s
                             # Set listed_at = sold_date as best approximation
                             if price.listing_type == "sold" and price.sold_date and not price.listed_at:
                                 price.listed_at = price.sold_date
-                            session.add(price)
+                            # Listings are lightweight records until now - build the ORM row only for insert
+                            session.add(price.to_market_price())
                             session.flush()  # Check for constraint violation
                             saved_count += 1
                             if price.listing_type == "sold":
@@ -411,8 +414,9 @@ async def main():
             
     await scrape_card(card_name, card_id, rarity_name, search_term=search_term, set_name=set_name)
     
-    # Close browser
+    # Close browser and pooled HTTP connections
     await BrowserManager.close()
+    await close_http_client()
 
 if __name__ == "__main__":
     if len(sys.argv) > 1:
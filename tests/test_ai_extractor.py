@@ -0,0 +1,164 @@
+"""
+Tests for concurrent sub-batch extraction in AIListingExtractor.
+
+Tests cover:
+- Sub-batches run concurrently, bounded by the concurrency limit
+- A timed out or failed sub-batch falls back on its own
+- Persistent cache reads and writes stay off the event loop thread
+- The sync extract_batch wrapper, also when called inside a running loop
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.ai_extractor import AIListingExtractor
+from app.services.extraction_cache import ExtractionCacheStore
+
+RESULT = {"quantity": 1, "product_type": "Single", "condition": None, "treatment": "Classic Foil", "confidence": 0.9}
+
+
+class FakeClient:
+    """Sync OpenAI stand-in that records peak concurrency; titles containing 'slow'/'boom' misbehave."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        try:
+            time.sleep(1.0 if "slow" in prompt else self.delay)
+            if "boom" in prompt:
+                raise RuntimeError("rate limited")
+            content = json.dumps({"listings": [RESULT] * prompt.count("**Title**")})
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def _extractor(client, concurrency=4, timeout=5.0):
+    extractor = AIListingExtractor()
+    extractor.client = client
+    extractor.model = "openai/gpt-4o-mini"
+    extractor._store = ExtractionCacheStore(enabled=False)
+    extractor.concurrency = concurrency
+    extractor.batch_timeout = timeout
+    return extractor
+
+
+def _listings(count, word="Progo"):
+    return [{"title": f"Wonders of the First {word} {i}"} for i in range(count)]
+
+
+class TestExtractBatchAsync:
+    """Tests for extract_batch_async."""
+
+    @pytest.mark.asyncio
+    async def test_sub_batches_run_concurrently_under_limit(self):
+        client = FakeClient()
+        extractor = _extractor(client, concurrency=2)
+
+        # 100 titles -> 4 sub-batches of 25
+        results = await extractor.extract_batch_async(_listings(100))
+
+        assert results == [RESULT] * 100
+        assert client.calls == 4
+        assert client.peak == 2
+        assert extractor.get_metrics()["batch_calls"] == 4
+
+    @pytest.mark.asyncio
+    async def test_timed_out_sub_batch_falls_back_alone(self):
+        extractor = _extractor(FakeClient(), timeout=0.3)
+        listings = _listings(25) + _listings(5, word="slow")
+
+        results = await extractor.extract_batch_async(listings)
+
+        assert results[:25] == [RESULT] * 25
+        assert all(result["confidence"] == 0.6 for result in results[25:])
+        assert extractor.get_metrics()["fallback_calls"] == 5
+
+    @pytest.mark.asyncio
+    async def test_failed_sub_batch_falls_back_alone(self):
+        extractor = _extractor(FakeClient())
+        listings = _listings(25) + _listings(3, word="boom")
+
+        results = await extractor.extract_batch_async(listings)
+
+        assert results[:25] == [RESULT] * 25
+        assert extractor.get_metrics()["fallback_calls"] == 3
+
+    @pytest.mark.asyncio
+    async def test_no_client_uses_fallback(self):
+        extractor = _extractor(None)
+
+        results = await extractor.extract_batch_async(_listings(3))
+
+        assert [result["confidence"] for result in results] == [0.6] * 3
+
+    @pytest.mark.asyncio
+    async def test_results_are_cached(self):
+        client = FakeClient()
+        extractor = _extractor(client)
+
+        await extractor.extract_batch_async(_listings(3))
+        await extractor.extract_batch_async(_listings(3))
+
+        assert client.calls == 1
+        assert extractor.get_metrics()["cache_hits"] == 3
+
+
+    @pytest.mark.asyncio
+    async def test_persistent_cache_runs_off_the_loop(self):
+        extractor = _extractor(FakeClient())
+        loop_thread = threading.current_thread()
+        threads = []
+
+        class Store:
+            def get_many(self, title_hashes, version):
+                threads.append(threading.current_thread())
+                return {}
+
+            def put_many(self, entries, version):
+                threads.append(threading.current_thread())
+                return len(entries)
+
+        extractor._store = Store()
+        await extractor.extract_batch_async(_listings(3))
+
+        assert len(threads) == 2
+        assert loop_thread not in threads
+        assert extractor.get_metrics()["persistent_cache_writes"] == 3
+
+
+class TestExtractBatchSync:
+    """Tests for the sync extract_batch wrapper."""
+
+    def test_sync_wrapper(self):
+        client = FakeClient()
+        extractor = _extractor(client)
+
+        assert extractor.extract_batch(_listings(30)) == [RESULT] * 30
+        assert client.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_wrapper_inside_running_loop(self):
+        extractor = _extractor(FakeClient())
+
+        assert extractor.extract_batch(_listings(2)) == [RESULT] * 2
+
+    def test_empty(self):
+        assert _extractor(MagicMock()).extract_batch([]) == []
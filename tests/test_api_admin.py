@@ -10,6 +10,7 @@ Tests cover:
 - Authentication/authorization (superuser-only access)
 """
 
+import os
 import pytest
 from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock, AsyncMock
@@ -690,6 +691,27 @@ class TestSchedulerStatusEndpoint:
         assert data["jobs"][1]["id"] == "job_2"
         assert data["jobs"][1]["next_run"] is None
 
+    @patch('app.core.scheduler.scheduler')
+    def test_market_update_is_scoped_to_the_process(self, mock_scheduler, client, auth_headers):
+        """Executor progress is reported under "process" with the host/pid it belongs to."""
+        mock_scheduler.running = False
+        mock_scheduler.get_jobs.return_value = []
+        executor = MagicMock()
+        executor.progress.as_dict.return_value = {"total": 3, "completed": 1}
+
+        with patch('app.core.scheduler.market_executor', executor):
+            response = client.get(
+                "/api/v1/admin/scheduler/status",
+                headers=auth_headers,
+            )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert "market_update" not in data
+        assert data["process"]["pid"] == os.getpid()
+        assert data["process"]["market_update"] == {"total": 3, "completed": 1}
+
     def test_get_scheduler_status_unauthorized(self, client):
         """Test scheduler status without authentication."""
         response = client.get("/api/v1/admin/scheduler/status")
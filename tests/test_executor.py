@@ -0,0 +1,122 @@
+"""
+Tests for the continuous worker-pool scrape executor.
+
+Tests cover:
+- Every item processed once, workers pull continuously (no batch barrier)
+- Per-attempt timeouts
+- Retry lane with backoff, giving up after max_retries
+- Progress counters
+"""
+
+import asyncio
+
+import pytest
+
+from app.core.executor import ScrapeExecutor
+
+
+class TestScrapeExecutor:
+    """Tests for ScrapeExecutor.run."""
+
+    @pytest.mark.asyncio
+    async def test_processes_every_item(self):
+        seen = []
+
+        async def handler(item):
+            seen.append(item)
+            return True
+
+        progress = await ScrapeExecutor(handler, workers=3).run(range(10))
+
+        assert sorted(seen) == list(range(10))
+        assert progress.succeeded == 10
+        assert progress.failed == 0
+        assert progress.queued == 0
+        assert progress.finished_at is not None
+
+    @pytest.mark.asyncio
+    async def test_slow_item_does_not_block_other_workers(self):
+        fast_done = asyncio.Event()
+        order = []
+
+        async def handler(item):
+            if item == "slow":
+                # Only finishes once every fast item has gone through the other worker
+                await asyncio.wait_for(fast_done.wait(), timeout=1)
+            order.append(item)
+            if len(order) == 4:
+                fast_done.set()
+            return True
+
+        progress = await ScrapeExecutor(handler, workers=2).run(["slow", "a", "b", "c", "d"])
+
+        assert order[-1] == "slow"
+        assert progress.succeeded == 5
+
+    @pytest.mark.asyncio
+    async def test_timeout_counts_and_retries(self):
+        attempts = []
+
+        async def handler(item):
+            attempts.append(item)
+            if len(attempts) == 1:
+                await asyncio.sleep(1)
+            return True
+
+        executor = ScrapeExecutor(handler, workers=1, task_timeout=0.01, max_retries=1, retry_backoff=0)
+        progress = await executor.run(["card"])
+
+        assert attempts == ["card", "card"]
+        assert progress.timeouts == 1
+        assert progress.retries == 1
+        assert progress.succeeded == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self):
+        calls = []
+
+        async def handler(item):
+            calls.append(item)
+            raise RuntimeError("blocked")
+
+        executor = ScrapeExecutor(handler, workers=2, max_retries=2, retry_backoff=0)
+        progress = await executor.run(["a", "b"])
+
+        assert calls.count("a") == 3
+        assert calls.count("b") == 3
+        assert progress.failed == 2
+        assert progress.retries == 4
+        assert progress.retry_queued == 0
+        assert progress.in_progress == {}
+
+    @pytest.mark.asyncio
+    async def test_retries_do_not_block_main_lane(self):
+        order = []
+
+        async def handler(item):
+            order.append(item)
+            return item != "bad" or order.count("bad") > 1
+
+        executor = ScrapeExecutor(handler, workers=1, max_retries=1, retry_backoff=0.05)
+        progress = await executor.run(["bad", "x", "y"])
+
+        # Fresh items run while "bad" backs off
+        assert order == ["bad", "x", "y", "bad"]
+        assert progress.succeeded == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_run(self):
+        async def handler(item):
+            return True
+
+        progress = await ScrapeExecutor(handler).run([])
+
+        assert progress.total == 0
+        assert progress.completed == 0
+
+    def test_progress_as_dict(self):
+        executor = ScrapeExecutor(lambda item: None)
+        data = executor.progress.as_dict()
+        assert data["total"] == 0
+        assert data["in_progress"] == {}
+        assert data["started_at"] is None
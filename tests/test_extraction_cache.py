@@ -0,0 +1,139 @@
+"""
+Tests for the persistent AI extraction cache.
+
+Tests cover:
+- Store round trip, version isolation, duplicate writes
+- Extractor: persistent hits survive a fresh (restarted) extractor
+- Version change (model/prompt) invalidates stored results
+- Fallback results are never persisted
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from sqlmodel import create_engine
+
+from app.services.ai_extractor import AIListingExtractor
+from app.services.extraction_cache import ExtractionCacheStore
+
+RESULT = {"quantity": 1, "product_type": "Single", "condition": None, "treatment": "Classic Foil", "confidence": 0.9}
+
+
+def _client(calls):
+    """Fake OpenAI client answering every batch with RESULT per listing."""
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        count = kwargs["messages"][1]["content"].count("**Title**")
+        content = json.dumps({"listings": [RESULT] * count})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    client = MagicMock()
+    client.chat.completions.create.side_effect = create
+    return client
+
+
+def _extractor(store, calls, model="openai/gpt-4o-mini"):
+    extractor = AIListingExtractor()
+    extractor.client = _client(calls)
+    extractor.model = model
+    extractor.cache_version = extractor._extraction_version()
+    extractor._store = store
+    return extractor
+
+
+class TestExtractionCacheStore:
+    """Tests for ExtractionCacheStore."""
+
+    def test_round_trip_and_version_isolation(self, test_engine):
+        store = ExtractionCacheStore(engine=test_engine, enabled=True)
+
+        assert store.put_many({"h1": ("Title 1", RESULT)}, "v1") == 1
+
+        assert store.get_many(["h1", "h2"], "v1") == {"h1": RESULT}
+        assert store.get_many(["h1"], "v2") == {}
+
+    def test_duplicate_write_is_ignored(self, test_engine):
+        store = ExtractionCacheStore(engine=test_engine, enabled=True)
+        store.put_many({"h1": ("Title 1", RESULT)}, "v1")
+
+        written = store.put_many(
+            {"h1": ("Title 1", {**RESULT, "treatment": "Stonefoil"}), "h2": ("Title 2", RESULT)}, "v1"
+        )
+
+        assert written == 1
+
+        assert store.get_many(["h1"], "v1")["h1"]["treatment"] == "Classic Foil"
+
+    def test_disabled_store(self, test_engine):
+        store = ExtractionCacheStore(engine=test_engine, enabled=False)
+        assert store.put_many({"h1": ("Title 1", RESULT)}, "v1") == 0
+        assert store.get_many(["h1"], "v1") == {}
+
+    def test_database_error_falls_back_to_memory_only(self):
+        # No extraction_cache table in this database
+        store = ExtractionCacheStore(engine=create_engine("sqlite://"), enabled=True)
+
+        assert store.get_many(["h1"], "v1") == {}
+        assert store.available is False
+
+
+class TestExtractorPersistentTier:
+    """Tests for AIListingExtractor with the persistent tier."""
+
+    LISTINGS = [{"title": "Wonders of the First Progo Classic Foil"}, {"title": "Zeltona Formless Foil"}]
+
+    def test_restarted_extractor_reuses_stored_results(self, test_engine):
+        store = ExtractionCacheStore(engine=test_engine, enabled=True)
+        calls = []
+
+        first = _extractor(store, calls)
+        assert first.extract_batch(self.LISTINGS) == [RESULT, RESULT]
+        assert len(calls) == 1
+        assert first.get_metrics()["persistent_cache_writes"] == 2
+
+        # New process: empty memory tier, same database
+        second = _extractor(store, calls)
+        assert second.extract_batch(self.LISTINGS) == [RESULT, RESULT]
+        assert len(calls) == 1
+
+        metrics = second.get_metrics()
+        assert metrics["persistent_cache_hits"] == 2
+        assert metrics["persistent_cache_hit_rate"] == 1.0
+
+        # Promoted to memory: no second lookup
+        second.extract_batch(self.LISTINGS)
+        assert second.get_metrics()["cache_hits"] == 2
+
+    def test_model_change_invalidates(self, test_engine):
+        store = ExtractionCacheStore(engine=test_engine, enabled=True)
+        calls = []
+
+        _extractor(store, calls).extract_batch(self.LISTINGS)
+        other = _extractor(store, calls, model="openai/gpt-4.1-mini")
+
+        other.extract_batch(self.LISTINGS)
+
+        assert len(calls) == 2
+        assert other.get_metrics()["persistent_cache_misses"] == 2
+
+    def test_single_extraction_uses_store(self, test_engine):
+        store = ExtractionCacheStore(engine=test_engine, enabled=True)
+        calls = []
+        _extractor(store, calls).extract_batch(self.LISTINGS[:1])
+
+        extractor = _extractor(store, calls)
+        assert extractor.extract_listing_data(self.LISTINGS[0]["title"]) == RESULT
+        assert len(calls) == 1
+
+    def test_fallbacks_are_not_persisted(self, test_engine):
+        store = ExtractionCacheStore(engine=test_engine, enabled=True)
+        calls = []
+        extractor = _extractor(store, calls)
+        extractor.client.chat.completions.create.side_effect = RuntimeError("rate limited")
+
+        extractor.extract_batch(self.LISTINGS)
+
+        assert extractor.get_metrics()["persistent_cache_writes"] == 0
+        assert store.get_many([extractor._hash_title(item["title"]) for item in self.LISTINGS], extractor.cache_version) == {}
@@ -0,0 +1,144 @@
+"""
+Tests for cross-card micro-batching of AI extraction (ExtractionCoalescer).
+
+Tests cover:
+- Small concurrent requests are pooled into full batches, results demultiplexed
+- Partial batches are flushed at the max-wait deadline
+- Titles in flight for another caller and cached titles are not sent again
+- A cancelled caller does not cancel the batch other callers wait for
+- A cancelled batch still answers every waiting title
+"""
+
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.ai_extractor import AIListingExtractor
+from app.services.extraction_cache import ExtractionCacheStore
+from app.services.extraction_coalescer import ExtractionCoalescer
+
+
+class FakeClient:
+    """Answers each title 'Card <n>' with quantity n, so results can be traced back to titles."""
+
+    def __init__(self):
+        self.batches = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        numbers = [int(n) for n in re.findall(r"\*\*Title\*\*: Card (\d+)", kwargs["messages"][1]["content"])]
+        self.batches.append(numbers)
+        listings = [
+            {"quantity": n, "product_type": "Single", "treatment": "Classic Foil", "confidence": 0.9} for n in numbers
+        ]
+        content = json.dumps({"listings": listings})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _extractor(client):
+    extractor = AIListingExtractor()
+    extractor.client = client
+    extractor.model = "openai/gpt-4o-mini"
+    extractor._store = ExtractionCacheStore(enabled=False)
+    return extractor
+
+
+def _titles(numbers):
+    return [{"title": f"Card {n}"} for n in numbers]
+
+
+def _quantities(results):
+    return [result["quantity"] for result in results]
+
+
+class TestExtractionCoalescer:
+    """Tests for ExtractionCoalescer."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_pages_fill_batches(self):
+        client = FakeClient()
+        coalescer = ExtractionCoalescer(_extractor(client), max_wait=0.1, batch_size=25)
+        pages = [list(range(start, start + 5)) for start in range(1, 51, 5)]  # 10 pages x 5 titles
+
+        results = await asyncio.gather(*(coalescer.extract(_titles(page)) for page in pages))
+
+        assert [_quantities(result) for result in results] == pages
+        assert sorted(len(batch) for batch in client.batches) == [25, 25]
+        assert coalescer.stats.batches == 2
+        assert coalescer.stats.deadline_flushes == 0
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushed_at_deadline(self):
+        client = FakeClient()
+        coalescer = ExtractionCoalescer(_extractor(client), max_wait=0.05, batch_size=25)
+
+        results = await asyncio.wait_for(coalescer.extract(_titles([1, 2, 3])), timeout=2)
+
+        assert _quantities(results) == [1, 2, 3]
+        assert client.batches == [[1, 2, 3]]
+        assert coalescer.stats.deadline_flushes == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_titles_sent_once(self):
+        client = FakeClient()
+        coalescer = ExtractionCoalescer(_extractor(client), max_wait=0.05)
+
+        first, second = await asyncio.gather(
+            coalescer.extract(_titles([1, 2, 3])), coalescer.extract(_titles([3, 4, 1]))
+        )
+
+        assert _quantities(first) == [1, 2, 3]
+        assert _quantities(second) == [3, 4, 1]
+        assert sorted(client.batches[0]) == [1, 2, 3, 4]
+        assert coalescer.stats.shared == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_titles_not_queued(self):
+        client = FakeClient()
+        coalescer = ExtractionCoalescer(_extractor(client), max_wait=0.05)
+        await coalescer.extract(_titles([1, 2]))
+
+        results = await coalescer.extract(_titles([1, 2, 3]))
+
+        assert _quantities(results) == [1, 2, 3]
+        assert client.batches == [[1, 2], [3]]
+        assert coalescer.stats.cached == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_batch(self):
+        client = FakeClient()
+        coalescer = ExtractionCoalescer(_extractor(client), max_wait=0.05)
+
+        cancelled = asyncio.create_task(coalescer.extract(_titles([1, 2])))
+        other = asyncio.create_task(coalescer.extract(_titles([2, 3])))
+        # Both callers have queued their titles (the cache lookup hops to a thread first)
+        while len(coalescer._futures) < 3:
+            await asyncio.sleep(0.001)
+        cancelled.cancel()
+
+        assert _quantities(await other) == [2, 3]
+        assert client.batches == [[1, 2, 3]]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_resolves_waiting_titles(self):
+        client = FakeClient()
+        extractor = _extractor(client)
+        coalescer = ExtractionCoalescer(extractor, max_wait=0.01)
+        started = asyncio.Event()
+
+        async def hang(listings):
+            started.set()
+            await asyncio.sleep(10)
+
+        extractor.extract_uncached_async = hang
+        waiting = asyncio.create_task(coalescer.extract(_titles([1, 2])))
+        await started.wait()
+        for batch in list(coalescer._batches):
+            batch.cancel()
+
+        results = await asyncio.wait_for(waiting, timeout=1)
+        assert _quantities(results) == [1, 1]  # rule-based fallback
+        assert coalescer._futures == {}
@@ -0,0 +1,182 @@
+"""
+Tests for the tiered HTTP -> browser fetcher.
+
+Tests cover:
+- Page classification (results, empty, block page, captcha)
+- Escalation to the browser and per-route cooldowns
+- Per-tier stats
+- HTTP tier pacing and caching through get_page_simple
+- An HTTP -> browser escalation is paced once
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.scraper.fetcher import TieredFetcher, route_key
+from app.scraper.page_cache import PageCache
+from app.scraper.page_classify import classify_page
+from app.scraper.tab_pool import DomainPacer
+from app.scraper.utils import build_ebay_url
+
+SEARCH_URL = build_ebay_url("Progo", sold_only=True)
+PADDING = "<div>" + "x" * 200 + "</div>"
+RESULTS = f'<html><ul><li class="s-item s-item__pl-on-bottom">Progo</li></ul>{PADDING}</html>'
+BLOCKED = f"<html><title>Pardon Our Interruption...</title>{PADDING}</html>"
+CAPTCHA = f'<html><div class="g-recaptcha"></div>{PADDING}</html>'
+NO_MATCHES = f"<html><h3>No exact matches found</h3>{PADDING}</html>"
+
+
+class TestClassifyPage:
+    """Tests for classify_page."""
+
+    def test_classes(self):
+        assert classify_page(RESULTS, SEARCH_URL) == "results"
+        assert classify_page(BLOCKED, SEARCH_URL) == "blocked"
+        assert classify_page(CAPTCHA, SEARCH_URL) == "captcha"
+        assert classify_page(NO_MATCHES, SEARCH_URL) == "empty"
+        assert classify_page(f"<html>{PADDING}</html>", SEARCH_URL) == "unrecognized"
+        assert classify_page(f"<html>{PADDING}</html>", "https://www.ebay.com/itm/1") == "ok"
+        assert classify_page("<html><body>", SEARCH_URL) == "truncated"
+        assert classify_page("", SEARCH_URL) == "truncated"
+
+    def test_route_key(self):
+        assert route_key(SEARCH_URL) == "www.ebay.com/sch"
+        assert route_key("https://www.ebay.com/itm/123") == "www.ebay.com/itm"
+
+
+class TestTieredFetcher:
+    """Tests for TieredFetcher escalation."""
+
+    @pytest.mark.asyncio
+    async def test_http_results_skip_browser(self):
+        http, browser = AsyncMock(return_value=RESULTS), AsyncMock()
+        fetcher = TieredFetcher(http_fetch=http, browser_fetch=browser, http_enabled=True)
+
+        assert await fetcher.fetch(SEARCH_URL) == RESULTS
+        browser.assert_not_awaited()
+        assert fetcher.get_stats()["tiers"]["http"]["success_rate"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_block_escalates_and_cools_down_route(self):
+        http, browser = AsyncMock(return_value=BLOCKED), AsyncMock(return_value=RESULTS)
+        fetcher = TieredFetcher(http_fetch=http, browser_fetch=browser, cooldown=600, http_enabled=True)
+
+        assert await fetcher.fetch(SEARCH_URL) == RESULTS
+        assert await fetcher.fetch(build_ebay_url("Aetherion", sold_only=True)) == RESULTS
+        # Second search skipped HTTP entirely (route cooling down)
+        assert http.await_count == 1
+        assert browser.await_count == 2
+        # Other routes still use HTTP
+        http.return_value = f"<html>{PADDING}</html>"
+        await fetcher.fetch("https://www.ebay.com/itm/123")
+        assert http.await_count == 2
+
+        stats = fetcher.get_stats()
+        assert stats["escalations"] == 1
+        assert "www.ebay.com/sch" in stats["blocked_routes"]
+        assert stats["tiers"]["http"]["outcomes"]["blocked"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unrecognized_page_escalates_without_cooldown(self):
+        http = AsyncMock(return_value=f"<html>{PADDING}</html>")
+        browser = AsyncMock(return_value=RESULTS)
+        fetcher = TieredFetcher(http_fetch=http, browser_fetch=browser, http_enabled=True)
+
+        await fetcher.fetch(SEARCH_URL)
+        await fetcher.fetch(SEARCH_URL)
+        assert http.await_count == 2
+        assert fetcher.get_stats()["blocked_routes"] == {}
+
+    @pytest.mark.asyncio
+    async def test_truncated_page_escalates_without_cooldown(self):
+        http = AsyncMock(return_value="<html><body>")
+        browser = AsyncMock(return_value=RESULTS)
+        fetcher = TieredFetcher(http_fetch=http, browser_fetch=browser, http_enabled=True)
+
+        assert await fetcher.fetch(SEARCH_URL) == RESULTS
+        browser.assert_awaited_once()
+        assert fetcher.get_stats()["blocked_routes"] == {}
+
+    @pytest.mark.asyncio
+    async def test_http_error_escalates(self):
+        http = AsyncMock(side_effect=Exception("403 Forbidden"))
+        browser = AsyncMock(return_value=RESULTS)
+        fetcher = TieredFetcher(http_fetch=http, browser_fetch=browser, http_enabled=True)
+
+        assert await fetcher.fetch(SEARCH_URL) == RESULTS
+        assert fetcher.get_stats()["tiers"]["http"]["outcomes"] == {"Exception": 1}
+
+    @pytest.mark.asyncio
+    async def test_http_tier_disabled(self):
+        http, browser = AsyncMock(), AsyncMock(return_value=RESULTS)
+        fetcher = TieredFetcher(http_fetch=http, browser_fetch=browser, http_enabled=False)
+
+        await fetcher.fetch(SEARCH_URL)
+        http.assert_not_awaited()
+
+
+class TestHttpTier:
+    """Tests for the default HTTP tier (simple_http.get_page_simple)."""
+
+    def _client(self, html):
+        client = MagicMock()
+        client.get = AsyncMock(return_value=SimpleNamespace(text=html, raise_for_status=lambda: None))
+        return client
+
+    @pytest.mark.asyncio
+    async def test_unrecognized_page_is_not_cached_for_the_browser(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        pacer = MagicMock(wait=AsyncMock(return_value=0.0))
+        browser = AsyncMock(return_value=RESULTS)
+        fetcher = TieredFetcher(browser_fetch=browser, http_enabled=True)
+
+        with (
+            patch("app.scraper.simple_http.page_cache", cache),
+            patch("app.scraper.simple_http.domain_pacer", pacer),
+            patch("app.scraper.simple_http.get_http_client", return_value=self._client(f"<html>{PADDING}</html>")),
+        ):
+            assert await fetcher.fetch(SEARCH_URL) == RESULTS
+
+        # The browser tier must not be handed the HTTP page from the cache
+        assert cache.get(SEARCH_URL) is None
+        browser.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_http_requests_use_the_domain_pacer(self, tmp_path):
+        pacer = MagicMock(wait=AsyncMock(return_value=0.0))
+        client = self._client(RESULTS)
+        fetcher = TieredFetcher(browser_fetch=AsyncMock(), http_enabled=True)
+
+        with (
+            patch("app.scraper.simple_http.page_cache", PageCache(str(tmp_path), mode="off")),
+            patch("app.scraper.simple_http.domain_pacer", pacer),
+            patch("app.scraper.simple_http.get_http_client", return_value=client),
+        ):
+            assert await fetcher.fetch(SEARCH_URL) == RESULTS
+
+        pacer.wait.assert_awaited_once_with(SEARCH_URL)
+        client.get.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_escalation_is_paced_once(self, tmp_path):
+        pacer = DomainPacer(min_interval=10, jitter=0)
+        waits = []
+
+        async def browser(url):
+            waits.append(await pacer.wait(url))
+            return RESULTS
+
+        fetcher = TieredFetcher(browser_fetch=browser, http_enabled=True)
+
+        with (
+            patch("app.scraper.simple_http.page_cache", PageCache(str(tmp_path), mode="off")),
+            patch("app.scraper.simple_http.domain_pacer", pacer),
+            patch("app.scraper.fetcher.domain_pacer", pacer),
+            patch("app.scraper.simple_http.get_http_client", return_value=self._client(f"<html>{PADDING}</html>")),
+        ):
+            assert await asyncio.wait_for(fetcher.fetch(SEARCH_URL), timeout=1) == RESULTS
+
+        assert waits == [0.0]
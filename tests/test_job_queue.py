@@ -0,0 +1,145 @@
+"""
+Tests for the scrape job queue.
+
+Tests cover:
+- Enqueue deduplication of active jobs
+- Leasing order, lease expiry takeover, attempt counting
+- Heartbeats, completion and lost leases
+- Retry backoff and giving up after max_attempts
+
+SQLite ignores FOR UPDATE SKIP LOCKED; row locking itself is Postgres behavior.
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from sqlmodel import select
+
+from app.core import job_queue
+from app.models.scrape_job import ScrapeJob
+
+
+class TestEnqueue:
+    """Tests for enqueue/enqueue_cards."""
+
+    def test_dedupes_active_jobs(self, test_session, sample_cards):
+        first = job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id)
+        second = job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id)
+
+        assert first is not None
+        assert first.dedupe_key == f"market:{sample_cards[0].id}"
+        assert second is None
+
+    def test_requeue_after_done(self, test_session, sample_cards):
+        job = job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id)
+        job_queue.lease(test_session, "w1")
+        job_queue.complete(test_session, job.id, "w1")
+
+        assert job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id) is not None
+
+    def test_kinds_do_not_collide(self, test_session, sample_cards):
+        card_id = sample_cards[0].id
+        assert job_queue.enqueue(test_session, job_queue.MARKET, card_id=card_id)
+        assert job_queue.enqueue(test_session, job_queue.BACKFILL, card_id=card_id)
+
+    def test_enqueue_cards_priority_follows_order(self, test_session, sample_cards):
+        ids = [card.id for card in sample_cards]
+        assert job_queue.enqueue_cards(test_session, job_queue.MARKET, ids) == len(ids)
+
+        leased = job_queue.lease(test_session, "w1", limit=len(ids))
+        assert [job.card_id for job in leased] == ids
+
+    def test_enqueue_cards_skips_active_jobs_in_one_commit(self, test_session, sample_cards):
+        ids = [card.id for card in sample_cards]
+        job_queue.enqueue(test_session, job_queue.MARKET, card_id=ids[0])
+
+        with patch.object(test_session, "commit", wraps=test_session.commit) as commit:
+            added = job_queue.enqueue_cards(test_session, job_queue.MARKET, ids + [ids[1]], payload={"x": 1})
+
+        assert added == len(ids) - 1
+        commit.assert_called_once()
+        jobs = test_session.exec(select(ScrapeJob).where(ScrapeJob.kind == job_queue.MARKET)).all()
+        assert sorted(job.card_id for job in jobs) == sorted(ids)
+        assert all(job.status == job_queue.QUEUED and job.max_attempts == 3 for job in jobs)
+
+
+class TestLease:
+    """Tests for lease/heartbeat/complete/fail."""
+
+    def test_lease_marks_and_counts_attempt(self, test_session, sample_cards):
+        job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id)
+
+        (job,) = job_queue.lease(test_session, "w1", timeout=60)
+
+        assert job.status == job_queue.LEASED
+        assert job.leased_by == "w1"
+        assert job.attempts == 1
+        assert job_queue.lease(test_session, "w2") == []
+
+    def test_filters_by_kind(self, test_session, sample_cards):
+        job_queue.enqueue(test_session, job_queue.BACKFILL, card_id=sample_cards[0].id)
+        assert job_queue.lease(test_session, "w1", kinds=[job_queue.MARKET]) == []
+        assert len(job_queue.lease(test_session, "w1", kinds=[job_queue.BACKFILL])) == 1
+
+    def test_expired_lease_taken_over(self, test_session, sample_cards):
+        job = job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id)
+        job_queue.lease(test_session, "w1", timeout=60)
+
+        later = datetime.utcnow() + timedelta(seconds=120)
+        (taken,) = job_queue.lease(test_session, "w2", timeout=60, now=later)
+
+        assert taken.id == job.id
+        assert taken.leased_by == "w2"
+        assert taken.attempts == 2
+        # The first worker's result is no longer recorded
+        assert job_queue.complete(test_session, job.id, "w1") is False
+        assert job_queue.heartbeat(test_session, [job.id], "w1") == [job.id]
+
+    def test_expired_last_attempt_fails(self, test_session, sample_cards):
+        job = job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id, max_attempts=1)
+        job_queue.lease(test_session, "w1", timeout=60)
+
+        later = datetime.utcnow() + timedelta(seconds=120)
+        assert job_queue.lease(test_session, "w2", now=later) == []
+
+        test_session.refresh(job)
+        assert job.status == job_queue.FAILED
+        assert "lease expired" in job.last_error
+
+    def test_heartbeat_extends_lease(self, test_session, sample_cards):
+        job = job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id)
+        (leased,) = job_queue.lease(test_session, "w1", timeout=1)
+        before = leased.lease_expires_at
+
+        assert job_queue.heartbeat(test_session, [job.id], "w1", timeout=600) == []
+
+        test_session.refresh(leased)
+        assert leased.lease_expires_at > before
+
+    def test_fail_requeues_with_backoff(self, test_session, sample_cards):
+        job = job_queue.enqueue(test_session, job_queue.MARKET, card_id=sample_cards[0].id, max_attempts=2)
+        job_queue.lease(test_session, "w1")
+
+        assert job_queue.fail(test_session, job.id, "w1", "blocked")
+
+        test_session.refresh(job)
+        assert job.status == job_queue.QUEUED
+        assert job.available_at > datetime.utcnow()
+        assert job_queue.lease(test_session, "w1") == []
+
+        job_queue.lease(test_session, "w1", now=job.available_at + timedelta(seconds=1))
+        job_queue.fail(test_session, job.id, "w1", "blocked again")
+
+        test_session.refresh(job)
+        assert job.status == job_queue.FAILED
+        assert job.last_error == "blocked again"
+
+    def test_queue_stats(self, test_session, sample_cards):
+        for card in sample_cards[:3]:
+            job_queue.enqueue(test_session, job_queue.MARKET, card_id=card.id)
+        (job,) = job_queue.lease(test_session, "w1")
+        job_queue.complete(test_session, job.id, "w1")
+
+        stats = job_queue.queue_stats(test_session)
+        assert stats == {"queued": 2, "leased": 0, "done": 1, "failed": 0}
+        assert test_session.get(ScrapeJob, job.id).finished_at is not None
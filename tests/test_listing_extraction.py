@@ -805,3 +805,51 @@ class TestCardNameNormalization:
         from scripts.cleanup_listing_data import SPELLING_CORRECTIONS, apply_spelling_corrections
         result = apply_spelling_corrections(typo)
         assert correction.lower() in result.lower(), f"Expected '{correction}' for '{typo}', got '{result}'"
+
+
+class TestTitleFeatures:
+    """Tests for the one-pass TitleFeatures extractor behind the _detect_* helpers."""
+
+    @pytest.mark.parametrize("title,product_type", [
+        ("Wonders of the First Progo Stonefoil PSA 10", "Single"),
+        ("2x Wonders of the First Zeltona Classic Foil #A2-361/401", "Single"),
+        ("Wonders of the First Existence Play Bundle Blaster Box 6 Booster Packs", "Pack"),
+        ("3 Wonders of the First Collector Booster Box Factory Sealed", "Box"),
+        ("WOTF Serialized Advantage Opened", "Bundle"),
+        ("Wonders of the First Bulk Lot of 50 Commons", "Lot"),
+        ("Carbon-X7 Synthforge TAG SLAB", "Single"),
+    ])
+    def test_matches_individual_detectors(self, title, product_type):
+        """Every attribute agrees with the standalone detector for the same title."""
+        from app.scraper.title_features import extract_title_features
+
+        features = extract_title_features(title, product_type)
+        assert features.treatment == _detect_treatment(title, product_type)
+        assert features.product_subtype == _detect_product_subtype(title, product_type)
+        assert features.grading == _detect_grading(title)
+        assert features.quantity == _detect_quantity(title, product_type)
+        assert features.bundle_pack_count == _detect_bundle_pack_count(title)
+
+    def test_memoized_by_normalized_title(self):
+        """Titles differing only in case share one cached result."""
+        from app.scraper.title_features import clear_title_features_cache, extract_title_features
+
+        clear_title_features_cache()
+        first = extract_title_features("Wonders of the First Progo CLASSIC FOIL")
+        second = extract_title_features("wonders of the first progo classic foil")
+        assert first is second
+        assert first.treatment == "Classic Foil"
+
+    def test_product_type_is_part_of_cache_key(self):
+        """Same title classified differently for singles and sealed products."""
+        from app.scraper.title_features import extract_title_features
+
+        title = "Wonders of the First Collector Booster Box New"
+        assert extract_title_features(title, "Single").treatment == "Classic Paper"
+        assert extract_title_features(title, "Box").treatment == "Sealed"
+
+    def test_clean_title_text_strips_junk(self):
+        """Junk eBay phrases are removed case-insensitively."""
+        from app.scraper.title_features import clean_title_text
+
+        assert clean_title_text("New Listing Progo Foil Opens in a new window or tab") == "Progo Foil"
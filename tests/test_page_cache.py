@@ -0,0 +1,117 @@
+"""
+Tests for the on-disk HTML page cache.
+
+Tests cover:
+- URL normalization and listing-type TTL selection
+- Store/serve round trip, TTL expiry, replay mode
+- Bot-check and unrecognized pages are never cached
+"""
+
+import os
+import time
+
+import pytest
+
+from app.scraper.page_cache import PageCache, PageCacheMiss, listing_type_for_url, normalize_url
+from app.scraper.utils import build_ebay_url
+
+HTML = "<html><body>" + "<li class='s-item'>listing</li>" * 20 + "</body></html>"
+
+
+class TestNormalizeUrl:
+    """Tests for cache key normalization."""
+
+    def test_query_order_and_tracking_params_ignored(self):
+        a = "https://www.ebay.com/sch/i.html?_nkw=progo&LH_Sold=1&_trksid=abc#frag"
+        b = "HTTPS://WWW.EBAY.COM/sch/i.html?LH_Sold=1&_nkw=progo"
+        assert normalize_url(a) == normalize_url(b)
+
+    def test_item_slug_dropped(self):
+        assert normalize_url("https://www.ebay.com/itm/progo-foil/123456") == normalize_url(
+            "https://www.ebay.com/itm/123456?hash=x"
+        )
+
+    def test_listing_types(self):
+        assert listing_type_for_url(build_ebay_url("Progo", sold_only=True)) == "sold"
+        assert listing_type_for_url(build_ebay_url("Progo", sold_only=False)) == "active"
+        assert listing_type_for_url("https://www.ebay.com/itm/123456") == "item"
+        assert listing_type_for_url("https://opensea.io/collection/wotf") == "other"
+
+
+class TestPageCache:
+    """Tests for PageCache get/put/prune."""
+
+    def test_round_trip(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        url = build_ebay_url("Progo", sold_only=True)
+
+        assert cache.get(url) is None
+        assert cache.put(url, HTML)
+        assert cache.get(url + "&_trksid=p123") == HTML
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.stores) == (1, 1, 1)
+
+    def test_ttl_per_listing_type(self, tmp_path):
+        cache = PageCache(str(tmp_path), ttls={"active": 0})
+        sold_url = build_ebay_url("Progo", sold_only=True)
+        active_url = build_ebay_url("Progo", sold_only=False)
+        cache.put(sold_url, HTML)
+        cache.put(active_url, HTML)
+        time.sleep(0.01)
+
+        assert cache.get(sold_url) == HTML
+        assert cache.get(active_url) is None
+        assert cache.stats.expired == 1
+
+    def test_replay_serves_stale_and_raises_on_miss(self, tmp_path):
+        url = build_ebay_url("Progo", sold_only=False)
+        PageCache(str(tmp_path), ttls={"active": 0}).put(url, HTML)
+        time.sleep(0.01)
+
+        replay = PageCache(str(tmp_path), mode="replay")
+        assert replay.get(url) == HTML
+        with pytest.raises(PageCacheMiss):
+            replay.get(build_ebay_url("Aetherion", sold_only=False))
+        # Replay never writes
+        assert replay.put(url, HTML) is False
+
+    def test_off_mode_bypasses_cache(self, tmp_path):
+        cache = PageCache(str(tmp_path), mode="off")
+        url = build_ebay_url("Progo")
+        assert cache.put(url, HTML) is False
+        assert cache.get(url) is None
+
+    def test_block_pages_not_cached(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        assert cache.put(build_ebay_url("Progo"), "<title>Pardon Our Interruption...</title>") is False
+
+    def test_unrecognized_pages_not_cached(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        url = build_ebay_url("Progo")
+        assert cache.put(url, "<html><div>" + "x" * 200 + "</div></html>") is False
+        assert cache.get(url) is None
+
+    def test_truncated_pages_not_cached(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        url = build_ebay_url("Progo")
+        assert cache.put(url, "<html><body><div class=") is False
+        assert cache.get(url) is None
+
+    def test_corrupt_entry_dropped(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        url = build_ebay_url("Progo")
+        cache.put(url, HTML)
+        with open(cache._path(url), "wb") as f:
+            f.write(b"not gzip")
+
+        assert cache.get(url) is None
+        assert not os.path.exists(cache._path(url))
+
+    def test_prune(self, tmp_path):
+        cache = PageCache(str(tmp_path))
+        url = build_ebay_url("Progo")
+        cache.put(url, HTML)
+        old = time.time() - 3600
+        os.utime(cache._path(url), (old, old))
+
+        assert cache.prune(max_age=60) == 1
+        assert cache.get(url) is None
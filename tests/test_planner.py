@@ -0,0 +1,141 @@
+"""
+Tests for the scrape cycle fetch planner.
+
+Tests cover:
+- Query list construction shared with scrape_card
+- Deduplication of identical searches across cards
+- One fetch per URL, routed to every requesting card
+- Failure handling and page release
+- A timed out card does not cancel a fetch other cards wait on
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.scraper.planner import ScrapePlanner, card_fetch_urls
+from app.scraper.utils import build_ebay_url, build_search_queries
+
+
+def _card(card_id, name, product_type="Single"):
+    return SimpleNamespace(id=card_id, name=name, set_name="Existence", product_type=product_type)
+
+
+class TestBuildSearchQueries:
+    """Tests for the per-card query list."""
+
+    def test_single_card_queries(self):
+        assert build_search_queries("Progo") == [
+            "Wonders of the First Progo",
+            "Wonders of the First Existence Progo",
+        ]
+
+    def test_lot_queries_are_generic(self):
+        queries = build_search_queries("Mixed Lot", product_type="Lot")
+        assert "Wonders of the First Lot" in queries
+        assert "Wonders Existence Lot" in queries
+
+    def test_no_double_prefix_and_dedup(self):
+        queries = build_search_queries("Wonders of the First Booster Pack", product_type="Pack")
+        assert queries == ["Wonders of the First Booster Pack"]
+
+
+class TestScrapePlanner:
+    """Tests for ScrapePlanner.plan and ScrapePlanner.fetch."""
+
+    def test_plan_dedupes_shared_searches(self):
+        planner = ScrapePlanner()
+        consumers = planner.plan([_card(1, "Lot A", "Lot"), _card(2, "Lot B", "Lot")], max_pages=1)
+
+        shared = planner.shared_urls()
+        assert build_ebay_url("Wonders of the First Bulk", sold_only=True, page=1) in shared
+        assert consumers[build_ebay_url("Wonders of the First Lot A", sold_only=True, page=1)] == {1}
+        assert planner.stats.unique_planned < planner.stats.planned
+
+    def test_card_fetch_urls_include_active_search(self):
+        urls = card_fetch_urls("Progo", search_term="Progo Existence", max_pages=2)
+        assert build_ebay_url("Wonders of the First Progo", sold_only=False) in urls
+        assert build_ebay_url("Progo Existence", sold_only=False) in urls
+        assert build_ebay_url("Wonders of the First Progo", sold_only=True, page=2) in urls
+
+    @pytest.mark.asyncio
+    async def test_shared_url_fetched_once(self):
+        calls = []
+
+        async def fetcher(url):
+            calls.append(url)
+            await asyncio.sleep(0)
+            return f"<html>{url}</html>"
+
+        planner = ScrapePlanner(fetcher=fetcher)
+        planner.plan([_card(1, "Lot A", "Lot"), _card(2, "Lot B", "Lot")], max_pages=1)
+        url = build_ebay_url("Wonders of the First Lot", sold_only=True, page=1)
+
+        # Concurrent and later requests both reuse the first fetch
+        first, second = await asyncio.gather(planner.fetch(url), planner.fetch(url))
+        assert first == second == f"<html>{url}</html>"
+        assert calls == [url]
+        assert planner.stats.shared == 1
+
+        # Every planned consumer has read the page - it's released
+        assert url not in planner._pages
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_is_retried(self):
+        attempts = []
+
+        async def fetcher(url):
+            attempts.append(url)
+            if len(attempts) == 1:
+                raise RuntimeError("browser crashed")
+            return "<html></html>"
+
+        planner = ScrapePlanner(fetcher=fetcher)
+        with pytest.raises(RuntimeError):
+            await planner.fetch("https://www.ebay.com/sch/i.html?_nkw=x")
+        assert await planner.fetch("https://www.ebay.com/sch/i.html?_nkw=x") == "<html></html>"
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_timed_out_consumer_does_not_cancel_shared_fetch(self):
+        calls = []
+
+        async def fetcher(url):
+            calls.append(url)
+            await asyncio.sleep(0.05)
+            return "<html></html>"
+
+        planner = ScrapePlanner(fetcher=fetcher)
+        planner.plan([_card(1, "Lot A", "Lot"), _card(2, "Lot B", "Lot"), _card(3, "Lot C", "Lot")], max_pages=1)
+        url = build_ebay_url("Wonders of the First Lot", sold_only=True, page=1)
+
+        # Card 1 hits its timeout while card 2 still waits on the same fetch
+        results = await asyncio.gather(
+            asyncio.wait_for(planner.fetch(url), timeout=0.01),
+            planner.fetch(url),
+            return_exceptions=True,
+        )
+        assert isinstance(results[0], asyncio.TimeoutError)
+        assert results[1] == "<html></html>"
+
+        # Later cards still get the page from the same fetch
+        assert await planner.fetch(url) == "<html></html>"
+        assert calls == [url]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_fetch_is_retried(self):
+        attempts = []
+
+        async def fetcher(url):
+            attempts.append(url)
+            if len(attempts) == 1:
+                raise asyncio.CancelledError()
+            return "<html></html>"
+
+        planner = ScrapePlanner(fetcher=fetcher)
+        url = "https://www.ebay.com/sch/i.html?_nkw=x"
+        with pytest.raises(asyncio.CancelledError):
+            await planner.fetch(url)
+        assert await planner.fetch(url) == "<html></html>"
+        assert len(attempts) == 2
@@ -0,0 +1,124 @@
+"""
+Tests for priority-scored scrape scheduling.
+
+Tests cover:
+- Score: never-scraped first, min refresh interval, demand multiplies staleness
+- Page budget: shared URLs paid once, oversized cards skipped
+- Signal loading and selection against the test database
+"""
+
+import math
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from app.core.priority import (
+    CardSignals,
+    PriorityWeights,
+    load_card_signals,
+    pick_within_budget,
+    priority_score,
+    select_cards_for_cycle,
+)
+from app.models.market import MarketPrice, MarketSnapshot
+from app.models.watchlist import Watchlist
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+def _card(card_id, name, product_type="Single"):
+    return SimpleNamespace(id=card_id, name=name, set_name="Existence", product_type=product_type)
+
+
+class TestPriorityScore:
+    """Tests for priority_score."""
+
+    def test_never_scraped_is_infinite(self):
+        assert priority_score(CardSignals(card_id=1), NOW) == math.inf
+
+    def test_recently_refreshed_is_zero(self):
+        signals = CardSignals(card_id=1, last_snapshot=NOW - timedelta(minutes=10), sold_recent=100)
+        assert priority_score(signals, NOW, PriorityWeights(min_refresh_minutes=30)) == 0.0
+
+    def test_idle_card_scores_its_age(self):
+        signals = CardSignals(card_id=1, last_snapshot=NOW - timedelta(hours=5))
+        assert priority_score(signals, NOW) == 5.0
+
+    def test_demand_beats_staleness(self):
+        hot = CardSignals(card_id=1, last_snapshot=NOW - timedelta(hours=2), sold_recent=140, interest=6)
+        cold = CardSignals(card_id=2, last_snapshot=NOW - timedelta(hours=8))
+        assert priority_score(hot, NOW) > priority_score(cold, NOW)
+
+    def test_weights_scale_signals(self):
+        signals = CardSignals(card_id=1, last_snapshot=NOW - timedelta(hours=1), interest=3)
+        no_interest = PriorityWeights(interest=0.0)
+        assert priority_score(signals, NOW, no_interest) == 1.0
+        assert priority_score(signals, NOW) > 1.0
+
+
+class TestPickWithinBudget:
+    """Tests for pick_within_budget."""
+
+    def test_stops_at_budget(self):
+        ranked = [(10.0 - i, _card(i, f"Card {i}")) for i in range(5)]
+        # Each single card plans 2 queries x 3 pages + 2 active searches = 8 URLs
+        picked = pick_within_budget(ranked, page_budget=16)
+        assert [c.id for c in picked] == [0, 1]
+
+    def test_shared_urls_paid_once(self):
+        ranked = [(3.0, _card(1, "Progo")), (2.0, _card(2, "Progo")), (1.0, _card(3, "Other"))]
+        picked = pick_within_budget(ranked, page_budget=16)
+        assert [c.id for c in picked] == [1, 2, 3]
+
+    def test_zero_scores_not_picked(self):
+        ranked = [(5.0, _card(1, "A")), (0.0, _card(2, "B"))]
+        assert [c.id for c in pick_within_budget(ranked, page_budget=100)] == [1]
+
+    def test_top_card_always_taken(self):
+        assert len(pick_within_budget([(1.0, _card(1, "A"))], page_budget=1)) == 1
+
+
+class TestSelectCardsForCycle:
+    """Tests for the database-backed selection."""
+
+    def test_load_card_signals(self, test_session, sample_cards, sample_user):
+        card = sample_cards[0]
+        test_session.add(MarketSnapshot(card_id=card.id, min_price=1, max_price=2, avg_price=1.5, timestamp=NOW))
+        test_session.add(
+            MarketPrice(card_id=card.id, price=1.0, title="sold", listing_type="sold", sold_date=NOW - timedelta(days=1))
+        )
+        test_session.add(
+            MarketPrice(card_id=card.id, price=1.0, title="old", listing_type="sold", sold_date=NOW - timedelta(days=30))
+        )
+        test_session.add(
+            MarketPrice(card_id=card.id, price=2.0, title="ask", listing_type="active", listed_at=NOW - timedelta(hours=3))
+        )
+        test_session.add(Watchlist(user_id=sample_user.id, card_id=card.id))
+        test_session.commit()
+
+        signals = load_card_signals(test_session, NOW)[card.id]
+
+        assert signals.last_snapshot == NOW
+        assert signals.sold_recent == 1
+        assert signals.active_churn == 1
+        assert signals.interest == 1
+
+    def test_prefers_traded_and_watched_cards(self, test_session, sample_cards, sample_user):
+        for card in sample_cards:
+            test_session.add(
+                MarketSnapshot(
+                    card_id=card.id, min_price=1, max_price=2, avg_price=1.5, timestamp=NOW - timedelta(hours=3)
+                )
+            )
+        busy = sample_cards[1]
+        for day in range(20):
+            test_session.add(
+                MarketPrice(
+                    card_id=busy.id, price=5.0, title="sale", listing_type="sold", sold_date=NOW - timedelta(hours=day)
+                )
+            )
+        test_session.add(Watchlist(user_id=sample_user.id, card_id=busy.id))
+        test_session.commit()
+
+        picked = select_cards_for_cycle(test_session, page_budget=8, now=NOW, weights=PriorityWeights())
+
+        assert [c.id for c in picked] == [busy.id]
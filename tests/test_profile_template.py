@@ -0,0 +1,67 @@
+"""
+Tests for the warm Chrome profile template.
+
+Tests cover:
+- Snapshotting a profile (caches and lock files excluded)
+- Cloning the template into a fresh profile directory
+- Cold start fallback when there is no template or it is disabled
+"""
+
+import os
+
+import pytest
+
+from app.scraper.profile_template import TEMPLATE_MARKER, clone_profile, save_template, template_ready
+
+
+@pytest.fixture
+def profile(tmp_path):
+    """A stopped-browser profile with cookies, a cache and a stale lock."""
+    profile = tmp_path / "profile"
+    (profile / "Default" / "Cache").mkdir(parents=True)
+    (profile / "Default" / "Cookies").write_text("ebay cookies")
+    (profile / "Default" / "Cache" / "data_0").write_text("x" * 1000)
+    (profile / "First Run").write_text("")
+    os.symlink("host-1234", profile / "SingletonLock")
+    return profile
+
+
+class TestProfileTemplate:
+    """Tests for save_template / clone_profile."""
+
+    def test_no_template_starts_cold(self, tmp_path):
+        assert clone_profile(str(tmp_path / "dest"), template=str(tmp_path / "missing")) is False
+        assert not (tmp_path / "dest").exists()
+
+    def test_snapshot_and_clone(self, tmp_path, profile):
+        template = str(tmp_path / "template")
+        assert save_template(str(profile), template=template) is True
+        assert template_ready(template)
+        assert not os.path.exists(os.path.join(template, "Default", "Cache"))
+        assert not os.path.lexists(os.path.join(template, "SingletonLock"))
+
+        dest = tmp_path / "dest"
+        (dest / "stale").mkdir(parents=True)
+        assert clone_profile(str(dest), template=template) is True
+        assert (dest / "Default" / "Cookies").read_text() == "ebay cookies"
+        assert (dest / "First Run").exists()
+        assert (dest / TEMPLATE_MARKER).exists()
+        # Previous contents of the profile dir are replaced
+        assert not (dest / "stale").exists()
+
+    def test_snapshot_replaces_previous_template(self, tmp_path, profile):
+        template = str(tmp_path / "template")
+        save_template(str(profile), template=template)
+        (profile / "Default" / "Cookies").write_text("newer cookies")
+        save_template(str(profile), template=template)
+
+        with open(os.path.join(template, "Default", "Cookies")) as f:
+            assert f.read() == "newer cookies"
+        assert sorted(os.listdir(tmp_path)) == ["profile", "template"]
+
+    def test_disabled(self, tmp_path, profile, monkeypatch):
+        template = str(tmp_path / "template")
+        save_template(str(profile), template=template)
+        monkeypatch.setenv("SCRAPER_WARM_PROFILE", "0")
+        assert clone_profile(str(tmp_path / "dest"), template=template) is False
+        assert save_template(str(profile), template=template) is False
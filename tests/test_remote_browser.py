@@ -0,0 +1,139 @@
+"""
+Tests for the remote browser-service pool.
+
+Tests cover:
+- WS endpoint resolution from browser-service's /ws-endpoint response
+- Least-loaded endpoint selection and per-endpoint page limits
+- Failover when an endpoint is unreachable or drops mid-page
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.scraper.remote_browser import RemoteBrowserPool, ws_url_from_info
+from app.scraper.resource_blocking import ResourceBlocker
+from app.scraper.tab_pool import DomainPacer
+
+HTML = '<html><ul><li class="s-item">Progo</li></ul>' + "x" * 200 + "</html>"
+
+
+def _browser(html=HTML):
+    page = MagicMock()
+    page.goto = AsyncMock()
+    page.evaluate = AsyncMock(return_value="results")
+    page.content = AsyncMock(return_value=html)
+    page.route = AsyncMock()
+    context = MagicMock()
+    context.new_page = AsyncMock(return_value=page)
+    context.close = AsyncMock()
+    browser = MagicMock()
+    browser.new_context = AsyncMock(return_value=context)
+    browser.is_connected = MagicMock(return_value=True)
+    browser.close = AsyncMock()
+    browser.page = page
+    return browser
+
+
+def _pool(browsers, **kwargs):
+    """Pool over fake endpoints; `browsers` maps service url -> browser (or exception)."""
+
+    async def resolve(url):
+        return url.replace("http://", "ws://")
+
+    async def connect(ws):
+        browser = browsers[ws.replace("ws://", "http://")]
+        if isinstance(browser, Exception):
+            raise browser
+        return browser
+
+    return RemoteBrowserPool(
+        service_urls=list(browsers),
+        pacer=DomainPacer(min_interval=0, jitter=0),
+        blocker=ResourceBlocker(enabled=False),
+        connect=connect,
+        resolve=resolve,
+        **kwargs,
+    )
+
+
+class TestRemoteBrowserPool:
+    """Tests for RemoteBrowserPool."""
+
+    def test_ws_url_uses_service_host(self):
+        info = {"wsEndpoint": "ws://0.0.0.0:3001/abc123", "wsPath": "/abc123", "wsPort": 3001}
+        assert ws_url_from_info("http://browser-service:3000", info) == "ws://browser-service:3001/abc123"
+
+    def test_disabled_without_urls(self, monkeypatch):
+        monkeypatch.delenv("BROWSER_SERVICE_URLS", raising=False)
+        assert not RemoteBrowserPool.from_env().enabled
+
+    @pytest.mark.asyncio
+    async def test_fetches_page(self):
+        browser = _browser()
+        pool = _pool({"http://a:3000": browser})
+
+        assert await pool.get_page_content("https://www.ebay.com/sch/i.html?_nkw=progo") == HTML
+        browser.page.goto.assert_awaited_once()
+        # Context is per page, closed after use
+        browser.new_context.return_value.close.assert_awaited_once()
+        assert pool.endpoints[0].in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_spreads_pages_and_respects_limit(self):
+        a, b = _browser(), _browser()
+        pool = _pool({"http://a:3000": a, "http://b:3000": b}, pages_per_endpoint=1)
+        await pool.start()
+        active, peak = 0, 0
+
+        async def use():
+            nonlocal active, peak
+            async with pool.page():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(use() for _ in range(4)))
+        assert peak == 2
+        assert a.new_context.await_count == 2
+        assert b.new_context.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_unreachable_endpoint_skipped(self):
+        good = _browser()
+        pool = _pool({"http://down:3000": ConnectionError("refused"), "http://up:3000": good})
+
+        assert await pool.start() == 1
+        await pool.get_page_content("https://www.ebay.com/itm/1")
+        good.page.goto.assert_awaited_once()
+        assert pool.get_stats()["endpoints"][0]["last_error"].startswith("ConnectionError")
+
+    @pytest.mark.asyncio
+    async def test_dropped_endpoint_fails_over(self):
+        dying = _browser()
+
+        async def drop_connection(*args, **kwargs):
+            dying.is_connected.return_value = False
+            raise Exception("Target closed")
+
+        dying.page.goto.side_effect = drop_connection
+        good = _browser()
+        pool = _pool({"http://a:3000": dying, "http://b:3000": good})
+        await pool.start()
+
+        # First lease goes to a (tie -> first); its socket drops, retry lands on b
+        with pytest.raises(Exception):
+            async with pool.page() as page:
+                await page.goto("https://www.ebay.com/itm/1")
+        assert not pool.endpoints[0].healthy
+
+        assert await pool.get_page_content("https://www.ebay.com/itm/1", retries=0) == HTML
+        good.page.goto.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_no_healthy_endpoints_raises(self):
+        pool = _pool({"http://a:3000": ConnectionError("refused")})
+        with pytest.raises(Exception, match="No healthy"):
+            await pool.start()
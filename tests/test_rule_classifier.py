@@ -0,0 +1,127 @@
+"""
+Tests for rule-first listing classification.
+
+Tests cover:
+- Evidence buckets / confidence of typical titles
+- Only ambiguous single-card titles are sent to the AI extractor
+- Offline rule vs AI agreement report
+"""
+
+from unittest.mock import MagicMock, patch
+
+from app.scraper.rule_classifier import CONFIDENCE, classify_title, evaluate_agreement
+
+
+class TestClassifyTitle:
+    """Tests for classify_title."""
+
+    def test_explicit_treatment_is_confident(self):
+        rule = classify_title("Wonders of the First Existence Progo Classic Foil 123/401")
+        assert (rule.treatment, rule.quantity, rule.evidence) == ("Classic Foil", 1, "explicit")
+        assert rule.confidence == CONFIDENCE["explicit"]
+
+    def test_explicit_quantity(self):
+        rule = classify_title("3x Wonders of the First Progo Stonefoil")
+        assert (rule.treatment, rule.quantity, rule.evidence) == ("Stonefoil", 3, "explicit_quantity")
+
+    def test_prerelease_promo_is_one_treatment(self):
+        assert classify_title("Wonders of the First Progo Prerelease Promo").evidence == "explicit"
+
+    def test_conflicting_keywords(self):
+        assert classify_title("Progo Classic Foil Classic Paper").evidence == "conflict"
+        # Rules read "foil", the title says non-foil
+        assert classify_title("Wonders of the First Progo Non-Foil").evidence == "conflict"
+
+    def test_wording_the_rules_cannot_interpret(self):
+        assert classify_title("Wonders of the First Progo Classic Foil Lot").evidence == "quantity_terms"
+        assert classify_title("Progo Classic Foil from Collector Booster Box").evidence == "sealed_terms"
+
+    def test_no_treatment_keyword(self):
+        assert classify_title("Wonders of the First Progo 123/401").evidence == "default_numbered"
+        assert classify_title("Wonders of the First Progo").evidence == "default_wotf"
+        assert classify_title("Progo card").evidence == "default"
+
+    def test_sealed_products_never_need_ai(self):
+        rule = classify_title("Wonders of the First Collector Booster Box", "Box")
+        assert (rule.treatment, rule.confidence) == ("Sealed", 1.0)
+
+
+class TestRuleFirstExtraction:
+    """Tests for rule-first extraction in the eBay parse pipeline."""
+
+    def test_only_ambiguous_titles_go_to_ai(self, monkeypatch):
+        from app.scraper.ebay import ListingRecord, _extract_batch
+
+        monkeypatch.setenv("AI_RULE_FIRST_CONFIDENCE", "0.85")
+        listings = [
+            ListingRecord(card_id=1, title="Wonders of the First Progo Classic Foil", price=10.0),
+            ListingRecord(card_id=1, title="Progo Classic Foil Classic Paper", price=10.0),
+            ListingRecord(card_id=1, title="Progo card", price=10.0),
+        ]
+        extractor = MagicMock()
+        extractor.extract_batch.side_effect = lambda inputs: [
+            {"treatment": "Classic Paper", "quantity": 1, "confidence": 0.9} for _ in inputs
+        ]
+        with patch("app.scraper.ebay.get_ai_extractor", return_value=extractor):
+            results = _extract_batch(listings, ["Single"] * 3)
+
+        sent = [item["title"] for item in extractor.extract_batch.call_args[0][0]]
+        assert sent == ["Progo Classic Foil Classic Paper", "Progo card"]
+        assert results[0]["method"] == "rule"
+        assert results[0]["treatment"] == "Classic Foil"
+        assert [result["treatment"] for result in results[1:]] == ["Classic Paper", "Classic Paper"]
+
+    def test_default_threshold_only_skips_sealed(self, monkeypatch):
+        from app.scraper.ebay import ListingRecord, _extract_batch
+
+        monkeypatch.delenv("AI_RULE_FIRST_CONFIDENCE", raising=False)
+        listings = [
+            ListingRecord(card_id=1, title="Wonders of the First Progo Classic Foil", price=10.0),
+            ListingRecord(card_id=2, title="Wonders of the First Collector Booster Box", price=90.0),
+        ]
+        extractor = MagicMock()
+        extractor.extract_batch.side_effect = lambda inputs: [
+            {"treatment": "Classic Foil", "quantity": 1, "confidence": 0.9} for _ in inputs
+        ]
+        with patch("app.scraper.ebay.get_ai_extractor", return_value=extractor):
+            results = _extract_batch(listings, ["Single", "Box"])
+
+        sent = [item["title"] for item in extractor.extract_batch.call_args[0][0]]
+        assert sent == ["Wonders of the First Progo Classic Foil"]
+        assert results[1]["method"] == "rule"
+
+    def test_rule_first_disabled(self, monkeypatch):
+        from app.scraper.ebay import ListingRecord, _extract_batch
+
+        monkeypatch.setenv("AI_RULE_FIRST", "0")
+        extractor = MagicMock()
+        extractor.extract_batch.return_value = [{"treatment": "Classic Foil", "quantity": 1, "confidence": 0.9}]
+        listing = ListingRecord(card_id=1, title="Wonders of the First Progo Classic Foil", price=1.0)
+        with patch("app.scraper.ebay.get_ai_extractor", return_value=extractor):
+            _extract_batch([listing], ["Single"])
+
+        assert extractor.extract_batch.call_count == 1
+
+
+class TestEvaluateAgreement:
+    """Tests for the offline rule vs AI agreement report."""
+
+    def test_report(self):
+        foil = {"treatment": "Classic Foil", "quantity": 1}
+        samples = [
+            ("Wonders of the First Progo Classic Foil", "Single", foil),
+            ("Wonders of the First Zeltona Classic Foil", "Single", {"treatment": "Stonefoil", "quantity": 1}),
+            ("Progo card", "Single", foil),
+            ("Wonders of the First Collector Booster Box", "Box", None),
+        ]
+
+        report = evaluate_agreement(samples, threshold=0.85)
+
+        assert report["titles"] == 4
+        assert report["ai_titles"] == 1  # only "Progo card"
+        assert report["rule_first_agreement"] == 0.5
+        assert report["buckets"]["explicit"] == {
+            "titles": 2, "compared": 2, "agree": 1, "confidence": 0.95, "agreement": 0.5,
+        }
+        assert report["buckets"]["sealed"]["agreement"] is None
+        assert report["buckets"]["default"]["agreement"] == 0.0
@@ -31,9 +31,25 @@ from app.core.scheduler import (
     job_update_blokpax_data,
     job_market_insights,
     start_scheduler,
+    run_scheduler,
+    scheduler_in_api,
 )
 from app.models.card import Card
 from app.models.market import MarketSnapshot
+from app.scraper.browser import BrowserManager
+from app.scraper.tab_pool import DomainPacer
+
+
+@pytest.fixture(autouse=True)
+def isolated_browser_pool():
+    """
+    Keep every test off the real tab pool and pacer: warm_tabs on a mocked browser
+    would leave mock tabs in the class-level pool for later tests to wait on.
+    """
+    with patch.object(BrowserManager, "warm_tabs", new_callable=AsyncMock), \
+         patch.object(BrowserManager, "_tab_pool", None), \
+         patch.object(BrowserManager, "pacer", DomainPacer(min_interval=0, jitter=0)):
+        yield
 
 
 class TestSchedulerInitialization:
@@ -284,6 +300,15 @@ class TestScrapeSingleCard:
 class TestJobUpdateMarketData:
     """Tests for job_update_market_data function."""
 
+    @pytest.fixture(autouse=True)
+    def cards_from_session(self):
+        """Cycle selection returns the mocked session's cards (ranking is covered in test_priority.py)."""
+        with patch(
+            'app.core.scheduler.select_cards_for_cycle',
+            side_effect=lambda session: session.exec(select(Card)).all(),
+        ) as mock_select:
+            yield mock_select
+
     @pytest.mark.asyncio
     async def test_updates_stale_cards(self):
         """Test that job updates cards with stale snapshots."""
@@ -295,8 +320,7 @@ class TestJobUpdateMarketData:
              patch('app.core.scheduler.BrowserManager.get_browser', new_callable=AsyncMock), \
              patch('app.core.scheduler.BrowserManager.close', new_callable=AsyncMock), \
              patch('app.core.scheduler.log_scrape_start'), \
-             patch('app.core.scheduler.log_scrape_complete'), \
-             patch('app.core.scheduler.asyncio.gather', new_callable=AsyncMock) as mock_gather:
+             patch('app.core.scheduler.log_scrape_complete'):
 
             # Mock session to return cards needing update
             mock_session = MagicMock()
@@ -304,19 +328,18 @@ class TestJobUpdateMarketData:
             mock_session.exec.return_value.all.return_value = [mock_card]
 
             mock_scrape.return_value = True
-            mock_gather.return_value = [True]
 
             await job_update_market_data()
 
             # Verify card was scraped
-            assert mock_scrape.call_count >= 1
+            mock_scrape.assert_called_once()
+            assert mock_scrape.call_args[0][0] is mock_card
 
     @pytest.mark.asyncio
-    async def test_updates_random_sample_when_no_stale_cards(self):
-        """Test that job updates random cards when none are stale."""
+    async def test_scrapes_only_prioritized_cards(self, cards_from_session):
+        """Test that job scrapes exactly the cards picked by select_cards_for_cycle."""
         mock_card1 = Mock(spec=Card, id=1, name="Card 1")
         mock_card2 = Mock(spec=Card, id=2, name="Card 2")
-        all_cards = [mock_card1, mock_card2]
 
         with patch('app.core.scheduler.Session') as mock_session_class, \
              patch('app.core.scheduler.engine'), \
@@ -324,22 +347,20 @@ class TestJobUpdateMarketData:
              patch('app.core.scheduler.BrowserManager.get_browser', new_callable=AsyncMock), \
              patch('app.core.scheduler.BrowserManager.close', new_callable=AsyncMock), \
              patch('app.core.scheduler.log_scrape_start'), \
-             patch('app.core.scheduler.log_scrape_complete'), \
-             patch('app.core.scheduler.random.sample') as mock_sample:
+             patch('app.core.scheduler.log_scrape_complete'):
 
             mock_session = MagicMock()
             mock_session_class.return_value.__enter__.return_value = mock_session
-
-            # First exec() returns no stale cards, second returns all cards
-            mock_session.exec.return_value.all.side_effect = [[], all_cards]
-            mock_sample.return_value = [mock_card1]
+            mock_session.exec.return_value.all.return_value = [mock_card1, mock_card2]
+            cards_from_session.side_effect = None
+            cards_from_session.return_value = [mock_card2]
             mock_scrape.return_value = True
 
             await job_update_market_data()
 
-            # Verify random sample was used
-            mock_sample.assert_called_once()
-            assert mock_scrape.call_count >= 1
+            cards_from_session.assert_called_once_with(mock_session)
+            assert mock_scrape.call_count == 1
+            assert mock_scrape.call_args[0][0] is mock_card2
 
     @pytest.mark.asyncio
     async def test_browser_retry_logic_success_on_retry(self):
@@ -397,9 +418,8 @@ class TestJobUpdateMarketData:
             mock_scrape.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_batch_processing_with_concurrency(self):
-        """Test that cards are processed in batches with proper concurrency."""
-        # Create 8 mock cards (should be 3 batches: 3, 3, 2)
+    async def test_worker_pool_processes_every_card(self):
+        """Test that every card is scraped once on the worker pool, without per-batch sleeps."""
         mock_cards = [Mock(spec=Card, id=i, name=f"Card {i}") for i in range(8)]
 
         with patch('app.core.scheduler.Session') as mock_session_class, \
@@ -409,55 +429,51 @@ class TestJobUpdateMarketData:
              patch('app.core.scheduler.BrowserManager.close', new_callable=AsyncMock), \
              patch('app.core.scheduler.log_scrape_start'), \
              patch('app.core.scheduler.log_scrape_complete'), \
-             patch('app.core.scheduler.asyncio.sleep', new_callable=AsyncMock) as mock_sleep, \
-             patch('app.core.scheduler.asyncio.gather', new_callable=AsyncMock) as mock_gather:
+             patch('app.core.scheduler.asyncio.sleep', new_callable=AsyncMock) as mock_sleep:
 
             mock_session = MagicMock()
             mock_session_class.return_value.__enter__.return_value = mock_session
             mock_session.exec.return_value.all.return_value = mock_cards
-
-            # Mock gather to return successful results
-            mock_gather.return_value = [True, True, True]
             mock_scrape.return_value = True
 
             await job_update_market_data()
 
-            # Should process in 3 batches
-            # gather should be called 3 times (once per batch)
-            assert mock_gather.call_count == 3
+            assert mock_scrape.call_count == 8
+            # No 5s barrier between batches
+            assert call(5) not in mock_sleep.call_args_list
 
     @pytest.mark.asyncio
     async def test_tracks_success_and_failure_counts(self):
         """Test that job correctly counts successful and failed scrapes."""
-        mock_cards = [Mock(spec=Card, id=i, name=f"Card {i}") for i in range(5)]
+        mock_cards = [Mock(spec=Card, id=i, name=f"Card {i}") for i in range(3)]
 
         with patch('app.core.scheduler.Session') as mock_session_class, \
              patch('app.core.scheduler.engine'), \
-             patch('app.core.scheduler.scrape_single_card', new_callable=AsyncMock), \
+             patch('app.core.scheduler.scrape_single_card', new_callable=AsyncMock) as mock_scrape, \
              patch('app.core.scheduler.BrowserManager.get_browser', new_callable=AsyncMock), \
              patch('app.core.scheduler.BrowserManager.close', new_callable=AsyncMock), \
              patch('app.core.scheduler.log_scrape_start'), \
              patch('app.core.scheduler.log_scrape_complete') as mock_log_complete, \
-             patch('app.core.scheduler.asyncio.sleep', new_callable=AsyncMock), \
-             patch('app.core.scheduler.asyncio.gather', new_callable=AsyncMock) as mock_gather:
+             patch('app.core.scheduler.asyncio.sleep', new_callable=AsyncMock):
 
             mock_session = MagicMock()
             mock_session_class.return_value.__enter__.return_value = mock_session
             mock_session.exec.return_value.all.return_value = mock_cards
 
-            # Mix of successes, failures, and exceptions
-            mock_gather.return_value = [
-                True,  # Success
-                False,  # Failure
-                Exception("Error"),  # Exception
-            ]
+            # Card 0 succeeds; card 1 returns False and card 2 raises on every attempt
+            async def scrape(card, fetch=None):
+                if card.id == 2:
+                    raise Exception("Error")
+                return card.id == 0
+
+            mock_scrape.side_effect = scrape
 
             await job_update_market_data()
 
             # Verify log_scrape_complete was called with error count
             mock_log_complete.assert_called_once()
             call_kwargs = mock_log_complete.call_args[1]
-            assert call_kwargs['errors'] > 0
+            assert call_kwargs['errors'] == 2
 
     @pytest.mark.asyncio
     async def test_handles_no_cards_to_update(self):
@@ -531,6 +547,69 @@ class TestJobUpdateMarketData:
             mock_log_error.assert_called_once()
 
 
+class TestRunScheduler:
+    """Tests for leader-elected scheduler startup (run_scheduler)."""
+
+    class FakeLock:
+        def __init__(self, grants):
+            self.grants = list(grants)  # try_acquire results, in order
+            self.held = False
+            self.released = False
+
+        def try_acquire(self):
+            self.held = self.grants.pop(0) if self.grants else self.held
+            return self.held
+
+        def check(self):
+            return self.held
+
+        def release(self):
+            self.released = True
+            self.held = False
+
+    @pytest.mark.asyncio
+    async def test_starts_scheduler_when_lock_acquired(self):
+        test_scheduler = MagicMock(running=False)
+        lock = self.FakeLock([True])
+        stopping = asyncio.Event()
+
+        with patch('app.core.scheduler.scheduler', test_scheduler), \
+             patch('app.core.scheduler.start_scheduler') as mock_start, \
+             patch('app.core.scheduler.env_number', return_value=0.01):
+            task = asyncio.create_task(run_scheduler(stopping, lock=lock))
+            await asyncio.sleep(0.05)
+            test_scheduler.running = True
+            stopping.set()
+            await task
+
+        mock_start.assert_called_once()
+        test_scheduler.shutdown.assert_called_once_with(wait=False)
+        assert lock.released
+
+    @pytest.mark.asyncio
+    async def test_standby_never_starts_scheduler(self):
+        test_scheduler = MagicMock(running=False)
+        lock = self.FakeLock([False, False, False])
+        stopping = asyncio.Event()
+
+        with patch('app.core.scheduler.scheduler', test_scheduler), \
+             patch('app.core.scheduler.start_scheduler') as mock_start, \
+             patch('app.core.scheduler.env_number', return_value=0.01):
+            task = asyncio.create_task(run_scheduler(stopping, lock=lock))
+            await asyncio.sleep(0.02)
+            stopping.set()
+            await task
+
+        mock_start.assert_not_called()
+        test_scheduler.shutdown.assert_not_called()
+
+    def test_scheduler_in_api_flag(self, monkeypatch):
+        monkeypatch.delenv("SCHEDULER_IN_API", raising=False)
+        assert scheduler_in_api() is True
+        monkeypatch.setenv("SCHEDULER_IN_API", "0")
+        assert scheduler_in_api() is False
+
+
 class TestJobUpdateBlokpaxData:
     """Tests for job_update_blokpax_data function."""
 
@@ -10,6 +10,7 @@ Tests cover:
 """
 
 import pytest
+from sqlmodel import select
 from app.scraper.ebay import (
     _is_valid_match,
     _detect_treatment,
@@ -1292,3 +1293,359 @@ class TestContaminationBlocklist:
         for title, card in legitimate:
             assert _is_valid_match(title, card) is True, \
                 f"Should NOT block legitimate WOTF: {title}"
+
+
+class TestParseSearchResultsTagged:
+    """Tests for single-pass sold page parsing with index tagging."""
+
+    HTML = """
+    <ul>
+      <li class="s-item">
+        <a class="s-item__link" href="https://www.ebay.com/itm/111?hash=x"></a>
+        <div class="s-item__title">Wonders of the First Progo Classic Foil</div>
+        <span class="s-item__price">$10.00</span>
+        <span class="s-item__caption">Sold Oct 4, 2025</span>
+      </li>
+      <li class="s-item">
+        <a class="s-item__link" href="https://www.ebay.com/itm/222"></a>
+        <div class="s-item__title">Wonders of the First Progo Stonefoil</div>
+        <span class="s-item__price">$25.00</span>
+        <span class="s-item__caption">Sold Oct 5, 2025</span>
+      </li>
+    </ul>
+    """
+
+    def _mock_extractor(self):
+        from unittest.mock import MagicMock
+
+        extractor = MagicMock()
+        extractor.extract_batch.side_effect = lambda listings: [
+            {"treatment": "Classic Foil", "quantity": 1, "confidence": 0.9} for _ in listings
+        ]
+        return extractor
+
+    def test_returns_all_listings_tagged_with_index_status(self):
+        """Every listing is returned once, flagged if it's already indexed."""
+        from unittest.mock import patch
+        from app.scraper.ebay import parse_search_results_tagged
+
+        extractor = self._mock_extractor()
+        # Rule-first off: every title goes to the (mocked) AI
+        with patch("app.scraper.ebay._bulk_check_indexed", return_value={0}) as mock_check, \
+             patch("app.scraper.ebay.get_ai_extractor", return_value=extractor), \
+             patch.dict("os.environ", {"AI_RULE_FIRST": "0"}):
+            tagged = parse_search_results_tagged(self.HTML, card_id=1, card_name="Progo")
+
+        assert [(listing.external_id, listing.is_indexed) for listing in tagged] == [("111", True), ("222", False)]
+        # One DB check and one AI call for the whole page
+        assert mock_check.call_count == 1
+        assert extractor.extract_batch.call_count == 1
+        assert len(extractor.extract_batch.call_args[0][0]) == 2
+
+    def test_return_all_false_still_drops_indexed(self):
+        """Legacy parse_search_results keeps only new listings when return_all=False."""
+        from unittest.mock import patch
+        from app.scraper.ebay import parse_search_results
+
+        extractor = self._mock_extractor()
+        with patch("app.scraper.ebay._bulk_check_indexed", return_value={0}), \
+             patch("app.scraper.ebay.get_ai_extractor", return_value=extractor), \
+             patch.dict("os.environ", {"AI_RULE_FIRST": "0"}):
+            results = parse_search_results(self.HTML, card_id=1, card_name="Progo", return_all=False)
+
+        assert [mp.external_id for mp in results] == ["222"]
+        assert len(extractor.extract_batch.call_args[0][0]) == 1
+
+
+class TestListingRecord:
+    """Tests for the lightweight ListingRecord used through the parse pipeline."""
+
+    def test_record_has_no_instance_dict(self):
+        """Records use __slots__ so per-listing memory stays small."""
+        from app.scraper.ebay import ListingRecord
+
+        record = ListingRecord(card_id=1, title="Progo", price=10.0)
+        assert not hasattr(record, "__dict__")
+
+    def test_to_market_price_copies_fields(self):
+        """Conversion to MarketPrice carries every classified field."""
+        from datetime import datetime
+        from app.models.market import MarketPrice
+        from app.scraper.ebay import ListingRecord
+
+        sold = datetime(2025, 10, 4)
+        record = ListingRecord(
+            card_id=7,
+            title="Wonders of the First Progo PSA 10",
+            price=42.5,
+            sold_date=sold,
+            treatment="Classic Foil",
+            quantity=2,
+            external_id="123",
+            grading="PSA 10",
+            seller_name="seller_1",
+            is_indexed=True,
+        )
+        mp = record.to_market_price()
+
+        assert isinstance(mp, MarketPrice)
+        assert (mp.card_id, mp.price, mp.quantity, mp.sold_date) == (7, 42.5, 2, sold)
+        assert (mp.treatment, mp.grading, mp.external_id, mp.seller_name) == ("Classic Foil", "PSA 10", "123", "seller_1")
+        assert mp.listing_type == "sold"
+        assert mp.platform == "ebay"
+
+    def test_parsed_listings_are_records(self):
+        """Parsing yields ListingRecords with per-unit price normalization applied."""
+        from unittest.mock import MagicMock, patch
+        from app.scraper.ebay import ListingRecord, parse_search_results
+
+        html = """
+        <li class="s-item">
+          <a class="s-item__link" href="https://www.ebay.com/itm/333"></a>
+          <div class="s-item__title">2x Wonders of the First Progo Classic Foil</div>
+          <span class="s-item__price">$20.00</span>
+          <span class="s-item__caption">Sold Oct 4, 2025</span>
+        </li>
+        """
+        extractor = MagicMock()
+        extractor.extract_batch.return_value = [{"treatment": "Classic Foil", "quantity": 2, "confidence": 0.9}]
+        with patch("app.scraper.ebay.get_ai_extractor", return_value=extractor):
+            results = parse_search_results(html, card_id=1, card_name="Progo", return_all=True)
+
+        assert len(results) == 1
+        assert isinstance(results[0], ListingRecord)
+        assert results[0].price == 10.0
+        assert results[0].quantity == 2
+
+
+class TestBlocklistMatcher:
+    """Tests for the compiled single-pass blocklist matcher."""
+
+    def test_matcher_agrees_with_term_scan(self):
+        """Compiled matcher must block exactly what a per-term substring scan blocks."""
+        from app.scraper.blocklist import is_blocked, load_blocklist
+
+        titles = [
+            "Coral Dragon STAS-EN042 2-Player Starter Set 1st Edition",
+            "Pokemon Charizard VMAX Rainbow",
+            "MTG Commander Deck Sealed",
+            "Wonders of the First Progo Classic Foil",
+            "Existence Play Bundle 6 Packs",
+        ]
+        terms = load_blocklist()
+        for title in titles:
+            expected = any(term in title.lower() for term in terms)
+            assert is_blocked(title) is expected, f"Mismatch for: {title}"
+
+    def test_blocking_terms_reports_all_overlapping_terms(self):
+        """get_blocking_terms still reports every matching term, not just the first."""
+        from app.scraper.blocklist import get_blocking_terms, load_blocklist
+
+        title = "Lot of MTG cards"
+        expected = sorted(term for term in load_blocklist() if term in title.lower())
+        assert sorted(get_blocking_terms(title)) == expected
+        assert get_blocking_terms("Wonders of the First Progo") == []
+
+    def test_force_reload_rebuilds_matcher_on_version_change(self, tmp_path, monkeypatch):
+        """A reload with a new version recompiles the matcher; same version keeps it."""
+        from app.scraper import blocklist
+
+        path = tmp_path / "blocklist.yaml"
+        path.write_text('version: "9.0.0"\ntest:\n  - "zzfoo"\n')
+        monkeypatch.setattr(blocklist, "BLOCKLIST_PATH", str(path))
+        try:
+            blocklist.load_blocklist(force_reload=True)
+            first = blocklist.get_blocklist_matcher()
+            assert blocklist.is_blocked("ZZFOO card")
+            assert not blocklist.is_blocked("zzbar card")
+
+            blocklist.load_blocklist(force_reload=True)
+            assert blocklist.get_blocklist_matcher() is first
+
+            path.write_text('version: "9.0.1"\ntest:\n  - "zzbar"\n')
+            blocklist.load_blocklist(force_reload=True)
+            assert blocklist.get_blocklist_matcher() is not first
+            assert blocklist.is_blocked("zzbar card")
+            assert not blocklist.is_blocked("zzfoo card")
+        finally:
+            monkeypatch.undo()
+            blocklist.load_blocklist(force_reload=True)
+
+
+class TestBulkCheckIndexed:
+    """Tests for the set-based dedup check against stored listings."""
+
+    @pytest.fixture
+    def db(self, test_engine, test_session, sample_cards, monkeypatch):
+        from datetime import datetime
+        from app.models.card import Card
+        from app.models.market import MarketPrice
+
+        test_session.add(Card(id=5, name="Existence Booster Box", set_name="Test Set", rarity_id=1, product_type="Box"))
+        test_session.add(Card(id=6, name="Collector Booster Box", set_name="Test Set", rarity_id=1, product_type="Box"))
+        test_session.add_all(
+            [
+                MarketPrice(card_id=1, title="Dated", price=5.0, sold_date=datetime(2025, 10, 1), external_id="e1"),
+                MarketPrice(card_id=2, title="Other card", price=7.0, external_id="e2"),
+                MarketPrice(card_id=1, title="No id", price=3.0, sold_date=datetime(2025, 10, 2)),
+                MarketPrice(card_id=1, title="Active", price=4.0, listing_type="active"),
+                MarketPrice(card_id=5, title="Collector Booster Box Sealed", price=300.0, external_id="b1"),
+            ]
+        )
+        test_session.commit()
+        monkeypatch.setattr("app.scraper.ebay.engine", test_engine)
+        return test_session
+
+    def test_external_id_and_composite_matches(self, db):
+        from datetime import datetime
+        from app.scraper.ebay import ListingRecord, _bulk_check_indexed
+
+        listings = [
+            ListingRecord(card_id=1, title="Dated", price=5.0, external_id="e1"),
+            ListingRecord(card_id=1, title="Other card", price=7.0, external_id="e2"),
+            ListingRecord(card_id=1, title="No id", price=3.0, sold_date=datetime(2025, 10, 2)),
+            ListingRecord(card_id=1, title="No id", price=3.0, sold_date=datetime(2025, 10, 3)),
+            ListingRecord(card_id=1, title="Brand new", price=9.0, external_id="e9"),
+        ]
+        assert _bulk_check_indexed(1, listings) == {0, 1, 2}
+        # Without the global check, another card's listing is not a duplicate
+        assert _bulk_check_indexed(1, listings, check_global=False) == {0, 2}
+
+    def test_composite_match_with_null_sold_date(self, db):
+        from app.scraper.ebay import ListingRecord, _bulk_check_indexed
+
+        listings = [
+            ListingRecord(card_id=1, title="Active", price=4.0, listing_type="active"),
+            ListingRecord(card_id=1, title="Active", price=4.5, listing_type="active"),
+        ]
+        assert _bulk_check_indexed(1, listings) == {0}
+
+    def test_sealed_listing_reassigned_to_better_card(self, db):
+        from app.models.market import MarketPrice
+        from app.scraper.ebay import ListingRecord, _bulk_check_indexed
+
+        listings = [ListingRecord(card_id=6, title="Collector Booster Box Sealed", price=300.0, external_id="b1")]
+        assert _bulk_check_indexed(6, listings, card_name="Collector Booster Box", product_type="Box") == {0}
+
+        db.expire_all()
+        row = db.exec(select(MarketPrice).where(MarketPrice.external_id == "b1")).one()
+        assert row.card_id == 6
+
+    def test_statement_count_independent_of_page_size(self, db, test_engine):
+        """Dedup issues a fixed number of statements however many listings conflict."""
+        from sqlalchemy import event, update
+        from app.models.market import MarketPrice
+        from app.scraper.ebay import ListingRecord, _bulk_check_indexed
+
+        def count_statements(n):
+            # Conflict with card 5 each run so the reassignment path is exercised
+            db.execute(update(MarketPrice).where(MarketPrice.external_id == "b1").values(card_id=5))
+            db.commit()
+            listings = [
+                ListingRecord(card_id=6, title="Collector Booster Box Sealed", price=300.0, external_id="b1")
+            ] * n + [ListingRecord(card_id=6, title=f"Listing {i}", price=float(i)) for i in range(n)]
+            statements = []
+            listener = lambda *args: statements.append(args[2])  # noqa: E731
+            event.listen(test_engine, "before_cursor_execute", listener)
+            try:
+                _bulk_check_indexed(6, listings, card_name="Collector Booster Box", product_type="Box")
+            finally:
+                event.remove(test_engine, "before_cursor_execute", listener)
+            return len(statements)
+
+        assert count_statements(2) == count_statements(50)
+
+
+class TestIncrementalPagination:
+    """Tests for scrape_card stopping once sold pages are fully indexed."""
+
+    @staticmethod
+    def _page(page, indexed):
+        from datetime import datetime, timedelta
+        from app.scraper.ebay import ListingRecord
+
+        return [
+            ListingRecord(
+                card_id=0,
+                title=f"Progo p{page} #{i}",
+                price=10.0 + i,
+                sold_date=datetime(2025, 10, 20) - timedelta(days=page),
+                external_id=f"{page}-{i}",
+                is_indexed=indexed,
+            )
+            for i in range(3)
+        ]
+
+    async def _scrape(self, pages_indexed, **kwargs):
+        from unittest.mock import AsyncMock, patch
+        from scripts.scrape_card import scrape_card
+
+        fetch = AsyncMock(side_effect=lambda url: url)
+        pages = iter(pages_indexed)
+        with patch(
+            "scripts.scrape_card.parse_search_results_tagged_async",
+            new_callable=AsyncMock,
+            side_effect=lambda html, **kw: self._page(int(html.split("_pgn=")[1].split("&")[0]), next(pages)),
+        ), patch("scripts.scrape_card.scrape_active_data", AsyncMock(return_value=(0.0, 0, 0.0))), patch(
+            "scripts.scrape_card.parse_total_results", return_value=0
+        ), patch("scripts.scrape_card.asyncio.sleep", AsyncMock()):
+            await scrape_card("Progo", fetch=fetch, **{"max_pages": 5, **kwargs})
+        return fetch.await_count
+
+    @pytest.mark.asyncio
+    async def test_stops_after_fully_indexed_page(self):
+        # Page 1 has new listings, page 2 is fully indexed -> stop; enough results skip query 2
+        assert await self._scrape([False, True, True, True, True]) == 2
+
+    @pytest.mark.asyncio
+    async def test_backfill_reads_every_page(self):
+        fetched = await self._scrape([True] * 20, is_backfill=True)
+        # Backfill forces 10 pages on both queries
+        assert fetched == 20
+
+    @pytest.mark.asyncio
+    async def test_consecutive_indexed_pages_threshold(self):
+        assert await self._scrape([False, True, True, True, True], stop_after_indexed_pages=2) == 3
+
+    @pytest.mark.asyncio
+    async def test_skipped_pages_are_read_back_for_stats(self):
+        from datetime import datetime
+        from unittest.mock import patch
+
+        with patch("scripts.scrape_card.indexed_listings_for_stats", return_value=[]) as mock_indexed:
+            await self._scrape([False, True, True, True, True])
+
+        # Stopped on page 2 of 5: three skipped pages of three listings
+        card_id, exclude_ids, before, limit = mock_indexed.call_args[0]
+        assert limit == 9
+        assert exclude_ids == {f"{page}-{i}" for page in (1, 2) for i in range(3)}
+        assert before == datetime(2025, 10, 18)
+
+    def test_indexed_listings_for_stats(self, test_engine, test_session, sample_cards, monkeypatch):
+        from datetime import datetime
+        from app.models.market import MarketPrice
+        from scripts import scrape_card
+
+        monkeypatch.setattr(scrape_card, "engine", test_engine)
+        for day in range(1, 6):
+            test_session.add(
+                MarketPrice(
+                    card_id=1, title=f"Sale {day}", price=float(day), listing_type="sold",
+                    sold_date=datetime(2025, 10, day), external_id=f"s{day}",
+                )
+            )
+        test_session.commit()
+
+        listings = scrape_card.indexed_listings_for_stats(1, {"s4"}, datetime(2025, 10, 4), limit=2)
+        assert [listing.external_id for listing in listings] == ["s3", "s2"]
+
+    def test_watermarks_only_move_forward(self, test_engine, sample_cards, monkeypatch):
+        from datetime import datetime
+        from app.scraper import watermark
+        from app.scraper.watermark import QueryProgress, load_watermarks, save_watermarks
+
+        monkeypatch.setattr(watermark, "engine", test_engine)
+        save_watermarks(1, {"q": QueryProgress(newest_sold_date=datetime(2025, 10, 5), pages_fetched=3)})
+        save_watermarks(1, {"q": QueryProgress(newest_sold_date=datetime(2025, 10, 1), pages_fetched=1)})
+
+        assert load_watermarks(1) == {"q": datetime(2025, 10, 5)}
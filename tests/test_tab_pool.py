@@ -0,0 +1,320 @@
+"""
+Tests for the browser tab pool, per-domain pacing and readiness waits.
+
+Tests cover:
+- Concurrent checkouts up to the pool size, tab reuse
+- Health checks, recycling after max_uses, discard on error
+- Per-domain pacing intervals
+- Selector-driven readiness detection
+- Sub-resource blocking
+- Proactive browser recycling (page count / memory thresholds, draining)
+"""
+
+import asyncio
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.scraper import readiness
+from app.scraper.browser import BrowserManager, process_tree_rss
+from app.scraper.resource_blocking import ResourceBlocker
+from app.scraper.tab_pool import DomainPacer, TabPool
+
+
+def _factory():
+    tabs = []
+
+    async def new_tab():
+        tab = MagicMock()
+        tab.execute_script = AsyncMock(return_value={"result": {}})
+        tab.close = AsyncMock()
+        tabs.append(tab)
+        return tab
+
+    return new_tab, tabs
+
+
+class TestTabPool:
+    """Tests for TabPool."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded_by_size(self):
+        new_tab, tabs = _factory()
+        pool = TabPool(new_tab, size=2)
+        active = 0
+        peak = 0
+
+        async def use():
+            nonlocal active, peak
+            async with pool.tab():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(use() for _ in range(6)))
+        assert peak == 2
+        # Tabs are reused, not opened per page
+        assert len(tabs) == 2
+        assert pool.stats.reused == 4
+
+    @pytest.mark.asyncio
+    async def test_unhealthy_tab_replaced(self):
+        new_tab, tabs = _factory()
+        pool = TabPool(new_tab, size=1)
+        await pool.warm()
+        tabs[0].execute_script.side_effect = RuntimeError("target crashed")
+
+        async with pool.tab() as tab:
+            assert tab is tabs[1]
+        tabs[0].close.assert_awaited()
+        assert pool.stats.discarded == 1
+
+    @pytest.mark.asyncio
+    async def test_tab_recycled_after_max_uses(self):
+        new_tab, tabs = _factory()
+        pool = TabPool(new_tab, size=1, max_uses=2)
+        for _ in range(3):
+            async with pool.tab():
+                pass
+        assert len(tabs) == 2
+        assert pool.stats.recycled == 1
+
+    @pytest.mark.asyncio
+    async def test_error_discards_tab(self):
+        new_tab, tabs = _factory()
+        pool = TabPool(new_tab, size=1)
+        with pytest.raises(ValueError):
+            async with pool.tab():
+                raise ValueError("navigation failed")
+        assert pool.idle_count == 0
+        tabs[0].close.assert_awaited()
+
+    @pytest.mark.asyncio
+    async def test_reset_drops_tabs_from_old_browser(self):
+        new_tab, tabs = _factory()
+        pool = TabPool(new_tab, size=1)
+        async with pool.tab():
+            # Browser restarted while the tab was out
+            await pool.reset()
+        assert pool.idle_count == 0
+        async with pool.tab() as tab:
+            assert tab is tabs[1]
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_old_generation(self):
+        new_tab, _ = _factory()
+        pool = TabPool(new_tab, size=2)
+        release = asyncio.Event()
+
+        async def hold():
+            async with pool.tab():
+                await release.wait()
+
+        task = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        old = pool.generation
+        await pool.reset()
+        assert pool.in_use(old) == 1
+        assert await pool.drain(old, timeout=0.05) is False
+
+        release.set()
+        assert await pool.drain(old, timeout=1) is True
+        await task
+
+
+class TestDomainPacer:
+    """Tests for DomainPacer."""
+
+    @pytest.mark.asyncio
+    async def test_same_domain_spaced(self):
+        pacer = DomainPacer(min_interval=0.05, jitter=0)
+        assert await pacer.wait("https://www.ebay.com/sch/i.html?_nkw=a") == 0
+        waited = await pacer.wait("https://www.ebay.com/sch/i.html?_nkw=b")
+        assert waited > 0.03
+
+    @pytest.mark.asyncio
+    async def test_other_domain_not_delayed(self):
+        pacer = DomainPacer(min_interval=10, jitter=0)
+        await pacer.wait("https://www.ebay.com/sch/i.html")
+        assert await pacer.wait("https://opensea.io/collection/x") == 0
+
+    @pytest.mark.asyncio
+    async def test_already_paced_skips_one_wait(self):
+        pacer = DomainPacer(min_interval=10, jitter=0)
+        url = "https://www.ebay.com/sch/i.html"
+        await pacer.wait(url)
+
+        with pacer.already_paced(url):
+            assert await pacer.wait(url) == 0
+            # A retry within the same fetch is paced again
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(pacer.wait(url), timeout=0.05)
+
+
+def _state_tab(*states):
+    """Tab whose readiness script returns the given states in order (last one repeats)."""
+    tab = MagicMock()
+    values = list(states)
+
+    async def execute_script(script, return_by_value=None):
+        state = values.pop(0) if len(values) > 1 else values[0]
+        if isinstance(state, Exception):
+            raise state
+        return {"result": {"result": {"type": "string", "value": state}}}
+
+    tab.execute_script = execute_script
+    return tab
+
+
+class TestWaitUntilReady:
+    """Tests for readiness.wait_until_ready."""
+
+    SEARCH_URL = "https://www.ebay.com/sch/i.html?_nkw=progo&LH_Sold=1"
+
+    @pytest.fixture(autouse=True)
+    def fast_poll(self, monkeypatch):
+        monkeypatch.setattr(readiness, "POLL_INTERVAL", 0)
+        monkeypatch.setattr(readiness, "LOADED_GRACE_SECONDS", 0.01)
+
+    def test_selector_only_for_ebay_search(self):
+        assert readiness.readiness_selector(self.SEARCH_URL) == "li.s-item, li.s-card"
+        assert readiness.readiness_selector("https://www.ebay.com/itm/123") is None
+
+    @pytest.mark.asyncio
+    async def test_returns_when_results_render(self):
+        tab = _state_tab(RuntimeError("context destroyed"), "loading", "results")
+        assert await readiness.wait_until_ready(tab, self.SEARCH_URL, timeout=5) == "results"
+
+    @pytest.mark.asyncio
+    async def test_block_page_detected(self):
+        assert await readiness.wait_until_ready(_state_tab("blocked"), self.SEARCH_URL, timeout=5) == "blocked"
+
+    @pytest.mark.asyncio
+    async def test_loaded_without_results_stops_after_grace(self):
+        assert await readiness.wait_until_ready(_state_tab("complete"), self.SEARCH_URL, timeout=5) == "loaded"
+
+    @pytest.mark.asyncio
+    async def test_timeout(self):
+        assert await readiness.wait_until_ready(_state_tab("loading"), self.SEARCH_URL, timeout=0.02) == "timeout"
+
+    @pytest.mark.asyncio
+    async def test_page_without_marker_settles(self, monkeypatch):
+        monkeypatch.setenv("SCRAPER_SETTLE_SECONDS", "0")
+        tab = _state_tab("complete")
+        assert await readiness.wait_until_ready(tab, "https://opensea.io/collection/x", timeout=5) == "loaded"
+
+
+class TestResourceBlocker:
+    """Tests for request interception decisions and stats."""
+
+    def test_blocks_heavy_types_and_foreign_scripts(self):
+        blocker = ResourceBlocker()
+        assert blocker.should_block("https://i.ebayimg.com/thumbs/1.jpg", "Image")
+        assert blocker.should_block("https://fonts.gstatic.com/x.woff2", "Font")
+        assert blocker.should_block("https://www.googletagmanager.com/gtm.js", "Script")
+        assert not blocker.should_block("https://ir.ebaystatic.com/rs/v/app.js", "Script")
+        assert not blocker.should_block("https://www.ebay.com/sch/i.html", "Document")
+
+    def test_allowlist_configurable(self, monkeypatch):
+        monkeypatch.setenv("SCRAPER_SCRIPT_ALLOWLIST", "example.com")
+        blocker = ResourceBlocker.from_env()
+        assert blocker.should_block("https://ir.ebaystatic.com/rs/v/app.js", "Script")
+        assert not blocker.should_block("https://cdn.example.com/a.js", "Script")
+
+    @pytest.mark.asyncio
+    async def test_attach_fails_blocked_requests(self):
+        blocker = ResourceBlocker()
+        tab = MagicMock()
+        tab.enable_fetch_events = AsyncMock()
+        tab.fail_request = AsyncMock()
+        tab.continue_request = AsyncMock()
+        tab.on = AsyncMock()
+
+        await blocker.attach(tab)
+        handler = tab.on.call_args[0][1]
+        await handler({"params": {"requestId": "1", "request": {"url": "https://i.ebayimg.com/a.jpg"}, "resourceType": "Image"}})
+        await handler({"params": {"requestId": "2", "request": {"url": "https://www.ebay.com/"}, "resourceType": "Document"}})
+
+        tab.fail_request.assert_awaited_once()
+        tab.continue_request.assert_awaited_once_with("2")
+        assert blocker.stats.blocked_requests == 1
+        assert blocker.stats.estimated_bytes_blocked > 0
+        assert "Image=1" in blocker.stats.summary()
+
+    @pytest.mark.asyncio
+    async def test_disabled_does_not_intercept(self):
+        tab = MagicMock()
+        tab.enable_fetch_events = AsyncMock()
+        await ResourceBlocker(enabled=False).attach(tab)
+        tab.enable_fetch_events.assert_not_awaited()
+
+
+class TestBrowserRecycling:
+    """Tests for BrowserManager's proactive recycling."""
+
+    @pytest.fixture
+    def manager(self, monkeypatch):
+        new_tab, tabs = _factory()
+        monkeypatch.setattr(BrowserManager, "_browser", MagicMock(stop=AsyncMock()))
+        monkeypatch.setattr(BrowserManager, "_tab_pool", TabPool(new_tab, size=2))
+        monkeypatch.setattr(BrowserManager, "_pages_served", 0)
+        monkeypatch.setattr(BrowserManager, "_recycle_count", 0)
+        monkeypatch.setattr(BrowserManager, "_recycle_task", None)
+        monkeypatch.setattr(BrowserManager, "_generation", 0)
+        monkeypatch.setattr(BrowserManager, "_profile_dir", None)
+        monkeypatch.setattr(BrowserManager, "max_pages", 3)
+        monkeypatch.setattr(BrowserManager, "max_rss_mb", 0)
+        monkeypatch.setattr(BrowserManager, "drain_timeout", 1.0)
+        replacement = MagicMock(stop=AsyncMock())
+        monkeypatch.setattr(BrowserManager, "_launch", AsyncMock(return_value=replacement))
+        return replacement
+
+    def test_process_tree_rss(self):
+        assert process_tree_rss(os.getpid()) > 0
+        assert process_tree_rss(2**22 + 1) is None
+
+    @pytest.mark.asyncio
+    async def test_page_threshold_triggers_recycle(self, manager):
+        old = BrowserManager._browser
+        for _ in range(3):
+            BrowserManager.record_page()
+        assert await BrowserManager._recycle_task is True
+
+        assert BrowserManager._browser is manager
+        assert BrowserManager._pages_served == 0
+        old.stop.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_memory_threshold(self, manager, monkeypatch):
+        monkeypatch.setattr(BrowserManager, "max_pages", 0)
+        monkeypatch.setattr(BrowserManager, "max_rss_mb", 100)
+        monkeypatch.setattr(BrowserManager, "rss_check_every", 1)
+        monkeypatch.setattr(BrowserManager, "memory_usage", classmethod(lambda cls: 50 * 1024 * 1024))
+        assert BrowserManager.recycle_reason() is None
+        monkeypatch.setattr(BrowserManager, "memory_usage", classmethod(lambda cls: 200 * 1024 * 1024))
+        assert "RSS" in BrowserManager.recycle_reason()
+
+    @pytest.mark.asyncio
+    async def test_in_flight_tab_finishes_on_old_browser(self, manager):
+        old = BrowserManager._browser
+        pool = BrowserManager._tab_pool
+        release = asyncio.Event()
+
+        async def in_flight_page():
+            async with pool.tab():
+                await release.wait()
+
+        task = asyncio.create_task(in_flight_page())
+        await asyncio.sleep(0)
+        recycle = asyncio.create_task(BrowserManager.recycle("test"))
+        await asyncio.sleep(0.05)
+        # Swapped and pre-warmed, but the old browser waits for its tab
+        assert BrowserManager._browser is manager
+        old.stop.assert_not_awaited()
+
+        release.set()
+        await task
+        assert await recycle is True
+        old.stop.assert_awaited_once()
@@ -0,0 +1,132 @@
+"""
+Tests for title canonicalization and near-duplicate lookup of the extraction cache.
+
+Tests cover:
+- Emoji/fluff removal, synonym unification, word order independence
+- Titles with different treatments or quantities stay apart
+- NearDuplicateIndex similarity and signature guard
+- Hit rate / false-share report
+- Extractor cache keys and near-duplicate hits
+"""
+
+import json
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.services.ai_extractor import AIListingExtractor
+from app.services.extraction_cache import ExtractionCacheStore
+from app.services.title_canonical import NearDuplicateIndex, canonical_title, evaluate_sharing
+
+
+class TestCanonicalTitle:
+    """Tests for canonical_title."""
+
+    def test_seller_noise_is_removed(self):
+        assert canonical_title("🔥WOTF Existence Foo Classic Foil NM🔥") == canonical_title(
+            "Wonders of the First Existence Foo Classic Foil - NM"
+        )
+        assert canonical_title("Progo 123/401 Formless Foil L@@K!! Free Shipping") == canonical_title(
+            "progo #123/401 formless foil"
+        )
+
+    def test_synonyms_and_order(self):
+        assert canonical_title("Progo Stone Foil Holo") == canonical_title("Progo Stonefoil Foil")
+        assert canonical_title("3x Progo Foil") == canonical_title("Progo Foil x3")
+        assert canonical_title("Lot of 5 Progo") == canonical_title("5 Card Lot Progo")
+
+    def test_extraction_relevant_differences_are_kept(self):
+        assert canonical_title("Progo Classic Foil") != canonical_title("Progo Stonefoil")
+        assert canonical_title("2x Progo Foil") != canonical_title("3x Progo Foil")
+        assert canonical_title("Progo /25 Serialized") != canonical_title("Progo /50 Serialized")
+        # Card name, not a quantity
+        assert canonical_title("Carbon-X7 Foil") != canonical_title("7x Carbon Foil")
+
+    def test_only_fluff_falls_back(self):
+        assert canonical_title("🔥🔥 L@@K") == "🔥🔥 l@@k"
+
+
+class TestNearDuplicateIndex:
+    """Tests for NearDuplicateIndex."""
+
+    BASE = "Wonders of the First Existence Zeltona the Great Classic Foil 045/401"
+
+    def test_finds_near_duplicate(self):
+        index = NearDuplicateIndex()
+        index.add("k1", self.BASE)
+        assert index.find("WOTF Existence Zeltona the Great Classic Foil 045/401 Beautiful Centering") == "k1"
+
+    def test_signature_must_match(self):
+        index = NearDuplicateIndex()
+        index.add("k1", self.BASE)
+        assert index.find("WOTF Existence Zeltona the Great Stonefoil 045/401") is None
+        assert index.find("WOTF Existence Zeltona the Great Classic Foil 046/401") is None
+        assert index.find("2x WOTF Existence Zeltona the Great Classic Foil 045/401") is None
+
+    def test_unrelated_title(self):
+        index = NearDuplicateIndex()
+        index.add("k1", self.BASE)
+        assert index.find("Wonders of the First Progo Classic Foil 001/401") is None
+
+
+class TestEvaluateSharing:
+    """Tests for the hit rate / false-share report."""
+
+    def test_report(self):
+        base = TestNearDuplicateIndex.BASE
+        titles = [base, base.upper(), f"🔥{base} NM🔥", f"{base} Beautiful Centering"]
+        # Pretend the last one really is something else
+        report = evaluate_sharing(titles, classify=lambda title: "Centering" in title)
+
+        assert report["titles"] == 4
+        assert report["exact"]["hits"] == 1
+        assert report["canonical"]["hits"] == 2
+        assert report["near_dup"]["hits"] == 3
+        assert report["near_dup"]["false_shares"] == 1
+        assert report["near_dup"]["false_share_rate"] == round(1 / 3, 4)
+
+
+RESULT = {"quantity": 1, "product_type": "Single", "condition": None, "treatment": "Classic Foil", "confidence": 0.9}
+
+
+def _extractor(calls):
+    def create(**kwargs):
+        prompt = kwargs["messages"][1]["content"]
+        calls.append(prompt)
+        content = json.dumps({"listings": [RESULT] * prompt.count("**Title**")})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    extractor = AIListingExtractor()
+    extractor.client = MagicMock()
+    extractor.client.chat.completions.create.side_effect = create
+    extractor._store = ExtractionCacheStore(enabled=False)
+    return extractor
+
+
+class TestExtractorCanonicalKeys:
+    """Tests for canonical cache keys in AIListingExtractor."""
+
+    def test_noisy_variants_share_a_result(self):
+        calls = []
+        extractor = _extractor(calls)
+
+        extractor.extract_batch([{"title": "🔥WOTF Existence Foo Classic Foil NM🔥"}])
+        extractor.extract_batch([{"title": "Wonders of the First Existence Foo Classic Foil - NM"}])
+
+        assert len(calls) == 1
+
+    def test_canonicalization_can_be_disabled(self, monkeypatch):
+        monkeypatch.setenv("AI_TITLE_CANONICAL", "0")
+        extractor = AIListingExtractor()
+        assert extractor._hash_title("WOTF Foo") != extractor._hash_title("Wonders of the First Foo")
+
+    def test_near_duplicate_hit(self, monkeypatch):
+        calls = []
+        monkeypatch.setenv("AI_TITLE_NEAR_DUP", "1")
+        extractor = _extractor(calls)
+
+        extractor.extract_batch([{"title": TestNearDuplicateIndex.BASE}])
+        variant = "WOTF Existence Zeltona the Great Classic Foil 045/401 Beautiful Centering"
+        extractor.extract_batch([{"title": variant}])
+
+        assert len(calls) == 1
+        assert extractor.get_metrics()["near_dup_hits"] == 1